@@ -0,0 +1,3 @@
+"""
+Analytics app for Talent Verify.
+"""
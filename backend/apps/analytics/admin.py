@@ -0,0 +1,30 @@
+"""
+Admin configuration for the analytics app.
+"""
+
+from django.contrib import admin
+
+from apps.core.admin import ScalableModelAdmin
+from .models import Headcount, MonthlyMovement
+
+
+class RollupAdmin(ScalableModelAdmin):
+    """Read-only: rollups are derived from history (see ``rebuild_analytics``)."""
+    list_select_related = ('company', 'department__company')
+    search_fields = ('company__name',)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(MonthlyMovement)
+class MonthlyMovementAdmin(RollupAdmin):
+    list_display = ('company', 'department', 'month', 'hires', 'leavers')
+
+
+@admin.register(Headcount)
+class HeadcountAdmin(RollupAdmin):
+    list_display = ('company', 'department', 'headcount')
@@ -0,0 +1,14 @@
+"""
+App configuration for the analytics app.
+"""
+
+from django.apps import AppConfig
+
+
+class AnalyticsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.analytics'
+    label = 'analytics'
+
+    def ready(self):
+        from . import signals  # noqa: F401
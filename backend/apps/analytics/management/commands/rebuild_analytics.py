@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from apps.analytics.rollups import rebuild
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the headcount and monthly movement rollups from employee history'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--company', type=int, action='append', dest='companies',
+                            help='Only rebuild this company (may be repeated)')
+
+    def handle(self, *args, **options):
+        months = rebuild(options['companies'])
+        self.stdout.write(self.style.SUCCESS(f'Analytics rebuilt: {months} company/department months'))
@@ -0,0 +1,56 @@
+# Generated by Django 5.0.2 on 2026-10-19 06:33
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('companies', '0006_remove_company_departments'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Headcount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('headcount', models.IntegerField(default=0)),
+                ('start_day_total', models.BigIntegerField(default=0)),
+                ('company', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='headcounts', to='companies.company')),
+                ('department', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='headcounts', to='companies.department')),
+            ],
+            options={
+                'verbose_name': 'Headcount',
+                'verbose_name_plural': 'Headcounts',
+                'ordering': ['company', 'department'],
+            },
+        ),
+        migrations.CreateModel(
+            name='MonthlyMovement',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField()),
+                ('hires', models.IntegerField(default=0)),
+                ('leavers', models.IntegerField(default=0)),
+                ('leaver_tenure_days', models.BigIntegerField(default=0)),
+                ('company', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='monthly_movements', to='companies.company')),
+                ('department', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='monthly_movements', to='companies.department')),
+            ],
+            options={
+                'verbose_name': 'Monthly Movement',
+                'verbose_name_plural': 'Monthly Movements',
+                'ordering': ['company', 'month'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='headcount',
+            constraint=models.UniqueConstraint(fields=('company', 'department'), name='unique_headcount'),
+        ),
+        migrations.AddConstraint(
+            model_name='monthlymovement',
+            constraint=models.UniqueConstraint(fields=('company', 'department', 'month'), name='unique_monthly_movement'),
+        ),
+    ]
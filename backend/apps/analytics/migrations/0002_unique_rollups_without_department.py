@@ -0,0 +1,42 @@
+# Generated by Django 5.0.2 on 2026-10-19 07:27
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def merge_duplicates(apps, schema_editor):
+    """Fold rows without a department that the old constraint let through."""
+    for model_name, key, counters in (
+        ('MonthlyMovement', ('company_id', 'month'), ('hires', 'leavers', 'leaver_tenure_days')),
+        ('Headcount', ('company_id',), ('headcount', 'start_day_total')),
+    ):
+        model = apps.get_model('analytics', model_name)
+        rows = model.objects.filter(department__isnull=True)
+        duplicates = rows.values(*key).annotate(total=Count('id')).filter(total__gt=1)
+        for duplicate in duplicates:
+            group = list(rows.filter(**{field: duplicate[field] for field in key}).order_by('id'))
+            keep = group[0]
+            for counter in counters:
+                setattr(keep, counter, sum(getattr(row, counter) for row in group))
+            keep.save(update_fields=counters)
+            model.objects.filter(id__in=[row.id for row in group[1:]]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0001_initial'),
+        ('companies', '0010_name_lower_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicates, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='headcount',
+            constraint=models.UniqueConstraint(condition=models.Q(('department__isnull', True)), fields=('company',), name='unique_headcount_no_department'),
+        ),
+        migrations.AddConstraint(
+            model_name='monthlymovement',
+            constraint=models.UniqueConstraint(condition=models.Q(('department__isnull', True)), fields=('company', 'month'), name='unique_monthly_movement_no_department'),
+        ),
+    ]
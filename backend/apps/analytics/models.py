@@ -0,0 +1,80 @@
+"""
+Rollup tables for the analytics app.
+
+Both tables are derived from ``EmployeeHistory`` and are kept up to date
+incrementally (see ``rollups.py``); ``manage.py rebuild_analytics`` recomputes
+them from scratch.
+"""
+
+from datetime import date
+
+from django.db import models
+from django.db.models import Q
+from apps.companies.models import Company, Department
+
+# Start dates are summed as days since this date (see Headcount)
+EPOCH = date(1970, 1, 1)
+
+
+class MonthlyMovement(models.Model):
+    """
+    Assignments that started (hires) and ended (leavers) in a month for a
+    company and department, plus the total tenure of those leavers.
+    """
+    company = models.ForeignKey(Company, on_delete=models.CASCADE, related_name='monthly_movements')
+    department = models.ForeignKey(Department, on_delete=models.CASCADE, null=True, blank=True, related_name='monthly_movements')
+    month = models.DateField()  # first day of the month
+    hires = models.IntegerField(default=0)
+    leavers = models.IntegerField(default=0)
+    leaver_tenure_days = models.BigIntegerField(default=0)
+
+    class Meta:
+        verbose_name = 'Monthly Movement'
+        verbose_name_plural = 'Monthly Movements'
+        ordering = ['company', 'month']
+        constraints = [
+            models.UniqueConstraint(fields=['company', 'department', 'month'], name='unique_monthly_movement'),
+            # NULLs never collide in the constraint above
+            models.UniqueConstraint(
+                fields=['company', 'month'], condition=Q(department__isnull=True),
+                name='unique_monthly_movement_no_department',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.company_id}/{self.department_id} {self.month:%Y-%m}"
+
+    @property
+    def average_leaver_tenure_days(self):
+        return self.leaver_tenure_days / self.leavers if self.leavers else None
+
+
+class Headcount(models.Model):
+    """
+    Current headcount (open history rows) for a company and department.
+    ``start_day_total`` is the sum of the start dates as days since the epoch,
+    which gives the average tenure without reading the history rows.
+    """
+    company = models.ForeignKey(Company, on_delete=models.CASCADE, related_name='headcounts')
+    department = models.ForeignKey(Department, on_delete=models.CASCADE, null=True, blank=True, related_name='headcounts')
+    headcount = models.IntegerField(default=0)
+    start_day_total = models.BigIntegerField(default=0)
+
+    class Meta:
+        verbose_name = 'Headcount'
+        verbose_name_plural = 'Headcounts'
+        ordering = ['company', 'department']
+        constraints = [
+            models.UniqueConstraint(fields=['company', 'department'], name='unique_headcount'),
+            models.UniqueConstraint(
+                fields=['company'], condition=Q(department__isnull=True), name='unique_headcount_no_department',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.company_id}/{self.department_id}: {self.headcount}"
+
+    def average_tenure_days(self, today):
+        if not self.headcount:
+            return None
+        return (today - EPOCH).days - self.start_day_total / self.headcount
@@ -0,0 +1,142 @@
+"""
+Incremental maintenance and full rebuild of the analytics rollup tables.
+"""
+
+from collections import defaultdict
+from datetime import date
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, DurationField, ExpressionWrapper, F, Sum, Value
+from django.db.models.functions import TruncMonth
+from django.utils.dateparse import parse_date
+
+from apps.employees.models import EmployeeHistory, EmployeeHistoryArchive
+from .models import EPOCH, Headcount, MonthlyMovement
+
+
+def _as_date(value):
+    if value is None or isinstance(value, date):
+        return value
+    return parse_date(str(value))
+
+
+def _bump(model, lookup, deltas):
+    """Add ``deltas`` to the row matching ``lookup``, creating it for increments."""
+    deltas = {field: delta for field, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    updates = {field: F(field) + delta for field, delta in deltas.items()}
+    if model.objects.filter(**lookup).update(**updates):
+        return
+    if all(delta < 0 for delta in deltas.values()):
+        # Nothing to take away from (e.g. the row went with a cascade delete)
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(**lookup, **deltas)
+    except IntegrityError:
+        model.objects.filter(**lookup).update(**updates)
+
+
+def apply_changes(added=(), removed=()):
+    """
+    Fold added and removed assignments into the rollups. Assignments are
+    (company_id, department_id, start_date, end_date) tuples; changes are
+    merged per key first so a bulk write costs one query per touched row.
+    """
+    movements = defaultdict(lambda: [0, 0, 0])
+    headcounts = defaultdict(lambda: [0, 0])
+    for sign, assignments in ((1, added), (-1, removed)):
+        for company_id, department_id, start_date, end_date in assignments:
+            start_date, end_date = _as_date(start_date), _as_date(end_date)
+            if company_id is None or start_date is None:
+                continue
+            movements[(company_id, department_id, start_date.replace(day=1))][0] += sign
+            if end_date is None:
+                headcount = headcounts[(company_id, department_id)]
+                headcount[0] += sign
+                headcount[1] += sign * (start_date - EPOCH).days
+            else:
+                movement = movements[(company_id, department_id, end_date.replace(day=1))]
+                movement[1] += sign
+                movement[2] += sign * (end_date - start_date).days
+
+    with transaction.atomic():
+        for (company_id, department_id, month), (hires, leavers, tenure) in movements.items():
+            _bump(
+                MonthlyMovement,
+                {'company_id': company_id, 'department_id': department_id, 'month': month},
+                {'hires': hires, 'leavers': leavers, 'leaver_tenure_days': tenure},
+            )
+        for (company_id, department_id), (count, start_days) in headcounts.items():
+            _bump(
+                Headcount,
+                {'company_id': company_id, 'department_id': department_id},
+                {'headcount': count, 'start_day_total': start_days},
+            )
+
+
+def rebuild(company_ids=None):
+    """
+    Recompute the rollups from ``EmployeeHistory`` and its archive with
+    grouped aggregates, for all companies or only the given ones.
+    """
+    histories = EmployeeHistory.objects.order_by()
+    archived = EmployeeHistoryArchive.objects.order_by()
+    if company_ids is not None:
+        histories = histories.filter(company_id__in=company_ids)
+        archived = archived.filter(company_id__in=company_ids)
+
+    movements = defaultdict(lambda: [0, 0, 0])
+    for rows in (histories, archived):
+        hires = (
+            rows.annotate(month=TruncMonth('start_date'))
+            .values('company_id', 'department_id', 'month')
+            .annotate(total=Count('id'))
+        )
+        for row in hires:
+            movements[(row['company_id'], row['department_id'], row['month'])][0] += row['total']
+        leavers = (
+            rows.filter(end_date__isnull=False)
+            .annotate(month=TruncMonth('end_date'))
+            .values('company_id', 'department_id', 'month')
+            .annotate(
+                total=Count('id'),
+                tenure=Sum(ExpressionWrapper(F('end_date') - F('start_date'), output_field=DurationField())),
+            )
+        )
+        for row in leavers:
+            movement = movements[(row['company_id'], row['department_id'], row['month'])]
+            movement[1] += row['total']
+            movement[2] += row['tenure'].days if row['tenure'] else 0
+
+    headcounts = (
+        histories.filter(end_date__isnull=True)
+        .values('company_id', 'department_id')
+        .annotate(
+            total=Count('id'),
+            start_days=Sum(ExpressionWrapper(F('start_date') - Value(EPOCH), output_field=DurationField())),
+        )
+    )
+
+    with transaction.atomic():
+        for model in (MonthlyMovement, Headcount):
+            stale = model.objects.all()
+            if company_ids is not None:
+                stale = stale.filter(company_id__in=company_ids)
+            stale.delete()
+        MonthlyMovement.objects.bulk_create([
+            MonthlyMovement(
+                company_id=company_id, department_id=department_id, month=month,
+                hires=hired, leavers=left, leaver_tenure_days=tenure,
+            )
+            for (company_id, department_id, month), (hired, left, tenure) in movements.items()
+        ], batch_size=1000)
+        Headcount.objects.bulk_create([
+            Headcount(
+                company_id=row['company_id'], department_id=row['department_id'],
+                headcount=row['total'], start_day_total=row['start_days'].days if row['start_days'] else 0,
+            )
+            for row in headcounts
+        ], batch_size=1000)
+    return len(movements)
@@ -0,0 +1,38 @@
+"""
+Serializers for the analytics app.
+"""
+
+from django.utils import timezone
+from rest_framework import serializers
+from .models import Headcount, MonthlyMovement
+
+
+class MonthlyMovementSerializer(serializers.ModelSerializer):
+    """
+    Serializer for monthly hires/leavers of a company department.
+    """
+    month = serializers.DateField(format='%Y-%m')
+    department_name = serializers.CharField(source='department.name', default=None, read_only=True)
+    average_leaver_tenure_days = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = MonthlyMovement
+        fields = ['company', 'department', 'department_name', 'month', 'hires', 'leavers',
+                  'average_leaver_tenure_days']
+
+
+class HeadcountSerializer(serializers.ModelSerializer):
+    """
+    Serializer for the current headcount of a company department.
+    """
+    company_name = serializers.CharField(source='company.name', read_only=True)
+    department_name = serializers.CharField(source='department.name', default=None, read_only=True)
+    average_tenure_days = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Headcount
+        fields = ['company', 'company_name', 'department', 'department_name', 'headcount',
+                  'average_tenure_days']
+
+    def get_average_tenure_days(self, obj):
+        return obj.average_tenure_days(timezone.now().date())
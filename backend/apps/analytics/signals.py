@@ -0,0 +1,49 @@
+"""
+Signal handlers that keep the analytics rollups in sync with history writes.
+"""
+
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from apps.employees.models import EmployeeHistory, EmployeeHistoryArchive
+from apps.employees.signals import history_rows_changed
+from .rollups import apply_changes
+
+
+@receiver(pre_save, sender=EmployeeHistory)
+def remember_assignment(sender, instance, **kwargs):
+    # Rows built by hand (not loaded from the DB) need their old values read.
+    if not instance._state.adding and getattr(instance, '_loaded_assignment', None) is None:
+        old = sender.objects.filter(pk=instance.pk).values_list(
+            'company_id', 'department_id', 'start_date', 'end_date'
+        ).first()
+        instance._loaded_assignment = old
+
+
+@receiver(post_save, sender=EmployeeHistory)
+def rollup_saved_history(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    old = None if created else getattr(instance, '_loaded_assignment', None)
+    new = instance.assignment
+    if old != new:
+        apply_changes(added=[new], removed=[old] if old else [])
+    instance._loaded_assignment = new
+
+
+@receiver(post_delete, sender=EmployeeHistory)
+def rollup_deleted_history(sender, instance, **kwargs):
+    apply_changes(removed=[getattr(instance, '_loaded_assignment', None) or instance.assignment])
+
+
+@receiver(post_delete, sender=EmployeeHistoryArchive)
+def rollup_deleted_archived_history(sender, instance, **kwargs):
+    # Archived rows still count towards the rollups (archiving and restoring
+    # move them with raw deletes, which send no signal); an ORM delete, such
+    # as the cascade from deleting the employee, takes them out.
+    apply_changes(removed=[instance.assignment])
+
+
+@receiver(history_rows_changed)
+def rollup_bulk_history(sender, added, removed, **kwargs):
+    apply_changes(added=added, removed=removed)
@@ -0,0 +1,17 @@
+"""
+URL patterns for the analytics app.
+"""
+
+from django.urls import path, include
+from rest_framework.routers import DefaultRouter
+from .views import HeadcountViewSet, MonthlyMovementViewSet
+
+router = DefaultRouter()
+router.register(r'headcount', HeadcountViewSet, basename='headcount')
+router.register(r'movements', MonthlyMovementViewSet, basename='movements')
+
+app_name = 'analytics'
+
+urlpatterns = [
+    path('', include(router.urls)),
+]
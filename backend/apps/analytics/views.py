@@ -0,0 +1,68 @@
+"""
+Views for the analytics app.
+
+Every endpoint reads the rollup tables only, so the cost is proportional to
+the number of rows returned, not to the size of the history table.
+"""
+
+from datetime import datetime
+
+from rest_framework import viewsets
+from rest_framework.exceptions import ValidationError
+
+from apps.core.permissions import IsAdminOrCompanyUser
+from .models import Headcount, MonthlyMovement
+from .serializers import HeadcountSerializer, MonthlyMovementSerializer
+
+
+class RollupViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Base for the rollup endpoints: company users only see their own company,
+    admins can filter with ``?company=`` and ``?department=``.
+    """
+    permission_classes = [IsAdminOrCompanyUser]
+    model = None
+
+    def get_queryset(self):
+        queryset = self.model.objects.select_related('company', 'department')
+        user = self.request.user
+        params = self.request.query_params
+        if user.role != 'admin':
+            queryset = queryset.filter(company_id=user.company_id)
+        elif params.get('company'):
+            queryset = queryset.filter(company_id=params['company'])
+        if params.get('department'):
+            queryset = queryset.filter(department_id=params['department'])
+        return queryset
+
+
+class HeadcountViewSet(RollupViewSet):
+    """
+    Current headcount and average tenure per company and department.
+    """
+    model = Headcount
+    serializer_class = HeadcountSerializer
+
+    def get_queryset(self):
+        return super().get_queryset().filter(headcount__gt=0)
+
+
+class MonthlyMovementViewSet(RollupViewSet):
+    """
+    Hires, leavers and average leaver tenure per month. ``?from=`` and
+    ``?to=`` take YYYY-MM months (inclusive).
+    """
+    model = MonthlyMovement
+    serializer_class = MonthlyMovementSerializer
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        for param, lookup in (('from', 'month__gte'), ('to', 'month__lte')):
+            value = self.request.query_params.get(param)
+            if value:
+                try:
+                    month = datetime.strptime(value, '%Y-%m').date()
+                except ValueError:
+                    raise ValidationError({param: 'Use the YYYY-MM format.'})
+                queryset = queryset.filter(**{lookup: month})
+        return queryset.exclude(hires=0, leavers=0)
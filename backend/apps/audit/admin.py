@@ -0,0 +1,24 @@
+"""
+Admin configuration for the audit app.
+"""
+
+from django.contrib import admin
+
+from apps.core.admin import ScalableModelAdmin
+from .models import AuditEvent
+
+
+@admin.register(AuditEvent)
+class AuditEventAdmin(ScalableModelAdmin):
+    """Read-only view of the audit trail."""
+    list_display = ('timestamp', 'model', 'object_id', 'action', 'actor_id')
+    search_fields = ('=object_id', '=model')
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,14 @@
+"""
+App configuration for the audit app.
+"""
+
+from django.apps import AppConfig
+
+
+class AuditConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.audit'
+    label = 'audit'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,154 @@
+"""
+Buffered, asynchronous audit log.
+
+Change events are queued in memory once the surrounding transaction commits
+and written with one ``bulk_create`` per flush by a background thread. A flush
+happens every ``flush_interval`` seconds, as soon as ``batch_size`` events are
+waiting, and at interpreter exit, so request handlers and the bulk write paths
+never pay for an audit INSERT. With ``AUDIT_LOG_ASYNC = False`` events are
+written synchronously on commit instead (useful for scripts and tests).
+"""
+
+import atexit
+import contextvars
+import logging
+import threading
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# The request being served, set by ``AuditActorMiddleware``.
+current_request = contextvars.ContextVar('audit_current_request', default=None)
+
+# Fields never copied into an event, per model (``app_label.model_name``).
+EXCLUDED_FIELDS = {
+    'companies.employee': {'phone', 'email', 'salary', 'person_key', 'email_index'},
+}
+
+
+def current_actor_id():
+    """Id of the user behind the current request, if authenticated."""
+    request = current_request.get()
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        return user.id
+    return None
+
+
+def snapshot(instance, fields=None):
+    """JSON-safe values of the audited fields of ``instance``."""
+    excluded = EXCLUDED_FIELDS.get(instance._meta.label_lower, set())
+    values = {}
+    for field in instance._meta.concrete_fields:
+        if field.primary_key or field.name.startswith('_') or field.name in excluded:
+            continue
+        if field.name in ('created_at', 'updated_at'):
+            continue
+        if fields is not None and field.name not in fields and field.attname not in fields:
+            continue
+        value = field.value_from_object(instance)
+        # Values may still be raw input (e.g. a date given as a string)
+        if value is not None and not isinstance(value, (str, int, float, bool)):
+            value = str(value)
+        values[field.name] = value
+    return values
+
+
+class AuditLog:
+    """Thread-safe buffer of pending ``AuditEvent`` rows."""
+
+    def __init__(self, batch_size=500, flush_interval=2.0, max_buffer=50000, asynchronous=True):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self.asynchronous = asynchronous
+        self._pending = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+
+    def record(self, instances, action, fields=None):
+        """Queue one event per instance; written once the transaction commits."""
+        from .models import AuditEvent
+
+        actor_id = current_actor_id()
+        now = timezone.now()
+        events = [
+            AuditEvent(
+                model=instance._meta.label_lower,
+                object_id=str(instance.pk),
+                action=action,
+                changes={} if action == 'delete' else snapshot(instance, fields),
+                actor_id=actor_id,
+                timestamp=now,
+            )
+            for instance in instances
+        ]
+        if events:
+            transaction.on_commit(lambda: self._enqueue(events))
+
+    def _enqueue(self, events):
+        if not self.asynchronous:
+            self._write(events)
+            return
+        with self._lock:
+            self._pending.extend(events)
+            if len(self._pending) > self.max_buffer:
+                dropped = len(self._pending) - self.max_buffer
+                del self._pending[:dropped]
+                logger.error('Audit buffer full, dropped %d events', dropped)
+            full = len(self._pending) >= self.batch_size
+        self._ensure_thread()
+        if full:
+            self._wake.set()
+
+    def _ensure_thread(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='audit-log-flusher', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def _write(self, events):
+        from .models import AuditEvent
+
+        try:
+            AuditEvent.objects.bulk_create(events, batch_size=self.batch_size)
+        except Exception:
+            logger.exception('Failed to write %d audit events', len(events))
+            return False
+        return True
+
+    def flush(self):
+        """Write every pending event now. Returns the number written."""
+        with self._flush_lock:
+            with self._lock:
+                events, self._pending = self._pending, []
+            if not events:
+                return 0
+            if self._write(events):
+                return len(events)
+            # Keep the events for the next attempt rather than losing them
+            with self._lock:
+                self._pending[:0] = events
+            return 0
+
+
+audit_log = AuditLog(
+    batch_size=getattr(settings, 'AUDIT_LOG_BATCH_SIZE', 500),
+    flush_interval=getattr(settings, 'AUDIT_LOG_FLUSH_INTERVAL', 2.0),
+    max_buffer=getattr(settings, 'AUDIT_LOG_MAX_BUFFER', 50000),
+    asynchronous=getattr(settings, 'AUDIT_LOG_ASYNC', True),
+)
+atexit.register(audit_log.flush)
@@ -0,0 +1,23 @@
+"""
+Middleware for the audit app.
+"""
+
+from .log import current_request
+
+
+class AuditActorMiddleware:
+    """
+    Expose the current request to the audit log so events record the user
+    who made the change. The user is read when the event is recorded, after
+    DRF has authenticated the request.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = current_request.set(request)
+        try:
+            return self.get_response(request)
+        finally:
+            current_request.reset(token)
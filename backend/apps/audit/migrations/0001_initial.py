@@ -0,0 +1,35 @@
+# Generated by Django 5.0.2 on 2026-10-19 06:41
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuditEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model', models.CharField(max_length=100)),
+                ('object_id', models.CharField(max_length=64)),
+                ('action', models.CharField(choices=[('create', 'Create'), ('update', 'Update'), ('delete', 'Delete')], max_length=10)),
+                ('changes', models.JSONField(blank=True, default=dict)),
+                ('timestamp', models.DateTimeField()),
+                ('actor', models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Audit Event',
+                'verbose_name_plural': 'Audit Events',
+                'ordering': ['-timestamp', '-id'],
+                'indexes': [models.Index(fields=['model', 'object_id', 'timestamp'], name='audit_object_time_idx'), models.Index(fields=['timestamp'], name='audit_time_idx')],
+            },
+        ),
+    ]
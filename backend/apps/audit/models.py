@@ -0,0 +1,41 @@
+"""
+Models for the audit app.
+"""
+
+from django.conf import settings
+from django.db import models
+
+
+class AuditEvent(models.Model):
+    """
+    One change to an audited record: who made it, when and to which fields.
+    Rows are written in batches by ``apps.audit.log.AuditLog``.
+    """
+    ACTION_CHOICES = [
+        ('create', 'Create'),
+        ('update', 'Update'),
+        ('delete', 'Delete'),
+    ]
+
+    model = models.CharField(max_length=100)  # app_label.model_name
+    object_id = models.CharField(max_length=64)
+    action = models.CharField(max_length=10, choices=ACTION_CHOICES)
+    changes = models.JSONField(default=dict, blank=True)
+    # No database constraint: events outlive the users who made them.
+    actor = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.DO_NOTHING, null=True, blank=True,
+        db_constraint=False, related_name='+'
+    )
+    timestamp = models.DateTimeField()
+
+    class Meta:
+        verbose_name = 'Audit Event'
+        verbose_name_plural = 'Audit Events'
+        ordering = ['-timestamp', '-id']
+        indexes = [
+            models.Index(fields=['model', 'object_id', 'timestamp'], name='audit_object_time_idx'),
+            models.Index(fields=['timestamp'], name='audit_time_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.action} {self.model}#{self.object_id} at {self.timestamp:%Y-%m-%d %H:%M:%S}"
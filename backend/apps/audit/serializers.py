@@ -0,0 +1,15 @@
+"""
+Serializers for the audit app.
+"""
+
+from rest_framework import serializers
+from .models import AuditEvent
+
+
+class AuditEventSerializer(serializers.ModelSerializer):
+    """
+    Serializer for audit events.
+    """
+    class Meta:
+        model = AuditEvent
+        fields = ['id', 'model', 'object_id', 'action', 'changes', 'actor_id', 'timestamp']
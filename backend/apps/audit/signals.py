@@ -0,0 +1,26 @@
+"""
+Signal handlers that feed single-object changes into the audit log.
+
+The batch endpoints bypass ``save()`` and record their changes with
+``audit_log.record`` directly.
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.companies.models import Company, Employee
+from .log import audit_log
+
+
+@receiver(post_save, sender=Company)
+@receiver(post_save, sender=Employee)
+def audit_saved(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    audit_log.record([instance], 'create' if created else 'update', update_fields)
+
+
+@receiver(post_delete, sender=Company)
+@receiver(post_delete, sender=Employee)
+def audit_deleted(sender, instance, **kwargs):
+    audit_log.record([instance], 'delete')
@@ -0,0 +1,16 @@
+"""
+URL patterns for the audit app.
+"""
+
+from django.urls import path, include
+from rest_framework.routers import DefaultRouter
+from .views import AuditEventViewSet
+
+router = DefaultRouter()
+router.register(r'events', AuditEventViewSet, basename='audit-event')
+
+app_name = 'audit'
+
+urlpatterns = [
+    path('', include(router.urls)),
+]
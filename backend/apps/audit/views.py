@@ -0,0 +1,48 @@
+"""
+Views for the audit app.
+"""
+
+from django.utils.dateparse import parse_datetime
+from rest_framework import viewsets
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import CursorPagination
+
+from apps.companies.api.permissions import IsAdminRole
+from .models import AuditEvent
+from .serializers import AuditEventSerializer
+
+
+class AuditEventPagination(CursorPagination):
+    ordering = ('-timestamp', '-id')
+    page_size = 100
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+
+
+class AuditEventViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Audit trail, newest first. Filter with ``?model=`` (e.g.
+    ``companies.employee``), ``?object_id=``, ``?actor=`` and ``?since=`` /
+    ``?until=`` (ISO 8601 datetimes). Model + object_id + time range queries
+    are served by the ``audit_object_time_idx`` index.
+    """
+    serializer_class = AuditEventSerializer
+    permission_classes = [IsAdminRole]
+    pagination_class = AuditEventPagination
+
+    def get_queryset(self):
+        queryset = AuditEvent.objects.all()
+        params = self.request.query_params
+        if params.get('model'):
+            queryset = queryset.filter(model=params['model'].lower())
+        if params.get('object_id'):
+            queryset = queryset.filter(object_id=params['object_id'])
+        if params.get('actor'):
+            queryset = queryset.filter(actor_id=params['actor'])
+        for param, lookup in (('since', 'timestamp__gte'), ('until', 'timestamp__lt')):
+            if params.get(param):
+                value = parse_datetime(params[param])
+                if value is None:
+                    raise ValidationError({param: 'Use an ISO 8601 datetime.'})
+                queryset = queryset.filter(**{lookup: value})
+        return queryset
@@ -0,0 +1,96 @@
+"""
+Admin configuration for the companies app.
+"""
+
+from django import forms
+from django.contrib import admin, messages
+from django.contrib.admin.helpers import ActionForm
+from django.utils import timezone
+
+from apps.audit.log import audit_log
+from apps.core.admin import ScalableModelAdmin, chunked_update
+from .models import Company, Department, Employee
+
+
+class EmployeeActionForm(ActionForm):
+    """Action bar with the target department for ``reassign_department``."""
+    department = forms.IntegerField(required=False, label='Department id')
+
+
+@admin.register(Company)
+class CompanyAdmin(ScalableModelAdmin):
+    list_display = ('name', 'registration_number', 'registration_date', 'employee_count', 'created_by')
+    list_select_related = ('created_by',)
+    search_fields = ('name', '=registration_number')
+    autocomplete_fields = ('created_by',)
+    readonly_fields = ('employee_count', 'created_at', 'updated_at')
+
+
+@admin.register(Department)
+class DepartmentAdmin(ScalableModelAdmin):
+    list_display = ('name', 'company')
+    list_select_related = ('company',)
+    search_fields = ('name', 'company__name')
+    autocomplete_fields = ('company',)
+
+
+@admin.register(Employee)
+class EmployeeAdmin(ScalableModelAdmin):
+    list_display = ('name', 'employee_id', 'company', 'department', 'position', 'is_active')
+    # Department.__str__ includes its company name
+    list_select_related = ('company', 'department__company')
+    list_filter = ('is_active',)
+    search_fields = ('=employee_id', '^name')
+    autocomplete_fields = ('company', 'department')
+    readonly_fields = ('created_at', 'updated_at')
+    action_form = EmployeeActionForm
+    actions = ['deactivate_employees', 'reassign_department']
+
+    @admin.action(description='Deactivate selected employees')
+    def deactivate_employees(self, request, queryset):
+        updated = chunked_update(
+            queryset.filter(is_active=True),
+            on_chunk=lambda pks: audit_log.record(Employee.objects.filter(pk__in=pks), 'update', {'is_active'}),
+            is_active=False,
+            updated_at=timezone.now(),
+        )
+        self.message_user(request, f'Deactivated {updated} employees.')
+
+    @admin.action(description='Reassign selected employees to the department id entered above')
+    def reassign_department(self, request, queryset):
+        from apps.employees.models import EmployeeHistory
+
+        department_id = request.POST.get('department', '')
+        department = Department.objects.filter(pk=department_id).first() if department_id.isdigit() else None
+        if department is None:
+            self.message_user(request, 'Enter the id of an existing department.', messages.ERROR)
+            return
+
+        today = timezone.now().date()
+
+        def move_history(pks):
+            # Same bookkeeping as the batch update endpoint: close the open
+            # assignment and start a new one in the new department.
+            employees = list(Employee.objects.filter(pk__in=pks))
+            EmployeeHistory.close_current(employees, today)
+            EmployeeHistory.bulk_create_encrypted([
+                EmployeeHistory(
+                    employee=e, company_id=e.company_id, department_id=e.department_id,
+                    position=e.position, start_date=today, end_date=None, duties=''
+                )
+                for e in employees
+            ])
+            audit_log.record(employees, 'update', {'department'})
+
+        other_company = queryset.exclude(company_id=department.company_id).count()
+        updated = chunked_update(
+            queryset.filter(company_id=department.company_id).exclude(department=department),
+            on_chunk=move_history,
+            department=department,
+            updated_at=timezone.now(),
+        )
+        self.message_user(request, f'Moved {updated} employees to {department}.')
+        if other_company:
+            self.message_user(
+                request, f'Skipped {other_company} employees of other companies.', messages.WARNING
+            )
@@ -3,8 +3,7 @@ from rest_framework import permissions
 class IsAdminRole(permissions.BasePermission):
     """
     Custom permission to only allow users with admin role to access the view.
-   
-    def has_permission(self, request, view):
-        return request.user and request.user.role == 'admin' 
+    """
 
-     """
\ No newline at end of file
+    def has_permission(self, request, view):
+        return bool(request.user and getattr(request.user, 'role', None) == 'admin')
@@ -3,11 +3,30 @@ Serializers for the companies app.
 """
 
 from rest_framework import serializers
+from django.db.models import Prefetch
 from ..models import Company, Employee , Department
 from apps.employees.models import EmployeeHistory
+from django.conf import settings
+from apps.core.serializers import PartialListSerializer, PrefetchedPrimaryKeyRelatedField, PrefetchedUniqueValidator
+from apps.core.fieldsets import SparseFieldsMixin
+from ..search_cache import employee_search_cache
+from apps.audit.log import audit_log
+from apps.core.utils import split_names
 from datetime import datetime
 
-class DepartmentSerializer(serializers.ModelSerializer):
+# Compact nested representations for ?expand=
+COMPANY_REFERENCE = ('apps.companies.api.serializers.CompanySerializer', {'fields': ['id', 'name', 'registration_number']})
+DEPARTMENT_REFERENCE = ('apps.companies.api.serializers.DepartmentSerializer', {'fields': ['id', 'name']})
+
+def current_histories(lookup):
+    """Prefetch of the open history rows behind ``lookup``, with their employees."""
+    return Prefetch(
+        lookup,
+        queryset=EmployeeHistory.objects.filter(end_date__isnull=True).select_related('employee'),
+        to_attr='current_histories'
+    )
+
+class DepartmentSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     #total_employees = serializers.SerializerMethodField()
     employees = serializers.SerializerMethodField()
     company_name = serializers.SerializerMethodField()
@@ -15,14 +34,20 @@ class DepartmentSerializer(serializers.ModelSerializer):
     class Meta:
         model = Department
         fields = ['id', 'name', 'company', 'company_name', 'employees']
+        expandable_fields = {'company': COMPANY_REFERENCE}
+        field_sources = {
+            'company_name': ['company__name'],
+            'employees': [current_histories('history_set')],
+        }
 
     def get_total_employees(self, obj):
         return obj.get_total_employees()
 
     def get_employees(self, obj):
         # Only include active employees currently in this department
-        from apps.employees.models import EmployeeHistory
-        histories = EmployeeHistory.objects.filter(department=obj, end_date__isnull=True)
+        histories = getattr(obj, 'current_histories', None)
+        if histories is None:
+            histories = EmployeeHistory.objects.filter(department=obj, end_date__isnull=True).select_related('employee')
         employees = [h.employee for h in histories if h.employee.is_active]
         from .serializers import EmployeeSerializer as EmpSerializer  # avoid circular import
         return EmpSerializer(employees, many=True).data
@@ -38,11 +63,36 @@ class EmployeeHistoryInputSerializer(serializers.Serializer):
     end_date = serializers.DateField(allow_null=True, required=False)
     duties = serializers.CharField(allow_blank=True, required=False)
 
-class EmployeeSerializer(serializers.ModelSerializer):
+class EmployeeListSerializer(PartialListSerializer):
+    """
+    List serializer used for batch writes. Persists with a single
+    ``bulk_create`` and encrypts sensitive fields in one pass.
+    """
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault('allow_empty', False)
+        kwargs.setdefault('max_length', settings.EMPLOYEE_BATCH_MAX_SIZE)
+        super().__init__(*args, **kwargs)
+
+    def create(self, validated_data):
+        employees = [
+            Employee(**{k: v for k, v in attrs.items() if k != 'history'})
+            for attrs in validated_data
+        ]
+        Employee.encrypt_batch(employees)
+        employees = Employee.objects.bulk_create(employees)
+        # bulk_create sends no post_save signals
+        audit_log.record(employees, 'create')
+        employee_search_cache.invalidate()
+        return employees
+
+class EmployeeSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """
     Serializer for the Employee model (not EmployeeHistory!).
     """
     history = EmployeeHistoryInputSerializer(many=True, required=False, write_only=True)
+    serializer_related_field = PrefetchedPrimaryKeyRelatedField
+
     class Meta:
         model = Employee
         fields = [
@@ -50,6 +100,13 @@ class EmployeeSerializer(serializers.ModelSerializer):
             'gender', 'joining_date', 'salary', 'position', 'is_active', 'history'
         ]
         read_only_fields = ('id',)
+        list_serializer_class = EmployeeListSerializer
+        expandable_fields = {'company': COMPANY_REFERENCE, 'department': DEPARTMENT_REFERENCE}
+        # Batch writes check uniqueness with one query per field (see prefetch_batch)
+        extra_kwargs = {
+            'employee_id': {'validators': [PrefetchedUniqueValidator(queryset=Employee._default_manager)]},
+            'email': {'validators': [PrefetchedUniqueValidator(queryset=Employee._default_manager)]},
+        }
 
     def validate_date_of_birth(self, value):
         if value > datetime.now().date():
@@ -62,45 +119,69 @@ class EmployeeSerializer(serializers.ModelSerializer):
         return value
 
 
-class CompanySerializer(serializers.ModelSerializer):
+class DepartmentNamesField(serializers.Field):
+    """
+    A company's department names, read from its (prefetched) Department rows.
+    Accepts a list, a JSON array or a comma/semicolon/newline separated string.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault('source', 'department')
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        return [department.name for department in value.all()]
+
+    def to_internal_value(self, data):
+        if not isinstance(data, (str, list, tuple)):
+            raise serializers.ValidationError('Invalid departments format')
+        return split_names(data)
+
+
+class CompanySerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """
     Serializer for the Company model.
     """
     employees = EmployeeSerializer(many=True, read_only=True)
     current_employees = serializers.SerializerMethodField()
     employee_count = serializers.IntegerField(read_only=True)
-    departments = serializers.CharField(write_only=True, required=False, allow_blank=True)
+    departments = DepartmentNamesField(required=False)
     
     class Meta:
         model = Company
-        fields = '__all__'
+        # name_key is the stored lookup form of name, not part of the API
+        exclude = ('name_key',)
         read_only_fields = ('created_by', 'created_at', 'updated_at', 'employee_count')
-    
-    def get_departments(self, obj):
-        return [dept.name for dept in obj.department.all()]
+        expandable_fields = {
+            'created_by': ('apps.users.serializers.UserSummarySerializer', {'fields': ['id', 'username', 'email', 'role']}),
+        }
+        field_sources = {'current_employees': [current_histories('employee_histories')]}
 
     def get_current_employees(self, obj):
         # Employees with a history at this company and end_date is null (current)
-        histories = EmployeeHistory.objects.filter(company=obj, end_date__isnull=True)
+        histories = getattr(obj, 'current_histories', None)
+        if histories is None:
+            histories = EmployeeHistory.objects.filter(company=obj, end_date__isnull=True).select_related('employee')
         employees = [h.employee for h in histories if h.employee is not None]
         return EmployeeSerializer(employees, many=True).data
 
-    def validate_departments(self, value):
-        # Accept string (split by commas/newlines/semicolons) or list
-        import re
-        if isinstance(value, list):
-            return [str(v).strip() for v in value if str(v).strip()]
-        if isinstance(value, str):
-            return [v.strip() for v in re.split(r'[\n,;]+', value) if v.strip()]
-        raise serializers.ValidationError('Invalid departments format')
-
     def to_internal_value(self, data):
-        # Ensure departments is always a list for backend processing
-        ret = super().to_internal_value(data)
-        departments = data.get('departments') or data.get('department')
-        if departments is not None:
-            ret['departments'] = self.validate_departments(departments)
-        return ret
+        # Bulk uploads send the department list under the singular key
+        if 'departments' not in data and 'department' in data:
+            data = {**data, 'departments': data['department']}
+        return super().to_internal_value(data)
+
+    def create(self, validated_data):
+        departments = validated_data.pop('department', None)
+        company = super().create(validated_data)
+        company.add_departments(departments)
+        return company
+
+    def update(self, instance, validated_data):
+        departments = validated_data.pop('department', None)
+        company = super().update(instance, validated_data)
+        company.add_departments(departments)
+        return company
 
     def validate_registration_date(self, value):
         """
@@ -110,11 +191,26 @@ class CompanySerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("Registration date cannot be in the future")
         return value
 
+class CompanyNameSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    """
+    A company as seen by users outside the admin and company roles.
+    """
+
+    class Meta:
+        model = Company
+        fields = ['id', 'name']
+        read_only_fields = fields
+
+
 class CompanyBulkUploadSerializer(serializers.Serializer):
     """
     Serializer for bulk uploading companies.
     """
     file = serializers.FileField()
+    # Hold back new companies whose name closely matches an existing one
+    match = serializers.BooleanField(required=False, default=False)
+    # Import a file again even if the same content was uploaded recently
+    allow_duplicate = serializers.BooleanField(required=False, default=False)
     
     def validate_file(self, value):
         """
@@ -124,12 +220,24 @@ class CompanyBulkUploadSerializer(serializers.Serializer):
             raise serializers.ValidationError("File must be a CSV or Excel file")
         return value
 
+class CompanyMatchSerializer(serializers.Serializer):
+    """
+    Serializer for fuzzy company name match requests.
+    """
+    names = serializers.ListField(
+        child=serializers.CharField(max_length=255), allow_empty=False, max_length=1000
+    )
+    limit = serializers.IntegerField(required=False, default=5, min_value=1, max_value=50)
+    threshold = serializers.FloatField(required=False, min_value=0, max_value=1)
+
 class EmployeeBulkUploadSerializer(serializers.Serializer):
     """
     Serializer for bulk uploading employees.
     """
     company_id = serializers.IntegerField()
     file = serializers.FileField()
+    # Import a file again even if the same content was uploaded recently
+    allow_duplicate = serializers.BooleanField(required=False, default=False)
     
     def validate_file(self, value):
         """
@@ -147,4 +255,10 @@ class EmployeeBulkUploadSerializer(serializers.Serializer):
             Company.objects.get(id=value)
         except Company.DoesNotExist:
             raise serializers.ValidationError("Company does not exist")
-        return value 
\ No newline at end of file
+        return value
+
+class EmployeeBatchDeleteSerializer(serializers.Serializer):
+    """
+    Serializer for batch deleting employees by id.
+    """
+    ids = serializers.ListField(child=serializers.IntegerField(), allow_empty=False)
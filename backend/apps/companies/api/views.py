@@ -2,24 +2,37 @@
 Views for the companies app.
 """
 
-from rest_framework import viewsets, status, permissions
+from rest_framework import viewsets, status, permissions, serializers
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.parsers import MultiPartParser, JSONParser
+from django.conf import settings
+from django.db import IntegrityError, transaction
 from django.db.models import Q
+from django.utils import timezone
 from ..models import Company, Employee, Department
+from ..autocomplete import autocomplete_cache
+from ..search_cache import employee_search_cache, search_key
+from ..matching import company_matcher
 from ..api.serializers import (
-    CompanySerializer, EmployeeSerializer,
-    CompanyBulkUploadSerializer, EmployeeBulkUploadSerializer,DepartmentSerializer
+    CompanySerializer, CompanyNameSerializer, EmployeeSerializer,
+    CompanyBulkUploadSerializer, EmployeeBulkUploadSerializer,DepartmentSerializer,
+    EmployeeBatchDeleteSerializer, EmployeeHistoryInputSerializer, CompanyMatchSerializer
 )
-from apps.employees.models import EmployeeHistory
+from apps.employees.models import EmployeeHistory, EmployeeHistoryArchive
+from apps.audit.log import audit_log
 from .permissions import IsAdminRole
-import pandas as pd
+from apps.core.utils import split_names
+from apps.core.dedup import ExistingKeys, find_duplicate_rows, normalize_key
+from apps.core.bulk_imports import begin_upload, complete_upload, fail_upload, import_chunks, record_loader
+from apps.core.uploads import SpooledUploadMixin, read_table
+from apps.core.fieldsets import SparseQuerysetMixin
+from apps.core.serializers import prefetch_batch
+from apps.core.throttling import SearchThrottle, UploadThrottle
 import json
-import re
 
 
-class CompanyViewSet(viewsets.ModelViewSet):
+class CompanyViewSet(SpooledUploadMixin, SparseQuerysetMixin, viewsets.ModelViewSet):
     """
     ViewSet for viewing and editing company instances.
     """
@@ -32,31 +45,28 @@ class CompanyViewSet(viewsets.ModelViewSet):
             return [IsAdminRole()]
         return [permissions.IsAuthenticated()]
 
+    def names_only(self):
+        """Users outside the admin and company roles see company names, nothing else."""
+        user = self.request.user
+        return not (user.role == 'admin' or (user.role == 'company' and user.company_id))
+
+    def get_serializer_class(self):
+        if self.names_only():
+            return CompanyNameSerializer
+        return super().get_serializer_class()
+
     def get_queryset(self):
         user = self.request.user
+        if self.names_only():
+            return Company.objects.only('id', 'name')
+        # Department names are read from one prefetch query per page
+        queryset = Company.objects.prefetch_related('department')
         if user.role == 'admin':
-            return Company.objects.all()
-        elif user.role == 'company' and hasattr(user, 'company'):
-            return Company.objects.filter(id=user.company.id)
-        else:
-            return Company.objects.all().only('name', 'department')
-
-    def _create_departments(self, company, departments):
-        if not departments:
-            return
-        import re
-        if isinstance(departments, list):
-            departments = [d.strip() for d in departments if d.strip()]
-        else:
-            departments = [d.strip() for d in re.split(r'(?:\\n|\n|,|;)+', departments) if d.strip()]
-        for dept_name in departments:
-            from ..models import Department
-            Department.objects.get_or_create(company=company, name=dept_name)
+            return queryset
+        return queryset.filter(id=user.company_id)
 
     def perform_create(self, serializer):
-        company = serializer.save(created_by=self.request.user)
-        departments = self.request.data.get('departments') or self.request.data.get('department')
-        self._create_departments(company, departments)
+        company = serializer.save(created_by_id=self.request.user.id)
         # --- Create company admin user if admin data is provided ---
         admin_email = self.request.data.get('admin_email')
         admin_username = self.request.data.get('admin_username')
@@ -75,37 +85,62 @@ class CompanyViewSet(viewsets.ModelViewSet):
                     is_superuser=True
                 )
 
-    def perform_update(self, serializer):
-        company = serializer.save()
-        departments = self.request.data.get('departments') or self.request.data.get('department')
-        self._create_departments(company, departments)
-
-    @action(detail=False, methods=['post'])
+    @action(detail=False, methods=['post'], throttle_classes=[UploadThrottle])
     def bulk_upload(self, request):
         serializer = CompanyBulkUploadSerializer(data=request.data)
         if not serializer.is_valid():
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
         file = serializer.validated_data['file']
+        if not hasattr(request.user, 'id') or not request.user.is_authenticated:
+            return Response({'error': 'Authentication required for bulk upload.'}, status=status.HTTP_401_UNAUTHORIZED)
+
+        records = {'companies': record_loader(
+            self.get_queryset(), lambda companies: self.get_serializer(companies, many=True).data
+        )}
+        upload, response = begin_upload(
+            request, 'companies', file,
+            scope='match' if serializer.validated_data['match'] else '',
+            allow_duplicate=serializer.validated_data['allow_duplicate'], records=records,
+        )
+        if response is not None:
+            return response
+        import pandas as pd  # loaded on first upload, not at worker start
         try:
-            print('DEBUG bulk_upload: request.user =', request.user, '| is_authenticated =', getattr(request.user, 'is_authenticated', None), '| id =', getattr(request.user, 'id', None))
-            if not hasattr(request.user, 'id') or not request.user.is_authenticated:
-                return Response({'error': 'Authentication required for bulk upload.'}, status=status.HTTP_401_UNAUTHORIZED)
-
-            df = pd.read_csv(file) if file.name.endswith('.csv') else pd.read_excel(file)
-            companies, errors = [], []
-
-            for index, row in df.iterrows():
+            df = read_table(file)
+
+            # Existing registration numbers are updated, so only in-file repeats are errors
+            duplicates = find_duplicate_rows({'registration_number': df['registration_number'].tolist()})
+            reg_numbers = {normalize_key(value) for value in df['registration_number']} - {None}
+            existing_companies = Company.objects.in_bulk(reg_numbers, field_name='registration_number')
+
+            # Optional reconciliation: new companies that look like existing ones are held back
+            possible_matches = {}
+            if serializer.validated_data['match']:
+                new_rows = [
+                    (index, row['name']) for index, row in df.iterrows()
+                    if index not in duplicates
+                    and normalize_key(row['registration_number']) not in existing_companies
+                ]
+                found = company_matcher.match_many(
+                    [name for _, name in new_rows], limit=3, threshold=settings.COMPANY_MATCH_THRESHOLD
+                )
+                possible_matches = {index: matches for (index, _), matches in zip(new_rows, found) if matches}
+
+            def import_row(index, row, output):
+                if index in duplicates:
+                    output['errors'].append({'row': index + 1, 'errors': duplicates[index]})
+                    return
+                if index in possible_matches:
+                    output['possible_matches'].append(
+                        {'row': index + 1, 'name': row['name'], 'candidates': possible_matches[index]}
+                    )
+                    return
                 try:
-                    department = row.get('department', '[]')
-                    if isinstance(department, str):
-                        try:
-                            department = json.loads(department)
-                        except json.JSONDecodeError:
-                            department = [d.strip() for d in re.split(r',|;', department)]
+                    department = split_names(row.get('department'))
 
                     registration_date = pd.to_datetime(row['registration_date']).date()
-                    reg_number = str(row['registration_number'])
+                    reg_number = normalize_key(row['registration_number'])
                     company_data = {
                         'name': row['name'],
                         'registration_date': registration_date,
@@ -118,56 +153,80 @@ class CompanyViewSet(viewsets.ModelViewSet):
                         'email': row['email'],
                     }
 
-                    from ..models import Company
-                    existing_company = Company.objects.filter(registration_number=reg_number).first()
+                    existing_company = existing_companies.get(reg_number)
                     if existing_company:
                         # Update existing company
                         for field, value in company_data.items():
                             if field != 'department':
                                 setattr(existing_company, field, value)
                         existing_company.save()
-                        self._create_departments(existing_company, department)
-                        companies.append(self.get_serializer(existing_company).data)
+                        existing_company.add_departments(department)
+                        output['companies'].append(self.get_serializer(existing_company).data)
                     else:
                         # Create new company
-                        serializer = self.get_serializer(data=company_data)
-                        if serializer.is_valid():
-                            company = serializer.save(created_by=request.user)
-                            self._create_departments(company, department)
-                            companies.append(serializer.data)
+                        company_serializer = self.get_serializer(data=company_data)
+                        if company_serializer.is_valid():
+                            company_serializer.save(created_by_id=request.user.id)
+                            output['companies'].append(company_serializer.data)
                         else:
-                            errors.append({'row': index + 1, 'errors': serializer.errors})
+                            output['errors'].append({'row': index + 1, 'errors': company_serializer.errors})
                 except Exception as e:
-                    errors.append({'row': index + 1, 'errors': str(e)})
+                    output['errors'].append({'row': index + 1, 'errors': str(e)})
 
-            return Response({
-                'message': f'Successfully created {len(companies)} companies',
-                'companies': companies,
-                'errors': errors
-            }, status=status.HTTP_201_CREATED)
+            output = import_chunks(
+                upload, df, import_row, ('companies', 'errors', 'possible_matches'), records=records
+            )
+            result = {
+                'message': f'Successfully created {len(output["companies"])} companies',
+                **output,
+            }
+            complete_upload(upload, result, records)
+            return Response({**result, 'upload': upload.progress()}, status=status.HTTP_201_CREATED)
 
         except Exception as e:
+            fail_upload(upload, e)
             return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-    @action(detail=False, methods=['post'])
+    @action(detail=False, methods=['get', 'post'])
+    def match(self, request):
+        """
+        Suggest existing companies for one name (GET ``?name=``) or a list of
+        names (POST ``{"names": [...]}``), best match first.
+        """
+        if request.method == 'GET':
+            data = {'names': [request.query_params.get('name', '')]}
+            data.update((key, request.query_params[key]) for key in ('limit', 'threshold') if key in request.query_params)
+        else:
+            data = request.data
+        serializer = CompanyMatchSerializer(data=data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        names = serializer.validated_data['names']
+        matches = company_matcher.match_many(
+            names,
+            limit=serializer.validated_data['limit'],
+            threshold=serializer.validated_data.get('threshold', 0.0),
+        )
+        if request.method == 'GET':
+            return Response(matches[0])
+        return Response([{'name': name, 'matches': found} for name, found in zip(names, matches)])
+
+    @action(detail=True, methods=['post'])
     def update_department(self, request, pk=None):
         company = self.get_object()
         user = request.user
-        if user.role != 'admin' and (not hasattr(user, 'company') or user.company.id != company.id):
+        if user.role != 'admin' and user.company_id != company.id:
             return Response({"error": "Permission denied"}, status=status.HTTP_403_FORBIDDEN)
 
-        department_text = request.data.get('department', '')
-        if isinstance(department_text, list):
-            # Convert list to a comma-separated string
-            department_text = ', '.join(department_text)
-
-        department = [d.strip() for d in re.split(r'(?:\\n|\n|,|;)+', department_text) if d.strip()]
-        company.department = ', '.join(department)  # Store as a string
-        company.save()
+        departments = request.data.get('departments') or request.data.get('department', '')
+        company.add_departments(departments)
+        # Re-read the departments rather than the stale prefetch
+        company = self.get_queryset().get(pk=company.pk)
         return Response(self.get_serializer(company).data)
 
 
-class EmployeeViewSet(viewsets.ModelViewSet):
+class EmployeeViewSet(SpooledUploadMixin, SparseQuerysetMixin, viewsets.ModelViewSet):
     """
     ViewSet for viewing and editing employee instances.
     """
@@ -176,7 +235,7 @@ class EmployeeViewSet(viewsets.ModelViewSet):
     parser_classes = [MultiPartParser, JSONParser]
 
     def get_permissions(self):
-        if self.action in ['create', 'update', 'partial_update', 'destroy', 'bulk_upload']:
+        if self.action in ['create', 'update', 'partial_update', 'destroy', 'bulk_upload', 'batch']:
             return [IsAdminRole()]
         return [permissions.IsAuthenticated()]
     
@@ -190,35 +249,25 @@ class EmployeeViewSet(viewsets.ModelViewSet):
             )
         # This thing need to be posted to employee app
     def perform_create(self, serializer):
-        employee = serializer.save()
-        # Handle past work history if provided
-        history_data = self.request.data.get('history', [])
-        if isinstance(history_data, str):
-            import json
-            history_data = json.loads(history_data)
-        for hist in history_data:
-            from apps.companies.models import Company, Department
-            company = Company.objects.get(id=hist['company'])
-            department = Department.objects.get(id=hist['department'])
-            EmployeeHistory.objects.create(
-                employee=employee,
-                company=company,
-                department=department,
-                position=hist.get('position', ''),
-                start_date=hist.get('start_date'),
-                end_date=hist.get('end_date'),
-                duties=hist.get('duties', '')
-            )
-        # Add current job as the latest history (on top)
-        EmployeeHistory.objects.create(
-            employee=employee,
-            company=employee.company,
-            department=employee.department,
-            position=employee.position,
-            start_date=employee.joining_date,
-            end_date=None,
-            duties=getattr(employee, 'duties', '')
-        )
+        # Past work history is written here, not by the serializer.
+        history_data = serializer.validated_data.pop('history', None)
+        if history_data is None:
+            # Multipart requests send the history list as a JSON string.
+            history_data = self.request.data.get('history') or []
+            if isinstance(history_data, str):
+                history_data = json.loads(history_data)
+            history_serializer = EmployeeHistoryInputSerializer(data=history_data, many=True)
+            history_serializer.is_valid(raise_exception=True)
+            history_data = history_serializer.validated_data
+
+        companies, departments = self._resolve_history_refs([history_data])
+        if any(h['company'] not in companies or h['department'] not in departments for h in history_data):
+            raise serializers.ValidationError({'history': ['Unknown company or department']})
+
+        with transaction.atomic():
+            employee = serializer.save()
+            # Past history plus the current job (on top), in one insert
+            self._bulk_create_history([employee], [history_data], companies, departments)
     
     def perform_update(self, serializer):
         from datetime import datetime
@@ -256,12 +305,12 @@ class EmployeeViewSet(viewsets.ModelViewSet):
         user = self.request.user
         if user.role == 'admin':
             return Employee.objects.all()
-        elif user.role == 'company' and hasattr(user, 'company'):
-            return Employee.objects.filter(company=user.company)
+        elif user.role == 'company' and user.company_id:
+            return Employee.objects.filter(company_id=user.company_id)
         else:
-            return Employee.objects.filter(company=user.company)
+            return Employee.objects.filter(company_id=user.company_id)
 
-    @action(detail=False, methods=['post'])
+    @action(detail=False, methods=['post'], throttle_classes=[UploadThrottle])
     def bulk_upload(self, request):
         serializer = EmployeeBulkUploadSerializer(data=request.data)
         if not serializer.is_valid():
@@ -269,16 +318,40 @@ class EmployeeViewSet(viewsets.ModelViewSet):
 
         file = serializer.validated_data['file']
         company_id = serializer.validated_data['company_id']
-
         try:
             company = Company.objects.get(id=company_id)
-            df = pd.read_csv(file) if file.name.endswith('.csv') else pd.read_excel(file)
-            employees, errors = [], []
+        except Company.DoesNotExist:
+            return Response({'error': 'Company not found'}, status=status.HTTP_404_NOT_FOUND)
+
+        records = {'employees': record_loader(
+            self.get_queryset(), lambda employees: self.get_serializer(employees, many=True).data
+        )}
+        upload, response = begin_upload(
+            request, 'company_employees', file, scope=str(company.id),
+            allow_duplicate=serializer.validated_data['allow_duplicate'], records=records,
+        )
+        if response is not None:
+            return response
+        import pandas as pd  # loaded on first upload, not at worker start
+
+        try:
+            df = read_table(file)
+
+            # Reject repeated or already registered keys before any insert
+            key_columns = [field for field in ('employee_id', 'email') if field in df.columns]
+            duplicates = find_duplicate_rows(
+                {field: df[field].tolist() for field in key_columns},
+                {field: ExistingKeys(Employee.objects.all(), field) for field in key_columns},
+            )
 
-            for index, row in df.iterrows():
+            def import_row(index, row, output):
+                if index in duplicates:
+                    output['errors'].append({'row': index + 1, 'errors': duplicates[index]})
+                    return
                 try:
                     employee_data = {
                         'company': company.id,
+                        'employee_id': normalize_key(row.get('employee_id')),
                         'first_name': row['first_name'],
                         'last_name': row['last_name'],
                         'email': row['email'],
@@ -292,25 +365,266 @@ class EmployeeViewSet(viewsets.ModelViewSet):
                         'is_active': bool(row.get('is_active', True))
                     }
 
-                    serializer = self.get_serializer(data=employee_data)
-                    if serializer.is_valid():
-                        serializer.save()
-                        employees.append(serializer.data)
+                    employee_serializer = self.get_serializer(data=employee_data)
+                    if employee_serializer.is_valid():
+                        employee_serializer.save()
+                        output['employees'].append(employee_serializer.data)
                     else:
-                        errors.append({'row': index + 1, 'errors': serializer.errors})
+                        output['errors'].append({'row': index + 1, 'errors': employee_serializer.errors})
                 except Exception as e:
-                    errors.append({'row': index + 1, 'errors': str(e)})
+                    output['errors'].append({'row': index + 1, 'errors': str(e)})
 
-            return Response({
-                'message': f'Successfully created {len(employees)} employees',
-                'employees': employees,
-                'errors': errors
-            }, status=status.HTTP_201_CREATED)
-
-        except Company.DoesNotExist:
-            return Response({'error': 'Company not found'}, status=status.HTTP_404_NOT_FOUND)
+            output = import_chunks(upload, df, import_row, ('employees', 'errors'), records=records)
+        except Exception as e:
+            fail_upload(upload, e)
+            raise
+
+        result = {
+            'message': f'Successfully created {len(output["employees"])} employees',
+            **output,
+        }
+        complete_upload(upload, result, records)
+        return Response({**result, 'upload': upload.progress()}, status=status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=['post', 'patch', 'delete'])
+    def batch(self, request):
+        """
+        Create (POST), update (PATCH) or delete (DELETE) many employees in one
+        request. Writes happen in a single transaction with bulk ORM
+        operations; the response carries one result per submitted item.
+        """
+        if request.method == 'POST':
+            return self._batch_create(request)
+        if request.method == 'PATCH':
+            return self._batch_update(request)
+        return self._batch_delete(request)
+
+    def _batch_items(self, request):
+        items = request.data
+        if isinstance(items, dict):
+            items = items.get('employees')
+        if not isinstance(items, list) or not items:
+            return None, Response({'error': 'Expected a non-empty list of employees'}, status=status.HTTP_400_BAD_REQUEST)
+        limit = settings.EMPLOYEE_BATCH_MAX_SIZE
+        if len(items) > limit:
+            return None, Response({'error': f'Batch of {len(items)} exceeds the limit of {limit} employees'}, status=status.HTTP_400_BAD_REQUEST)
+        return items, None
+
+    def _batch_response(self, results, done_status, http_status):
+        succeeded = sum(1 for r in results if r['status'] == done_status)
+        if not succeeded:
+            http_status = status.HTTP_400_BAD_REQUEST
+        return Response({
+            'message': f'Successfully {done_status} {succeeded} of {len(results)} employees',
+            'results': results
+        }, status=http_status)
+
+    def _resolve_history_refs(self, history_payloads):
+        """
+        Load every company and department referenced by the history payloads
+        with one ``in_bulk`` per model, however long the careers are.
+        """
+        company_ids = {h['company'] for payload in history_payloads for h in payload}
+        department_ids = {h['department'] for payload in history_payloads for h in payload}
+        companies = Company.objects.in_bulk(company_ids) if company_ids else {}
+        departments = Department.objects.in_bulk(department_ids) if department_ids else {}
+        return companies, departments
+
+    def _bulk_create_history(self, employees, history_payloads, companies, departments):
+        """
+        Insert past history from the payload plus the current job for each
+        employee, mirroring ``perform_create``, with a single bulk insert.
+        """
+        histories = []
+        for employee, payload in zip(employees, history_payloads):
+            for hist in payload:
+                histories.append(EmployeeHistory(
+                    employee=employee,
+                    company=companies[hist['company']],
+                    department=departments[hist['department']],
+                    position=hist.get('position', ''),
+                    start_date=hist.get('start_date'),
+                    end_date=hist.get('end_date'),
+                    duties=hist.get('duties', '')
+                ))
+            histories.append(EmployeeHistory(
+                employee=employee,
+                company=employee.company,
+                department=employee.department,
+                position=employee.position,
+                start_date=employee.joining_date,
+                end_date=None,
+                duties=''
+            ))
+        EmployeeHistory.bulk_create_encrypted(histories)
+
+    def _batch_create(self, request):
+        items, error = self._batch_items(request)
+        if error:
+            return error
+
+        results = [None] * len(items)
+        serializer = self.get_serializer(data=items, many=True)
+        if not serializer.is_valid():
+            if isinstance(serializer.errors, dict):
+                return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+            for index, errors in enumerate(serializer.errors):
+                if errors:
+                    results[index] = {'index': index, 'status': 'error', 'errors': errors}
+        candidates = sorted(serializer.valid_items)
+
+        # Unique fields are only checked against the database by the
+        # serializer; catch collisions inside the batch before inserting.
+        seen_ids, seen_emails, accepted = set(), set(), []
+        for index in candidates:
+            attrs = serializer.valid_items[index]
+            employee_id, email = attrs['employee_id'], attrs['email'].lower()
+            if employee_id in seen_ids or email in seen_emails:
+                results[index] = {'index': index, 'status': 'error', 'errors': {
+                    'non_field_errors': ['Duplicate employee_id or email within the batch']
+                }}
+                continue
+            seen_ids.add(employee_id)
+            seen_emails.add(email)
+            accepted.append(index)
+
+        # Resolve history references for the whole batch up front.
+        history_refs = {
+            index: [(h['company'], h['department']) for h in serializer.valid_items[index].get('history', [])]
+            for index in accepted
+        }
+        companies, departments = self._resolve_history_refs(
+            [serializer.valid_items[index].get('history', []) for index in accepted]
+        )
+        resolvable = []
+        for index in accepted:
+            if all(c in companies and d in departments for c, d in history_refs[index]):
+                resolvable.append(index)
+            else:
+                results[index] = {'index': index, 'status': 'error', 'errors': {
+                    'history': ['Unknown company or department']
+                }}
+
+        if resolvable:
+            validated = [serializer.valid_items[index] for index in resolvable]
+            history_payloads = [attrs.get('history', []) for attrs in validated]
+            try:
+                with transaction.atomic():
+                    employees = serializer.create(validated)
+                    self._bulk_create_history(employees, history_payloads, companies, departments)
+                    Company.refresh_employee_counts({e.company_id for e in employees})
+            except IntegrityError as e:
+                return Response({'error': f'Batch rejected: {str(e)}'}, status=status.HTTP_409_CONFLICT)
+            for index, employee in zip(resolvable, employees):
+                results[index] = {'index': index, 'status': 'created', 'id': employee.id, 'employee_id': employee.employee_id}
+
+        return self._batch_response(results, 'created', status.HTTP_201_CREATED)
+
+    def _batch_update(self, request):
+        items, error = self._batch_items(request)
+        if error:
+            return error
+
+        ids = []
+        for item in items:
+            try:
+                ids.append(int(item['id']))
+            except (TypeError, KeyError, ValueError):
+                ids.append(None)
+        instances = self.get_queryset().select_related('company', 'department').in_bulk(
+            {i for i in ids if i is not None}
+        )
 
-    @action(detail=False, methods=['get'])
+        # Related rows and unique values for every item, one query per field
+        context = {**self.get_serializer_context(), **prefetch_batch(self.get_serializer(), items)}
+
+        previous_companies = {e.company_id for e in instances.values()}
+        results, updated, moved, fields = [], [], [], set()
+        seen_ids, seen_emails = set(), set()
+        for index, (employee_id, item) in enumerate(zip(ids, items)):
+            instance = instances.get(employee_id)
+            if instance is None:
+                results.append({'index': index, 'id': employee_id, 'status': 'not_found'})
+                continue
+            serializer = self.get_serializer(instance, data=item, partial=True, context=context)
+            if not serializer.is_valid():
+                results.append({'index': index, 'id': employee_id, 'status': 'error', 'errors': serializer.errors})
+                continue
+            # As in _batch_create, catch collisions inside the batch rather
+            # than failing the whole update on the unique constraint
+            new_id = serializer.validated_data.get('employee_id')
+            new_email = serializer.validated_data.get('email', '').lower()
+            if (new_id and new_id in seen_ids) or (new_email and new_email in seen_emails):
+                results.append({'index': index, 'id': employee_id, 'status': 'error', 'errors': {
+                    'non_field_errors': ['Duplicate employee_id or email within the batch']
+                }})
+                continue
+            seen_ids.add(new_id)
+            seen_emails.add(new_email)
+            before = (instance.company_id, instance.department_id, instance.position)
+            for attr, value in serializer.validated_data.items():
+                if attr == 'history':
+                    continue
+                setattr(instance, attr, value)
+                fields.add(attr)
+            if (instance.company_id, instance.department_id, instance.position) != before:
+                moved.append(instance)
+            updated.append(instance)
+            results.append({'index': index, 'id': employee_id, 'status': 'updated'})
+
+        if updated:
+            now = timezone.now()
+            for instance in updated:
+                instance.updated_at = now
+            Employee.encrypt_batch(updated)
+            fields |= {'updated_at', '_encrypted_phone', '_encrypted_email', '_encrypted_salary', 'person_key', 'email_index'}
+            try:
+                with transaction.atomic():
+                    Employee.objects.bulk_update(updated, sorted(fields))
+                    audit_log.record(updated, 'update', fields)
+                    # bulk_update sends no post_save signals
+                    employee_search_cache.invalidate()
+                    if moved:
+                        # Close the open assignment and start a new one for
+                        # employees whose company, department or position changed.
+                        EmployeeHistory.close_current(moved, now.date())
+                        EmployeeHistory.bulk_create_encrypted([
+                            EmployeeHistory(
+                                employee=e, company_id=e.company_id, department_id=e.department_id,
+                                position=e.position, start_date=now.date(), end_date=None, duties=''
+                            ) for e in moved
+                        ])
+                    if 'company' in fields:
+                        Company.refresh_employee_counts(
+                            previous_companies | {e.company_id for e in updated}
+                        )
+            except IntegrityError as e:
+                return Response({'error': f'Batch rejected: {str(e)}'}, status=status.HTTP_409_CONFLICT)
+
+        return self._batch_response(results, 'updated', status.HTTP_200_OK)
+
+    def _batch_delete(self, request):
+        data = request.data if isinstance(request.data, dict) else {'ids': request.data}
+        serializer = EmployeeBatchDeleteSerializer(data=data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        ids = serializer.validated_data['ids']
+        limit = settings.EMPLOYEE_BATCH_MAX_SIZE
+        if len(ids) > limit:
+            return Response({'error': f'Batch of {len(ids)} exceeds the limit of {limit} employees'}, status=status.HTTP_400_BAD_REQUEST)
+
+        with transaction.atomic():
+            existing = dict(self.get_queryset().filter(id__in=ids).values_list('id', 'company_id'))
+            Employee.objects.filter(id__in=existing).delete()
+            Company.refresh_employee_counts(set(existing.values()))
+
+        results = [
+            {'index': index, 'id': employee_id, 'status': 'deleted' if employee_id in existing else 'not_found'}
+            for index, employee_id in enumerate(ids)
+        ]
+        return self._batch_response(results, 'deleted', status.HTTP_200_OK)
+
+    @action(detail=False, methods=['get'], throttle_classes=[SearchThrottle])
     def search(self, request):
         # Extract query parameters
         name = request.query_params.get('name', '').strip()
@@ -319,23 +633,30 @@ class EmployeeViewSet(viewsets.ModelViewSet):
         department = request.query_params.get('department', '').strip()
         year_started = request.query_params.get('year_started', '').strip()
         year_left = request.query_params.get('year_left', '').strip()
+        if not all(year.isdigit() for year in (year_started, year_left) if year):
+            return Response({'error': 'year_started and year_left must be years'}, status=status.HTTP_400_BAD_REQUEST)
 
         filters = Q()
         if name:
-            filters &= Q(first_name__icontains=name) | Q(last_name__icontains=name)
+            filters &= Q(name__icontains=name)
         if employer:
             filters &= Q(company__name__icontains=employer)
         if position:
             filters &= Q(position__icontains=position)
         if department:
-            filters &= Q(department__icontains=department)
+            filters &= Q(department__name__icontains=department)
         if year_started:
             filters &= Q(joining_date__year=year_started)
         if year_left:
-            # If you have a 'leaving_date' or equivalent field, use it. Otherwise, skip.
-            filters &= Q(leaving_date__year=year_left)
+            # The year an assignment of the employee ended, archived ones included
+            filters &= Q(history__end_date__year=year_left) | Q(
+                pk__in=EmployeeHistoryArchive.objects.filter(end_date__year=year_left).values('employee_id')
+            )
 
-        employees = Employee.objects.filter(filters)
+        # Repeated searches reuse the cached ids of the matches
+        employees = employee_search_cache.fetch(
+            search_key(request.query_params, request.user), Employee.objects.all(), filters
+        )
         return Response(self.get_serializer(employees, many=True).data)
 
     @action(detail=False, methods=['get'])
@@ -347,7 +668,7 @@ class EmployeeViewSet(viewsets.ModelViewSet):
         return Response(EmployeeSerializer(histories, many=True).data)
 
 
-class DepartmentViewSet(viewsets.ModelViewSet):
+class DepartmentViewSet(SparseQuerysetMixin, viewsets.ModelViewSet):
     queryset = Department.objects.all()
     serializer_class = DepartmentSerializer
 
@@ -365,3 +686,19 @@ class DepartmentViewSet(viewsets.ModelViewSet):
         departments = Department.search(query, company_id)
         serializer = self.get_serializer(departments, many=True)
         return Response(serializer.data)
+
+    @action(detail=False, methods=['get'])
+    def autocomplete(self, request):
+        """
+        Prefix suggestions over department and company names, served from
+        the in-process index. ``type`` limits results to one kind.
+        """
+        query = request.query_params.get('q', '')
+        kind = request.query_params.get('type')
+        types = (kind,) if kind in ('department', 'company') else ('department', 'company')
+        try:
+            company_id = int(request.query_params['company']) if request.query_params.get('company') else None
+            limit = min(int(request.query_params.get('limit', 10)), 50)
+        except ValueError:
+            return Response({'error': 'company and limit must be integers'}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(autocomplete_cache.search(query, company_id, types, limit))
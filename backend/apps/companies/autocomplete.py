@@ -0,0 +1,169 @@
+"""
+Prefix autocomplete over department and company names.
+
+Lookups are served from a per-process sorted array searched with binary
+search. The index is built lazily on first use, dropped by the Department and
+Company signals (see ``signals.py``) and rebuilt after a TTL so that writes
+made by other worker processes show up too. When the tables are too large to
+hold in memory the lookup falls back to a prefix query on the indexed
+``name_key`` column (``models.filter_name_prefix``). Both compare names
+normalized by ``models.name_key``, so they return the same matches.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+
+from django.conf import settings
+
+from .models import Company, Department, filter_name_prefix, name_key
+
+
+class PrefixIndex:
+    """
+    Immutable sorted array of normalized names. A prefix query is two binary
+    searches plus a slice, so lookups cost O(log n + k).
+    """
+
+    def __init__(self, entries):
+        # entries: iterable of dicts that carry at least a ``name`` key
+        pairs = sorted(((name_key(e['name']), e) for e in entries), key=lambda p: p[0])
+        self._keys = [key for key, _ in pairs]
+        self._entries = [entry for _, entry in pairs]
+
+    def __len__(self):
+        return len(self._keys)
+
+    def search(self, prefix, limit=10):
+        key = name_key(prefix)
+        start = bisect_left(self._keys, key)
+        end = bisect_left(self._keys, key + '\U0010ffff', lo=start)
+        return self._entries[start:min(end, start + limit)]
+
+
+class AutocompleteCache:
+    """
+    Lazily warmed, signal-invalidated holder for the department and company
+    prefix indexes of this process.
+    """
+
+    def __init__(self, ttl=300, max_entries=200000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._indexes = None
+        self._built_at = 0.0
+        self._generation = 0
+
+    def invalidate(self):
+        with self._lock:
+            self._generation += 1
+            self._indexes = None
+
+    def _build(self):
+        departments = list(
+            Department.objects.order_by()
+            .values('id', 'name', 'company_id', 'company__name')[:self.max_entries + 1]
+        )
+        companies = list(Company.objects.order_by().values('id', 'name')[:self.max_entries + 1])
+        if len(departments) > self.max_entries or len(companies) > self.max_entries:
+            # Too large to hold per process; callers use the database instead.
+            return False
+        return build_indexes(
+            ({'id': d['id'], 'name': d['name'], 'company_id': d['company_id'], 'company_name': d['company__name']}
+             for d in departments),
+            companies,
+        )
+
+    def get_indexes(self):
+        """Return the warm indexes, building them if needed, or False if disabled."""
+        indexes = self._indexes
+        if indexes is not None and time.monotonic() - self._built_at < self.ttl:
+            return indexes
+        with self._lock:
+            if self._indexes is not None and time.monotonic() - self._built_at < self.ttl:
+                return self._indexes
+            generation = self._generation
+        indexes = self._build()
+        with self._lock:
+            # Only keep the result if nothing was invalidated while building.
+            if generation == self._generation:
+                self._indexes = indexes
+                self._built_at = time.monotonic()
+        return indexes
+
+    def search(self, query, company_id=None, types=('department', 'company'), limit=10):
+        if not name_key(query):
+            return []
+        indexes = self.get_indexes()
+        if indexes is False:
+            return search_database(query, company_id, types, limit)
+
+        return search_indexes(indexes, query, company_id, types, limit)
+
+
+def build_indexes(departments, companies):
+    """
+    Prefix indexes over department rows (``id``, ``name``, ``company_id``,
+    ``company_name``) and company rows (``id``, ``name``): one over all
+    departments, one per company for company-scoped lookups, and one over
+    companies.
+    """
+    departments = [{'type': 'department', **d} for d in departments]
+    companies = [{'type': 'company', 'id': c['id'], 'name': c['name']} for c in companies]
+    by_company = {}
+    for entry in departments:
+        by_company.setdefault(entry['company_id'], []).append(entry)
+    return {
+        'department': PrefixIndex(departments),
+        'company_department': {company_id: PrefixIndex(entries) for company_id, entries in by_company.items()},
+        'company': PrefixIndex(companies),
+        'company_by_id': {entry['id']: entry for entry in companies},
+    }
+
+
+def search_indexes(indexes, query, company_id=None, types=('department', 'company'), limit=10):
+    """Prefix lookup in indexes from ``build_indexes``."""
+    results = []
+    if 'department' in types:
+        if company_id is None:
+            results.extend(indexes['department'].search(query, limit))
+        elif company_id in indexes['company_department']:
+            results.extend(indexes['company_department'][company_id].search(query, limit))
+    if 'company' in types:
+        if company_id is None:
+            results.extend(indexes['company'].search(query, limit))
+        else:
+            company = indexes['company_by_id'].get(company_id)
+            if company is not None and name_key(company['name']).startswith(name_key(query)):
+                results.append(company)
+    return results
+
+
+def search_database(query, company_id=None, types=('department', 'company'), limit=10):
+    """Indexed prefix query fallback returning the same shape as the cache."""
+    results = []
+    if 'department' in types:
+        departments = Department.search(query, company_id).order_by('name_key').values(
+            'id', 'name', 'company_id', 'company__name'
+        )[:limit]
+        results.extend(
+            {'type': 'department', 'id': d['id'], 'name': d['name'],
+             'company_id': d['company_id'], 'company_name': d['company__name']}
+            for d in departments
+        )
+    if 'company' in types:
+        companies = filter_name_prefix(Company.objects.all(), query)
+        if company_id is not None:
+            companies = companies.filter(id=company_id)
+        results.extend(
+            {'type': 'company', 'id': c['id'], 'name': c['name']}
+            for c in companies.order_by('name_key').values('id', 'name')[:limit]
+        )
+    return results
+
+
+autocomplete_cache = AutocompleteCache(
+    ttl=getattr(settings, 'AUTOCOMPLETE_CACHE_TTL', 300),
+    max_entries=getattr(settings, 'AUTOCOMPLETE_INDEX_MAX_ENTRIES', 200000),
+)
@@ -2,21 +2,26 @@
 Bulk upload processor for companies.
 """
 
-import pandas as pd
 import json
 import csv
 import io
 from datetime import datetime
 from ..models import Company
 from ..api.serializers import CompanySerializer
+from apps.core.utils import split_names
+from apps.core.dedup import ExistingKeys, find_duplicate_rows
+from apps.core.bulk_imports import import_chunks
+from apps.core.uploads import read_csv, read_excel
 
-def process_company_file(file, created_by_user):
+def process_company_file(file, created_by_user, chunk_size=None, savepoint_batch=None):
     """
     Process company data from CSV/Excel/text file.
     
     Args:
         file: Uploaded file object
         created_by_user: User who is uploading the file
+        chunk_size: Rows committed per transaction (BULK_UPLOAD_CHUNK_SIZE by default)
+        savepoint_batch: Rows per savepoint (BULK_UPLOAD_SAVEPOINT_BATCH by default)
         
     Returns:
         tuple: (list of created companies, list of errors)
@@ -26,17 +31,17 @@ def process_company_file(file, created_by_user):
     
     try:
         if file_name.endswith('.csv'):
-            df = pd.read_csv(file)
+            df = read_csv(file)
         elif file_name.endswith('.xlsx') or file_name.endswith('.xls'):
-            df = pd.read_excel(file)
+            df = read_excel(file)
         elif file_name.endswith('.txt'):
             # Try to read as tab-separated first
             try:
-                df = pd.read_csv(file, sep='\t')
+                df = read_csv(file, sep='\t')
             except:
                 # If that fails, try comma-separated
                 file.seek(0)  # Reset file pointer
-                df = pd.read_csv(file, sep=',')
+                df = read_csv(file, sep=',')
         else:
             raise ValueError("Unsupported file format. Please upload CSV, Excel, or text file.")
         
@@ -47,22 +52,19 @@ def process_company_file(file, created_by_user):
         if missing_columns:
             raise ValueError(f"Missing required columns: {', '.join(missing_columns)}")
         
-        companies = []
-        errors = []
+        # Flag repeated or already registered numbers before any insert
+        duplicates = find_duplicate_rows(
+            {'registration_number': df['registration_number'].tolist()},
+            {'registration_number': ExistingKeys(Company.objects.all(), 'registration_number')},
+        )
         
-        for index, row in df.iterrows():
+        def import_row(index, row, output):
+            if index in duplicates:
+                output['errors'].append({'row': index + 1, 'errors': duplicates[index]})
+                return
             try:
                 # Parse department list
-                department = row.get('department', '[]')
-                if isinstance(department, str):
-                    try:
-                        department = json.loads(department)
-                    except json.JSONDecodeError:
-                        # Try to parse as comma-separated list
-                        if ',' in department:
-                            department = [dept.strip() for dept in department.split(',')]
-                        else:
-                            department = []
+                department = split_names(row.get('department'))
                 
                 # Parse registration date
                 registration_date = row['registration_date']
@@ -87,25 +89,28 @@ def process_company_file(file, created_by_user):
                     'employee_count': int(row['employee_count']),
                     'phone': str(row['phone']),
                     'email': row['email'],
-                    'created_by': created_by_user.id
                 }
                 
                 serializer = CompanySerializer(data=company_data)
                 if serializer.is_valid():
-                    serializer.save()
-                    companies.append(serializer.data)
+                    serializer.save(created_by_id=created_by_user.id)
+                    output['companies'].append(serializer.data)
                 else:
-                    errors.append({
+                    output['errors'].append({
                         'row': index + 1,
                         'errors': serializer.errors
                     })
             except Exception as e:
-                errors.append({
+                output['errors'].append({
                     'row': index + 1,
                     'errors': str(e)
                 })
         
-        return companies, errors
+        output = import_chunks(
+            None, df, import_row, ('companies', 'errors'),
+            chunk_size=chunk_size, savepoint_batch=savepoint_batch,
+        )
+        return output['companies'], output['errors']
     
     except Exception as e:
         # Handle any errors during file processing
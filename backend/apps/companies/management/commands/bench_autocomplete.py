@@ -0,0 +1,73 @@
+import random
+import string
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.companies.autocomplete import autocomplete_cache, build_indexes, search_indexes
+
+
+class Command(BaseCommand):
+    help = 'Benchmarks department/company autocomplete lookups against the prefix index'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--entries', type=int, default=50000,
+                            help='Number of synthetic department names to index')
+        parser.add_argument('--companies', type=int, default=500,
+                            help='Number of synthetic companies the departments belong to')
+        parser.add_argument('--queries', type=int, default=20000,
+                            help='Number of lookups to time, half of them scoped to one company')
+        parser.add_argument('--budget-ms', type=float, default=1.0,
+                            help='Fail if the p99 lookup latency exceeds this many milliseconds')
+        parser.add_argument('--from-db', action='store_true',
+                            help='Benchmark the cache warmed from the configured database instead')
+
+    def handle(self, *args, **options):
+        rng = random.Random(42)
+
+        if options['from_db']:
+            started = time.perf_counter()
+            indexes = autocomplete_cache.get_indexes()
+            if indexes is False:
+                raise CommandError('Tables exceed AUTOCOMPLETE_INDEX_MAX_ENTRIES; lookups use the database')
+            self.stdout.write(f'Warmed from database in {(time.perf_counter() - started) * 1000:.1f} ms')
+            entries = indexes['department']._entries
+            names = [entry['name'] for entry in entries] or ['a']
+            company_ids = [entry['company_id'] for entry in entries] or [None]
+        else:
+            words = [''.join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 10))) for _ in range(2000)]
+            names = [' '.join(rng.choices(words, k=rng.randint(1, 3))).title() for _ in range(options['entries'])]
+            company_ids = [i % options['companies'] for i in range(len(names))]
+            started = time.perf_counter()
+            indexes = build_indexes(
+                ({'id': i, 'name': name, 'company_id': company_id, 'company_name': f'Company {company_id}'}
+                 for i, (name, company_id) in enumerate(zip(names, company_ids))),
+                ({'id': company_id, 'name': f'Company {company_id}'} for company_id in set(company_ids)),
+            )
+            self.stdout.write(f'Built index of {len(names)} names in {(time.perf_counter() - started) * 1000:.1f} ms')
+
+        lookups = []
+        for n in range(options['queries']):
+            position = rng.randrange(len(names))
+            # Alternate unscoped and company-scoped lookups
+            scope = company_ids[position] if n % 2 else None
+            lookups.append((names[position][:rng.randint(1, 6)], scope))
+        timings = []
+        for prefix, company_id in lookups:
+            started = time.perf_counter_ns()
+            search_indexes(indexes, prefix, company_id, limit=10)
+            timings.append(time.perf_counter_ns() - started)
+
+        timings.sort()
+
+        def percentile(p):
+            return timings[min(len(timings) - 1, int(len(timings) * p))] / 1e6
+
+        p99 = percentile(0.99)
+        self.stdout.write(
+            f'{len(timings)} lookups: p50={percentile(0.50):.4f} ms '
+            f'p95={percentile(0.95):.4f} ms p99={p99:.4f} ms max={timings[-1] / 1e6:.4f} ms'
+        )
+        if p99 > options['budget_ms']:
+            raise CommandError(f'p99 latency {p99:.4f} ms exceeds budget of {options["budget_ms"]} ms')
+        self.stdout.write(self.style.SUCCESS('Autocomplete latency within budget'))
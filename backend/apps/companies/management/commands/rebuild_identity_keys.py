@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+
+from apps.companies.models import Employee
+
+
+class Command(BaseCommand):
+    help = (
+        'Recomputes the employee person keys and email blind indexes from the decrypted values, '
+        'e.g. after IDENTITY_HASH_KEY changed'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=2000,
+                            help='Employees read and updated per query')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        employees = Employee.objects.order_by().only(
+            'id', 'name', 'date_of_birth', 'email', '_encrypted_email', 'person_key', 'email_index'
+        )
+        checked, updated, changed = 0, 0, []
+        for employee in employees.iterator(chunk_size=batch_size):
+            checked += 1
+            before = (employee.person_key, employee.email_index)
+            # The encrypted copy is authoritative for the email
+            employee.email = employee.decrypted_email or employee.email
+            employee.assign_identity()
+            if (employee.person_key, employee.email_index) != before:
+                changed.append(employee)
+            if len(changed) >= batch_size:
+                Employee.objects.bulk_update(changed, ['person_key', 'email_index'])
+                changed = []
+                updated += batch_size
+        Employee.objects.bulk_update(changed, ['person_key', 'email_index'])
+        self.stdout.write(f'Checked {checked} employees, updated {updated + len(changed)}')
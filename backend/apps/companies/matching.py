@@ -0,0 +1,216 @@
+"""
+Fuzzy company name matching for upload reconciliation.
+
+Names are normalized (case, punctuation and legal suffixes such as "Ltd" or
+"(Pvt)" removed) and placed in blocks keyed by the first characters of each
+token. An incoming name is only scored against companies sharing at least one
+block with it, using a character-trigram Dice coefficient blended with token
+overlap, so a lookup touches a handful of candidates instead of the table.
+
+The blocks are held in memory per process. Each company's blocking keys are
+also stored in ``CompanyNameKey``, from which the candidates are read when
+the table is too large for that.
+"""
+
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db.models import Count
+
+from .models import Company, CompanyNameKey
+
+LEGAL_SUFFIXES = {
+    'co', 'company', 'corp', 'corporation', 'inc', 'incorporated', 'limited',
+    'llc', 'ltd', 'plc', 'pty', 'pvt', 'private', 'group', 'holdings', 't/a',
+}
+
+BLOCK_KEY_LENGTH = 4
+
+CHUNK_SIZE = 900
+
+
+def normalize_company_name(name):
+    """Return the list of significant, normalized tokens of a company name."""
+    tokens = re.sub(r'[^\w\s]', ' ', str(name).casefold()).split()
+    significant = [token for token in tokens if token not in LEGAL_SUFFIXES]
+    return significant or tokens
+
+
+def blocking_keys(tokens):
+    return {token[:BLOCK_KEY_LENGTH] for token in tokens}
+
+
+def _chunks(values, size=CHUNK_SIZE):
+    values = list(values)
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def store_name_keys(company):
+    """Bring the ``CompanyNameKey`` rows of ``company`` in line with its name."""
+    keys = blocking_keys(normalize_company_name(company.name))
+    stored = set(CompanyNameKey.objects.filter(company=company).values_list('key', flat=True))
+    if stored - keys:
+        CompanyNameKey.objects.filter(company=company, key__in=stored - keys).delete()
+    if keys - stored:
+        CompanyNameKey.objects.bulk_create(
+            [CompanyNameKey(company=company, key=key) for key in keys - stored], ignore_conflicts=True
+        )
+
+
+def trigrams(tokens):
+    text = f"  {' '.join(tokens)} "
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def similarity(keys_a, grams_a, keys_b, grams_b):
+    """
+    Blend trigram Dice (spelling) with the overlap of token prefixes (missing
+    words, tolerant of typos past the prefix), in [0, 1].
+    """
+    if not grams_a or not grams_b:
+        return 0.0
+    dice = 2 * len(grams_a & grams_b) / (len(grams_a) + len(grams_b))
+    overlap = len(keys_a & keys_b) / min(len(keys_a), len(keys_b))
+    return (dice + overlap) / 2
+
+
+class CompanyMatchIndex:
+    """Blocking index over a fixed set of companies."""
+
+    def __init__(self, companies, max_block_size=1000, max_candidates=50):
+        self.max_block_size = max_block_size
+        self.max_candidates = max_candidates
+        self._entries = []
+        self._blocks = defaultdict(list)
+        for company in companies:
+            tokens = normalize_company_name(company['name'])
+            keys = blocking_keys(tokens)
+            position = len(self._entries)
+            self._entries.append((company, keys, trigrams(tokens)))
+            for key in keys:
+                self._blocks[key].append(position)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def candidates(self, keys):
+        """Positions sharing a block with ``keys``, most shared blocks first."""
+        blocks = [self._blocks.get(key, ()) for key in keys]
+        # Very common tokens ("zimbabwe") make huge blocks; use them only as a last resort
+        selective = [block for block in blocks if len(block) <= self.max_block_size]
+        counts = Counter()
+        for block in selective or blocks:
+            counts.update(block)
+        return [position for position, _ in counts.most_common(self.max_candidates)]
+
+    def match(self, name, limit=5, threshold=0.0):
+        tokens = normalize_company_name(name)
+        if not tokens:
+            return []
+        keys, grams = blocking_keys(tokens), trigrams(tokens)
+        scored = []
+        for position in self.candidates(keys):
+            company, other_keys, other_grams = self._entries[position]
+            score = similarity(keys, grams, other_keys, other_grams)
+            if score >= threshold:
+                scored.append({**company, 'score': round(score, 3)})
+        scored.sort(key=lambda match: (-match['score'], match['name']))
+        return scored[:limit]
+
+
+class CompanyMatcher:
+    """
+    Lazily built, signal-invalidated company match index for this process.
+    Above ``max_entries`` companies, candidates are read from the database
+    per lookup instead.
+    """
+
+    fields = ('id', 'name', 'registration_number')
+
+    def __init__(self, ttl=300, max_entries=200000, max_block_size=1000, max_candidates=50):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_block_size = max_block_size
+        self.max_candidates = max_candidates
+        self._lock = threading.Lock()
+        self._index = None
+        self._built_at = 0.0
+        self._generation = 0
+
+    def invalidate(self):
+        with self._lock:
+            self._generation += 1
+            self._index = None
+
+    def _build_index(self, companies):
+        return CompanyMatchIndex(companies, self.max_block_size, self.max_candidates)
+
+    def _build(self):
+        companies = list(Company.objects.order_by().values(*self.fields)[:self.max_entries + 1])
+        if len(companies) > self.max_entries:
+            return False
+        return self._build_index(companies)
+
+    def get_index(self):
+        """Return the warm index, building it if needed, or False if too large."""
+        index = self._index
+        if index is not None and time.monotonic() - self._built_at < self.ttl:
+            return index
+        with self._lock:
+            if self._index is not None and time.monotonic() - self._built_at < self.ttl:
+                return self._index
+            generation = self._generation
+        index = self._build()
+        with self._lock:
+            if generation == self._generation:
+                self._index = index
+                self._built_at = time.monotonic()
+        return index
+
+    def _database_index(self, names):
+        """
+        Index only the companies sharing a blocking key with ``names``, read
+        from ``CompanyNameKey`` a chunk of keys at a time. As in memory, keys
+        of more than ``max_block_size`` companies are only used for a name
+        that has no other.
+        """
+        keys_by_name = [blocking_keys(normalize_company_name(name)) for name in names]
+        sizes = {}
+        for chunk in _chunks(set().union(*keys_by_name)):
+            sizes.update(
+                CompanyNameKey.objects.filter(key__in=chunk).order_by()
+                .values('key').annotate(total=Count('id')).values_list('key', 'total')
+            )
+        keys = set()
+        for name_keys in keys_by_name:
+            found = [key for key in name_keys if key in sizes]
+            keys.update([key for key in found if sizes[key] <= self.max_block_size] or found)
+
+        company_ids = set()
+        for chunk in _chunks(keys):
+            company_ids.update(CompanyNameKey.objects.filter(key__in=chunk).values_list('company_id', flat=True))
+        companies = []
+        for chunk in _chunks(company_ids):
+            companies.extend(Company.objects.order_by().filter(id__in=chunk).values(*self.fields))
+        return self._build_index(companies)
+
+    def match_many(self, names, limit=5, threshold=0.0):
+        """Return a list of matches for each name, reading the index once."""
+        index = self.get_index()
+        if index is False:
+            index = self._database_index(names)
+        return [index.match(name, limit, threshold) for name in names]
+
+    def match(self, name, limit=5, threshold=0.0):
+        return self.match_many([name], limit, threshold)[0]
+
+
+company_matcher = CompanyMatcher(
+    ttl=getattr(settings, 'COMPANY_MATCH_CACHE_TTL', 300),
+    max_entries=getattr(settings, 'COMPANY_MATCH_INDEX_MAX_ENTRIES', 200000),
+    max_block_size=getattr(settings, 'COMPANY_MATCH_MAX_BLOCK_SIZE', 1000),
+)
@@ -0,0 +1,23 @@
+# Generated by Django 5.0.2 on 2026-10-19 06:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0004_employee_position'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='company',
+            name='name',
+            field=models.CharField(db_index=True, max_length=255),
+        ),
+        migrations.AlterField(
+            model_name='department',
+            name='name',
+            field=models.CharField(db_index=True, max_length=100),
+        ),
+    ]
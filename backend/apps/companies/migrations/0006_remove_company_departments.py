@@ -0,0 +1,67 @@
+# Generated by Django 5.0.2 on 2026-10-19 06:31
+
+import json
+import re
+
+from django.db import migrations
+
+
+def split_department_blob(blob):
+    """Parse a stored departments blob (JSON array or delimited string)."""
+    blob = (blob or '').strip()
+    if not blob:
+        return []
+    try:
+        names = json.loads(blob)
+    except (json.JSONDecodeError, TypeError):
+        names = re.split(r'(?:\\n|\n|,|;)+', blob)
+    if not isinstance(names, list):
+        names = [names]
+    return [str(name).strip() for name in names if str(name).strip()]
+
+
+def move_departments_to_rows(apps, schema_editor):
+    Company = apps.get_model('companies', 'Company')
+    Department = apps.get_model('companies', 'Department')
+
+    wanted = set()
+    for company_id, blob in Company.objects.exclude(departments__in=['', '[]']).values_list('id', 'departments').iterator():
+        for name in split_department_blob(blob):
+            wanted.add((company_id, name[:100]))
+    if not wanted:
+        return
+
+    existing = set(Department.objects.values_list('company_id', 'name').iterator())
+    Department.objects.bulk_create(
+        [Department(company_id=company_id, name=name) for company_id, name in sorted(wanted - existing)],
+        batch_size=500,
+        ignore_conflicts=True,
+    )
+
+
+def move_rows_to_departments(apps, schema_editor):
+    Company = apps.get_model('companies', 'Company')
+    Department = apps.get_model('companies', 'Department')
+
+    names = {}
+    for company_id, name in Department.objects.order_by('name').values_list('company_id', 'name').iterator():
+        names.setdefault(company_id, []).append(name)
+    companies = list(Company.objects.filter(id__in=names).only('id'))
+    for company in companies:
+        company.departments = json.dumps(names[company.id])
+    Company.objects.bulk_update(companies, ['departments'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0005_alter_company_name_alter_department_name'),
+    ]
+
+    operations = [
+        migrations.RunPython(move_departments_to_rows, move_rows_to_departments),
+        migrations.RemoveField(
+            model_name='company',
+            name='departments',
+        ),
+    ]
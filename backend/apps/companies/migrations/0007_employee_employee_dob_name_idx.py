@@ -0,0 +1,17 @@
+# Generated by Django 5.0.2 on 2026-10-19 06:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0006_remove_company_departments'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(fields=['date_of_birth', 'name'], name='employee_dob_name_idx'),
+        ),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 5.0.2 on 2026-10-19 06:39
+
+import unicodedata
+
+from django.conf import settings
+from django.db import migrations, models
+from django.utils.crypto import salted_hmac
+
+
+# Frozen copies of apps.core.identity.person_key and blind_index
+def normalize_person_name(name):
+    name = unicodedata.normalize('NFKD', str(name))
+    name = ''.join(char for char in name if not unicodedata.combining(char))
+    return ' '.join(name.split()).casefold()
+
+
+def person_key(name, date_of_birth):
+    if not name or not date_of_birth:
+        return ''
+    value = f'{normalize_person_name(name)}|{date_of_birth}'
+    return salted_hmac(
+        'talentverify.person_key', value, secret=settings.IDENTITY_HASH_KEY, algorithm='sha256'
+    ).hexdigest()
+
+
+def blind_index(email):
+    if not email:
+        return ''
+    return salted_hmac(
+        'talentverify.email_index', email.strip().casefold(), secret=settings.IDENTITY_HASH_KEY, algorithm='sha256'
+    ).hexdigest()
+
+
+def assign_identity_keys(apps, schema_editor):
+    Employee = apps.get_model('companies', 'Employee')
+
+    batch = []
+    for employee in Employee.objects.only('id', 'name', 'date_of_birth', 'email').iterator(chunk_size=2000):
+        employee.person_key = person_key(employee.name, employee.date_of_birth)
+        employee.email_index = blind_index(employee.email)
+        batch.append(employee)
+        if len(batch) >= 2000:
+            Employee.objects.bulk_update(batch, ['person_key', 'email_index'])
+            batch = []
+    if batch:
+        Employee.objects.bulk_update(batch, ['person_key', 'email_index'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0007_employee_employee_dob_name_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='employee',
+            name='email_index',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='employee',
+            name='person_key',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=64),
+        ),
+        migrations.RunPython(assign_identity_keys, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.0.2 on 2026-10-19 07:14
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0008_employee_email_index_employee_person_key'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='company',
+            index=models.Index(fields=['updated_at', 'id'], name='company_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(fields=['updated_at', 'id'], name='employee_updated_idx'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.0.2 on 2026-10-19 07:26
+
+import django.db.models.functions.text
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0009_company_company_updated_idx_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='company',
+            name='name',
+            field=models.CharField(max_length=255),
+        ),
+        migrations.AlterField(
+            model_name='department',
+            name='name',
+            field=models.CharField(max_length=100),
+        ),
+        migrations.AddIndex(
+            model_name='company',
+            index=models.Index(django.db.models.functions.text.Lower('name'), name='company_name_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='department',
+            index=models.Index(django.db.models.functions.text.Lower('name'), name='department_name_lower_idx'),
+        ),
+    ]
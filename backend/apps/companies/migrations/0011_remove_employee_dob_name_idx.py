@@ -0,0 +1,17 @@
+# Generated by Django 5.0.2 on 2026-10-19 07:28
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0010_name_lower_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='employee',
+            name='employee_dob_name_idx',
+        ),
+    ]
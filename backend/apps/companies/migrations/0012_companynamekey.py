@@ -0,0 +1,67 @@
+# Generated by Django 5.0.2 on 2026-10-19 07:29
+
+import re
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Frozen copies of apps.companies.matching.normalize_company_name and
+# blocking_keys as they stood when the keys were first stored
+LEGAL_SUFFIXES = {
+    'co', 'company', 'corp', 'corporation', 'inc', 'incorporated', 'limited',
+    'llc', 'ltd', 'plc', 'pty', 'pvt', 'private', 'group', 'holdings', 't/a',
+}
+
+BLOCK_KEY_LENGTH = 4
+
+
+def normalize_company_name(name):
+    tokens = re.sub(r'[^\w\s]', ' ', str(name).casefold()).split()
+    significant = [token for token in tokens if token not in LEGAL_SUFFIXES]
+    return significant or tokens
+
+
+def blocking_keys(tokens):
+    return {token[:BLOCK_KEY_LENGTH] for token in tokens}
+
+
+def store_name_keys(apps, schema_editor):
+    Company = apps.get_model('companies', 'Company')
+    CompanyNameKey = apps.get_model('companies', 'CompanyNameKey')
+    batch = []
+    for company_id, name in Company.objects.order_by().values_list('id', 'name').iterator(chunk_size=2000):
+        batch.extend(
+            CompanyNameKey(company_id=company_id, key=key)
+            for key in blocking_keys(normalize_company_name(name))
+        )
+        if len(batch) >= 2000:
+            CompanyNameKey.objects.bulk_create(batch, ignore_conflicts=True)
+            batch = []
+    CompanyNameKey.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0011_remove_employee_dob_name_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CompanyNameKey',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=4)),
+                ('company', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='name_keys', to='companies.company')),
+            ],
+            options={
+                'verbose_name': 'Company Name Key',
+                'verbose_name_plural': 'Company Name Keys',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='companynamekey',
+            constraint=models.UniqueConstraint(fields=('key', 'company'), name='unique_company_name_key'),
+        ),
+        migrations.RunPython(store_name_keys, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.0.2 on 2026-10-19 07:49
+
+from django.db import migrations, models
+
+
+def name_key(value):
+    # Frozen copy of apps.companies.models.name_key
+    return ' '.join(str(value or '').split()).casefold()
+
+
+def store_name_keys(apps, schema_editor):
+    for model_name in ('Company', 'Department'):
+        model = apps.get_model('companies', model_name)
+        batch = []
+        for row in model.objects.order_by().only('id', 'name').iterator(chunk_size=2000):
+            row.name_key = name_key(row.name)
+            batch.append(row)
+            if len(batch) >= 2000:
+                model.objects.bulk_update(batch, ['name_key'])
+                batch = []
+        model.objects.bulk_update(batch, ['name_key'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0012_companynamekey'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='department',
+            name='department_name_lower_idx',
+        ),
+        migrations.AddField(
+            model_name='company',
+            name='name_key',
+            field=models.TextField(db_index=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='department',
+            name='name_key',
+            field=models.TextField(db_index=True, default='', editable=False),
+        ),
+        migrations.RunPython(store_name_keys, migrations.RunPython.noop),
+    ]
@@ -4,20 +4,47 @@ Models for the companies app.
 from django.db import models
 from django.conf import settings
 from django.core.validators import MinValueValidator
+from django.db.models.functions import Coalesce, Lower
+from django.utils import timezone
 from cryptography.fernet import Fernet
+from apps.core.utils import split_names
+from apps.core.identity import blind_index, person_key
+from apps.audit.log import audit_log
 import json
 from datetime import date
 
 
+def name_key(value):
+    """
+    A company or department name, or a query for one, as prefix lookups
+    compare it: whitespace collapsed and case-folded, so 'Straße' matches
+    'STRASSE'. Stored in ``name_key``, which the in-process autocomplete
+    index and the database lookups both compare.
+    """
+    return ' '.join(str(value or '').split()).casefold()
+
+
+def filter_name_prefix(queryset, query):
+    """
+    Rows of ``queryset`` whose ``name_key`` starts with that of ``query``.
+
+    The range is served by the index on ``name_key``; the ``startswith``
+    keeps the result exact whatever the database collation.
+    """
+    key = name_key(query)
+    return queryset.filter(name_key__gte=key, name_key__lt=key + '\U0010ffff', name_key__startswith=key)
+
+
 class Company(models.Model):
     name = models.CharField(max_length=255)
+    # name_key(name), for prefix lookups
+    name_key = models.TextField(editable=False, db_index=True, default='')
     registration_date = models.DateField()
     registration_number = models.CharField(max_length=100, unique=True)  # Restored plaintext field
     address = models.TextField()
     contact_person = models.CharField(max_length=255)  # Restored plaintext
     phone = models.CharField(max_length=20)  # Restored plaintext
     email = models.EmailField()  # Restored plaintext
-    departments = models.TextField(blank=True, default="[]")
     employee_count = models.IntegerField(default=0, validators=[MinValueValidator(0)])
     created_by = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -31,17 +58,73 @@ class Company(models.Model):
         verbose_name = 'Company'
         verbose_name_plural = 'Companies'
         ordering = ['-created_at']
+        indexes = [
+            # Change feed reads (apps.sync)
+            models.Index(fields=['updated_at', 'id'], name='company_updated_idx'),
+            # Case-insensitive name lookups (verification)
+            models.Index(Lower('name'), name='company_name_lower_idx'),
+        ]
 
     def __str__(self):
         return self.name
-    
-    def save(self, *args, **kwargs):
-        is_new = self.pk is None
-        super().save(*args, **kwargs)  # Save first so it gets a PK
 
-        if not is_new:
+    def add_departments(self, names):
+        """
+        Create the named departments this company does not have yet.
+        Department rows are the only record of a company's departments.
+        """
+        names = split_names(names)
+        if not names:
+            return
+        existing = set(self.department.filter(name__in=names).values_list('name', flat=True))
+        missing = [
+            Department(company=self, name=name, name_key=name_key(name)) for name in names if name not in existing
+        ]
+        if missing:
+            Department.objects.bulk_create(missing, ignore_conflicts=True)
+            # bulk_create sends no signals
+            from .autocomplete import autocomplete_cache
+            autocomplete_cache.invalidate()
+
+    @classmethod
+    def refresh_employee_counts(cls, company_ids):
+        """
+        Recompute ``employee_count`` for the given companies: one query reads
+        the current counts, one UPDATE writes those that differ. Bulk write
+        paths bypass ``save()``, which normally keeps it in sync.
+        """
+        counts = Coalesce(models.Subquery(
+            Employee.objects.filter(company=models.OuterRef('pk'))
+            .order_by()
+            .values('company')
+            .annotate(total=models.Count('id'))
+            .values('total')
+        ), 0)
+        changed = [
+            company for company in
+            cls.objects.filter(id__in=company_ids).annotate(total=counts).only('id', 'employee_count')
+            if company.employee_count != company.total
+        ]
+        if not changed:
+            return
+        cls.objects.filter(id__in=[company.id for company in changed]).update(
+            employee_count=counts,
+            # update() skips auto_now; the change feed reads updated_at
+            updated_at=timezone.now(),
+        )
+        # update() sends no post_save; audit the counts that changed
+        for company in changed:
+            company.employee_count = company.total
+        audit_log.record(changed, 'update', ['employee_count'])
+
+    def save(self, *args, **kwargs):
+        self.name_key = name_key(self.name)
+        if self.pk is not None:
+            # Count in the same write, so an update is one save (and one audit event)
             self.employee_count = self.company_employees.count()
-            super().save(update_fields=['employee_count'])  # Update only that field
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = {*kwargs['update_fields'], 'employee_count', 'name_key'}
+        super().save(*args, **kwargs)
 
     # @phone.setter
     # def phone(self, value):
@@ -86,12 +169,34 @@ class Company(models.Model):
     #     return self.email  # For backward compatibility
 
 
+class CompanyNameKey(models.Model):
+    """
+    A blocking key of a company name (see ``matching.blocking_keys``), kept
+    so fuzzy matching can read the companies sharing a key from an index
+    when there are too many companies to hold in memory.
+    """
+    company = models.ForeignKey(Company, on_delete=models.CASCADE, related_name='name_keys')
+    key = models.CharField(max_length=4)  # matching.BLOCK_KEY_LENGTH
+
+    class Meta:
+        verbose_name = 'Company Name Key'
+        verbose_name_plural = 'Company Name Keys'
+        constraints = [
+            models.UniqueConstraint(fields=['key', 'company'], name='unique_company_name_key'),
+        ]
+
+    def __str__(self):
+        return f"{self.key} ({self.company_id})"
+
+
 class Department(models.Model):
     """
     Department model associated with a company.
     Name must be unique per company.
     """
     name = models.CharField(max_length=100)
+    # name_key(name), for prefix lookups
+    name_key = models.TextField(editable=False, db_index=True, default='')
     company = models.ForeignKey(Company, on_delete=models.CASCADE, related_name='department')
 
     class Meta:
@@ -103,6 +208,23 @@ class Department(models.Model):
     def __str__(self):
         return f"{self.name} ({self.company.name})"
 
+    def save(self, *args, **kwargs):
+        self.name_key = name_key(self.name)
+        if kwargs.get('update_fields') is not None:
+            kwargs['update_fields'] = {*kwargs['update_fields'], 'name_key'}
+        super().save(*args, **kwargs)
+
+    @classmethod
+    def search(cls, query, company_id=None):
+        """
+        Departments whose name starts with ``query``, optionally limited to
+        one company (see ``filter_name_prefix``).
+        """
+        queryset = filter_name_prefix(cls.objects.select_related('company'), query)
+        if company_id:
+            queryset = queryset.filter(company_id=company_id)
+        return queryset
+
 
 class Employee(models.Model):
     GENDER_CHOICES = [
@@ -129,10 +251,18 @@ class Employee(models.Model):
     _encrypted_email = models.BinaryField(null=True, blank=True)
     _encrypted_salary = models.BinaryField(null=True, blank=True)
 
+    # Links the rows of one person across employers (see apps.core.identity)
+    person_key = models.CharField(max_length=64, blank=True, editable=False, db_index=True)
+    email_index = models.CharField(max_length=64, blank=True, editable=False, db_index=True)
+
     class Meta:
         verbose_name = 'Employee'
         verbose_name_plural = 'Employees'
         ordering = ['-created_at']
+        indexes = [
+            # Change feed reads (apps.sync)
+            models.Index(fields=['updated_at', 'id'], name='employee_updated_idx'),
+        ]
 
     def __str__(self):
         return self.name
@@ -145,6 +275,7 @@ class Employee(models.Model):
             self._encrypt_email()
         if self.salary:
             self._encrypt_salary()
+        self.assign_identity()
 
         # Track history if department/position provided in kwargs
         department = kwargs.pop('department', None)
@@ -199,6 +330,29 @@ class Employee(models.Model):
     def _get_fernet(self):
         return Fernet(settings.ENCRYPTION_KEY.encode())
 
+    def assign_identity(self):
+        """Recompute the person identity key and email blind index."""
+        self.person_key = person_key(self.name, self.date_of_birth)
+        self.email_index = blind_index(self.email)
+
+    @classmethod
+    def encrypt_batch(cls, employees):
+        """
+        Encrypt the sensitive fields and assign the identity keys of many
+        employees with a single Fernet instance. Used by the bulk write
+        paths, which bypass ``save()``.
+        """
+        fernet = Fernet(settings.ENCRYPTION_KEY.encode())
+        for employee in employees:
+            employee.assign_identity()
+            if employee.phone:
+                employee._encrypted_phone = fernet.encrypt(employee.phone.encode())
+            if employee.email:
+                employee._encrypted_email = fernet.encrypt(employee.email.encode())
+            if employee.salary:
+                employee._encrypted_salary = fernet.encrypt(str(employee.salary).encode())
+        return employees
+
     def _encrypt_phone(self):
         if self.phone:
             self._encrypted_phone = self._get_fernet().encrypt(self.phone.encode())
@@ -0,0 +1,118 @@
+"""
+Result cache for employee search.
+
+Results are kept per process, keyed on the normalized search parameters plus
+the caller's role and company scope, in an LRU of at most
+``EMPLOYEE_SEARCH_CACHE_SIZE`` entries. An entry holds the matching employee
+ids, not the serialized payload, so a hit costs one primary key lookup and
+always returns current field values.
+
+Entries are tagged with a generation number kept in the shared
+``EMPLOYEE_SEARCH_GENERATION_CACHE`` cache. Employee and EmployeeHistory
+writes (and company/department renames, which change employer and department
+matches, and history archiving) bump it once their transaction commits, which
+retires the entries of every worker process at once.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+SEARCH_PARAMS = ('name', 'company', 'position', 'department', 'year_started', 'year_left')
+GENERATION_KEY = 'employee-search:generation'
+
+
+def normalize(value):
+    """Normalize a search term the way ``icontains`` compares it."""
+    return ' '.join(str(value).split()).casefold()
+
+
+def search_key(params, user):
+    """
+    Cache key for a search: the non-empty normalized parameters plus the
+    caller's role and company scope.
+    """
+    terms = ((name, normalize(params.get(name, ''))) for name in SEARCH_PARAMS)
+    terms = tuple((name, value) for name, value in terms if value)
+    scope = None if user.role == 'admin' else user.company_id
+    return terms, user.role, scope
+
+
+class SearchResultCache:
+    """LRU of search result ids, invalidated by a shared generation number."""
+
+    def __init__(self, maxsize=1000, max_ids=10000):
+        self.maxsize = maxsize
+        self.max_ids = max_ids
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _shared():
+        return caches[getattr(settings, 'EMPLOYEE_SEARCH_GENERATION_CACHE', 'default')]
+
+    def generation(self):
+        shared = self._shared()
+        generation = shared.get(GENERATION_KEY)
+        if generation is None:
+            # Start from a fresh number, so entries from before a cache clear
+            # can never match again
+            shared.add(GENERATION_KEY, time.time_ns(), timeout=None)
+            generation = shared.get(GENERATION_KEY)
+        return generation
+
+    def _bump(self):
+        shared = self._shared()
+        try:
+            shared.incr(GENERATION_KEY)
+        except ValueError:
+            shared.set(GENERATION_KEY, time.time_ns(), timeout=None)
+
+    def invalidate(self):
+        """Retire all entries once the current transaction commits."""
+        connection = transaction.get_connection()
+        # One bump per transaction, however many rows it writes
+        if any(func == self._bump for _, func, _ in connection.run_on_commit):
+            return
+        transaction.on_commit(self._bump)
+
+    def fetch(self, key, queryset, filters):
+        """
+        ``queryset.filter(filters)`` as a list, from the cached ids of ``key``
+        when they are current.
+        """
+        generation = self.generation()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == generation:
+                self._entries.move_to_end(key)
+                ids = entry[1]
+            else:
+                ids = None
+
+        if ids is not None:
+            position = {pk: index for index, pk in enumerate(ids)}
+            return sorted(queryset.filter(pk__in=ids), key=lambda obj: position[obj.pk])
+
+        results = list(queryset.filter(filters).distinct())
+        if len(results) <= self.max_ids:
+            with self._lock:
+                self._entries[key] = (generation, [obj.pk for obj in results])
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        return results
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+employee_search_cache = SearchResultCache(
+    maxsize=getattr(settings, 'EMPLOYEE_SEARCH_CACHE_SIZE', 1000),
+    max_ids=getattr(settings, 'EMPLOYEE_SEARCH_CACHE_MAX_IDS', 10000),
+)
@@ -0,0 +1,50 @@
+"""
+Signal handlers for the companies app.
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.employees.models import EmployeeHistory
+from apps.employees.signals import history_rows_changed
+
+from .autocomplete import autocomplete_cache
+from .matching import company_matcher, store_name_keys
+from .models import Company, Department, Employee
+from .search_cache import employee_search_cache
+
+
+@receiver(post_save, sender=Company)
+@receiver(post_delete, sender=Company)
+@receiver(post_save, sender=Department)
+@receiver(post_delete, sender=Department)
+def invalidate_autocomplete(sender, **kwargs):
+    """Drop this process's autocomplete index after a name change."""
+    autocomplete_cache.invalidate()
+
+
+@receiver(post_save, sender=Company)
+@receiver(post_delete, sender=Company)
+def invalidate_company_matcher(sender, **kwargs):
+    """Drop this process's fuzzy match index after a company change."""
+    company_matcher.invalidate()
+
+
+@receiver(post_save, sender=Company)
+def update_company_name_keys(sender, instance, raw=False, **kwargs):
+    if not raw:
+        store_name_keys(instance)
+
+
+@receiver(post_save, sender=Employee)
+@receiver(post_delete, sender=Employee)
+@receiver(post_save, sender=EmployeeHistory)
+@receiver(post_delete, sender=EmployeeHistory)
+@receiver(history_rows_changed)
+@receiver(post_save, sender=Company)
+@receiver(post_delete, sender=Company)
+@receiver(post_save, sender=Department)
+@receiver(post_delete, sender=Department)
+def invalidate_employee_search(sender, **kwargs):
+    """Retire cached employee search results after a change that can alter them."""
+    employee_search_cache.invalidate()
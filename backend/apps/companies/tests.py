@@ -0,0 +1,94 @@
+"""
+Tests for the companies app.
+"""
+
+from datetime import date
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from .autocomplete import AutocompleteCache, search_database
+from apps.core.identity import blind_index, person_key
+from .models import Company, Employee
+
+
+class AutocompleteTests(TestCase):
+    """The in-memory index and the database fallback return the same matches."""
+
+    @classmethod
+    def setUpTestData(cls):
+        admin = get_user_model().objects.create_user('admin', 'admin@example.com', 'pw12345!', role='admin')
+        for number, name in enumerate(['Straße  Werke', 'STRASSE Logistik', 'Élan Systems', 'Acme']):
+            company = Company.objects.create(
+                name=name, registration_date=date(2000, 1, 1), registration_number=f'R-{number}',
+                address='1 Main St', contact_person='Contact', phone='1', email='c@example.com', created_by=admin,
+            )
+            company.add_departments([f'{name} Research'])
+
+    def test_index_and_database_agree(self):
+        cache = AutocompleteCache()
+        for query in ['strasse', 'STRASSE w', 'straße   werke', 'élan', 'ÉLAN SYS', 'acme r', 'zzz']:
+            with self.subTest(query=query):
+                indexed = cache.search(query)
+                self.assertEqual(indexed, search_database(query))
+        self.assertEqual(
+            [entry['name'] for entry in cache.search('strasse', types=('company',))],
+            ['STRASSE Logistik', 'Straße  Werke'],
+        )
+
+
+class CompanyVisibilityTests(TestCase):
+    """Users outside the admin and company roles only see company names."""
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        admin = User.objects.create_user('admin', 'admin@example.com', 'pw12345!', role='admin')
+        cls.user = User.objects.create_user('employee', 'employee@example.com', 'pw12345!', role='employee')
+        for number in range(5):
+            company = Company.objects.create(
+                name=f'Company {number}', registration_date=date(2000, 1, 1), registration_number=f'R-{number}',
+                address='1 Main St', contact_person='Contact', phone='1', email='c@example.com', created_by=admin,
+            )
+            company.add_departments(['Research'])
+
+    def test_employee_lists_names_only(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        with self.assertNumQueries(1):
+            response = client.get('/api/companies/companies/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 5)
+        self.assertEqual({frozenset(row) for row in response.data}, {frozenset(['id', 'name'])})
+
+
+class RebuildIdentityKeysTests(TestCase):
+    """``rebuild_identity_keys`` rehashes the stored identity keys."""
+
+    def test_rekeys_after_key_change(self):
+        admin = get_user_model().objects.create_user('admin', 'admin@example.com', 'pw12345!', role='admin')
+        company = Company.objects.create(
+            name='Acme', registration_date=date(2000, 1, 1), registration_number='R-1',
+            address='1 Main St', contact_person='Contact', phone='1', email='c@example.com', created_by=admin,
+        )
+        employee = Employee.objects.create(
+            company=company, name='Jane  Doe', employee_id='E-1', email='Jane@Example.com', phone='123',
+            date_of_birth=date(1980, 5, 1), gender='F', joining_date=date(2010, 1, 1), salary='100.00',
+            position='Clerk',
+        )
+        old_key = employee.person_key
+
+        with override_settings(IDENTITY_HASH_KEY='rotated'):
+            out = StringIO()
+            call_command('rebuild_identity_keys', stdout=out)
+            employee.refresh_from_db()
+            self.assertNotEqual(employee.person_key, old_key)
+            self.assertEqual(employee.person_key, person_key('jane doe', date(1980, 5, 1)))
+            self.assertEqual(employee.email_index, blind_index('jane@example.com'))
+            self.assertIn('updated 1', out.getvalue())
+
+            call_command('rebuild_identity_keys', stdout=out)
+            self.assertIn('updated 0', out.getvalue())
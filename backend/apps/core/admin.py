@@ -0,0 +1,104 @@
+"""
+Shared admin building blocks for large tables.
+"""
+
+from django.conf import settings
+from django.contrib import admin
+from django.core.paginator import Paginator
+from django.db import connections, transaction
+from django.utils.functional import cached_property
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that avoids an exact ``COUNT(*)`` over a whole table.
+
+    Unfiltered changelists use the planner's row estimate on PostgreSQL and
+    the highest primary key elsewhere; filtered querysets, and tables small
+    enough for the estimate to matter, are still counted exactly. Deleted rows
+    make the estimate run long: a page past the last row switches to the exact
+    count and shows the real last page.
+    """
+
+    exact_below = 10000
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.estimated = False
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        estimate = None
+        if not queryset.query.where:
+            estimate = self._estimate(queryset)
+        if estimate is None or estimate < self.exact_below or not self._holds_more(queryset, self.exact_below):
+            return super().count
+        self.estimated = True
+        return estimate
+
+    @staticmethod
+    def _holds_more(queryset, rows):
+        # Reads at most ``rows + 1`` keys, unlike a count
+        return queryset.order_by().values_list('pk', flat=True)[rows:rows + 1].exists()
+
+    @staticmethod
+    def _estimate(queryset):
+        model = queryset.model
+        connection = connections[queryset.db]
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT reltuples FROM pg_class WHERE relname = %s', [model._meta.db_table])
+                row = cursor.fetchone()
+            # reltuples is -1 (or 0) until the table has been analyzed
+            return int(row[0]) if row and row[0] > 0 else None
+        if model._meta.pk.get_internal_type() in ('AutoField', 'BigAutoField'):
+            highest = model._default_manager.order_by('-pk').values_list('pk', flat=True).first()
+            return highest or 0
+        return None
+
+    def page(self, number):
+        page = super().page(number)
+        if self.estimated and page.number > 1 and not page.object_list:
+            self.estimated = False
+            self.count = self.object_list.count()
+            self.__dict__.pop('num_pages', None)
+            page = super().page(min(page.number, self.num_pages))
+        return page
+
+    def get_elided_page_range(self, number=1, **kwargs):
+        # The page asked for may lie past the last one once the count is exact
+        if isinstance(number, int):
+            number = min(number, self.num_pages)
+        return super().get_elided_page_range(number, **kwargs)
+
+
+def chunked_update(queryset, chunk_size=None, on_chunk=None, **values):
+    """
+    ``queryset.update(**values)`` in primary key chunks, one transaction per
+    chunk, so large selections never hold one long write lock.
+    ``on_chunk(pks)`` runs inside each chunk's transaction. Returns the number
+    of rows updated.
+    """
+    chunk_size = chunk_size or getattr(settings, 'ADMIN_ACTION_CHUNK_SIZE', 1000)
+    model = queryset.model
+    pks = list(queryset.order_by('pk').values_list('pk', flat=True))
+    updated = 0
+    for start in range(0, len(pks), chunk_size):
+        chunk = pks[start:start + chunk_size]
+        with transaction.atomic():
+            updated += model._default_manager.filter(pk__in=chunk).update(**values)
+            if on_chunk is not None:
+                on_chunk(chunk)
+    return updated
+
+
+class ScalableModelAdmin(admin.ModelAdmin):
+    """
+    Base admin for large tables: no full-table count on the changelist and an
+    estimated count for pagination. Subclasses set ``list_select_related`` and
+    ``autocomplete_fields`` for their foreign keys.
+    """
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
+    list_per_page = 50
@@ -0,0 +1,231 @@
+"""
+Idempotent, resumable bulk imports.
+
+An upload is identified by the SHA-256 of its content (per kind and scope)
+or by the client's ``Idempotency-Key`` header. Its rows are imported in
+chunks rather than one autocommitted row at a time: each chunk is one
+transaction, with rows grouped into savepoints so a failing row costs only
+its batch a retry. With an upload, a ``BulkUploadChunk`` recording the
+chunk's output is committed alongside, so a retry after a failure or a
+timeout skips the committed chunks and resumes at the first unprocessed row.
+Re-sending a file whose import completed returns the stored response without
+touching the rows again.
+
+Stored outputs keep row numbers, errors and the ids of the imported
+instances, never their serialized fields (names, contact details, salaries):
+the ``records`` of an import map each output field holding serialized
+instances to a loader (see ``record_loader``) that serializes them afresh
+when a chunk is resumed or a response replayed. Finished imports are removed
+after ``BULK_UPLOAD_RETENTION_DAYS`` by ``manage.py prune_bulk_uploads``.
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DatabaseError, IntegrityError, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+
+from .models import BulkUpload, BulkUploadChunk
+from .uploads import upload_digest
+
+
+def record_loader(queryset, serialize):
+    """
+    Loader for ``records``: ``serialize(instances)`` for the instances of
+    ``queryset`` with the given ids, in that order. Instances deleted or no
+    longer in ``queryset`` since the import are left out.
+    """
+    def load(ids):
+        found = queryset.in_bulk(ids)
+        return serialize([found[pk] for pk in ids if pk in found])
+    return load
+
+
+def _stored(output, records):
+    """``output`` with the serialized instances of ``records`` reduced to their ids."""
+    return {
+        field: [item['id'] for item in values] if field in records else values
+        for field, values in output.items()
+    }
+
+
+def _loaded(output, records):
+    """``output`` with the ids stored for ``records`` serialized again."""
+    return {
+        field: records[field](values) if field in records else values
+        for field, values in output.items()
+    }
+
+
+def _claim(upload):
+    """Take over a failed or abandoned import. False if another request holds it."""
+    stale = timezone.now() - timedelta(seconds=settings.BULK_UPLOAD_STALE_AFTER)
+    claimable = Q(status='failed') | Q(status='processing', updated_at__lt=stale)
+    try:
+        with transaction.atomic():
+            claimed = BulkUpload.objects.filter(claimable, pk=upload.pk).update(
+                status='processing', error='', updated_at=timezone.now()
+            )
+    except IntegrityError:
+        # The same content is being imported under another upload
+        return False
+    return claimed == 1
+
+
+def begin_upload(request, kind, file, scope='', allow_duplicate=False, records=None):
+    """
+    Find or start the ``BulkUpload`` for an upload request.
+
+    Returns ``(upload, response)``. ``response`` is set when the request is
+    answered without importing: the stored response of a completed import,
+    409 while another request is importing the same file, or 422 when the
+    idempotency key was used for different content. ``allow_duplicate``
+    starts a new import of a file that was imported before. ``records``
+    loads the instances of a replayed response.
+    """
+    digest = upload_digest(file)
+    key = request.headers.get('Idempotency-Key', '')[:255]
+    uploads = BulkUpload.objects.filter(kind=kind)
+    if key:
+        upload = uploads.filter(created_by_id=request.user.id, idempotency_key=key).first()
+        if upload is not None and (upload.sha256 != digest or upload.scope != scope):
+            return None, Response(
+                {'error': 'Idempotency-Key was already used for a different upload'},
+                status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            )
+    else:
+        upload = uploads.filter(scope=scope, sha256=digest).order_by('-id').first()
+        if upload is not None and upload.status == 'completed' and allow_duplicate:
+            upload = None
+
+    if upload is not None:
+        if upload.status == 'completed':
+            result = _loaded(upload.result, records or {})
+            response = Response({**result, 'upload': upload.progress()}, status=status.HTTP_200_OK)
+            response['Idempotent-Replayed'] = 'true'
+            return upload, response
+        if not _claim(upload):
+            return upload, Response({
+                'error': 'This file is already being imported',
+                'upload': upload.progress(),
+            }, status=status.HTTP_409_CONFLICT)
+        upload.refresh_from_db()
+        return upload, None
+
+    try:
+        with transaction.atomic():
+            upload = BulkUpload.objects.create(
+                kind=kind, scope=scope, sha256=digest, idempotency_key=key,
+                file_name=file.name[:255], created_by_id=request.user.id,
+                chunk_size=settings.BULK_UPLOAD_CHUNK_SIZE,
+            )
+    except IntegrityError:
+        return None, Response(
+            {'error': 'This file is already being imported'}, status=status.HTTP_409_CONFLICT
+        )
+    return upload, None
+
+
+class _RetryRows(Exception):
+    """A row left the savepoint batch's transaction needing a rollback."""
+
+
+def _import_batch(rows, import_row, output):
+    """
+    Import ``rows`` inside one savepoint. If any of them fails at the
+    database, the batch is rolled back and redone with one savepoint per row,
+    so only the failing rows are lost.
+    """
+    if len(rows) > 1:
+        staged = {field: [] for field in output}
+        try:
+            with transaction.atomic():
+                for index, row in rows:
+                    import_row(index, row, staged)
+                    # A database error caught inside import_row still poisons the batch
+                    if transaction.get_rollback():
+                        raise _RetryRows
+        except (_RetryRows, DatabaseError):
+            pass
+        else:
+            for field, values in staged.items():
+                output[field].extend(values)
+            return
+    for index, row in rows:
+        try:
+            with transaction.atomic():
+                import_row(index, row, output)
+        except DatabaseError as exc:
+            output['errors'].append({'row': index + 1, 'errors': str(exc)})
+
+
+def import_chunks(upload, frame, import_row, fields, chunk_size=None, savepoint_batch=None, records=None):
+    """
+    Import the rows of the DataFrame ``frame`` chunk by chunk.
+
+    ``import_row(index, row, output)`` appends its results to the lists in
+    ``output``, one per name in ``fields`` (which must include ``'errors'``).
+    Each chunk runs in one transaction, in savepoints of ``savepoint_batch``
+    rows (``BULK_UPLOAD_SAVEPOINT_BATCH`` by default); a batch hitting a
+    database error is redone row by row, so a failing row is rolled back and
+    reported alone. With an ``upload``, chunks it already recorded are
+    skipped, their instances loaded through ``records``. Returns the outputs
+    of all chunks merged in row order.
+    """
+    savepoint_batch = max(1, savepoint_batch or settings.BULK_UPLOAD_SAVEPOINT_BATCH)
+    records = records or {}
+    if upload is not None:
+        chunk_size = upload.chunk_size
+        done = {chunk.index: _loaded(chunk.output, records) for chunk in upload.chunks.all()}
+        upload.total_rows = len(frame)
+        BulkUpload.objects.filter(pk=upload.pk).update(total_rows=upload.total_rows)
+    else:
+        chunk_size = chunk_size or settings.BULK_UPLOAD_CHUNK_SIZE
+        done = {}
+
+    merged = {field: [] for field in fields}
+    for number, start in enumerate(range(0, len(frame), chunk_size)):
+        output = done.get(number)
+        if output is None:
+            output = {field: [] for field in fields}
+            rows = list(frame.iloc[start:start + chunk_size].iterrows())
+            with transaction.atomic():
+                if upload is not None:
+                    # Writing first takes SQLite's write lock before the rows'
+                    # lookups, so a concurrent writer is waited for (busy_timeout)
+                    # instead of failing the chunk when it upgrades to a write
+                    BulkUpload.objects.filter(pk=upload.pk).update(
+                        rows_done=F('rows_done') + len(rows), updated_at=timezone.now()
+                    )
+                for offset in range(0, len(rows), savepoint_batch):
+                    _import_batch(rows[offset:offset + savepoint_batch], import_row, output)
+                if upload is not None:
+                    BulkUploadChunk.objects.create(
+                        upload=upload, index=number, rows=len(rows), output=_stored(output, records)
+                    )
+                    upload.rows_done += len(rows)
+        for field in fields:
+            merged[field].extend(output.get(field, []))
+    return merged
+
+
+def complete_upload(upload, result, records=None):
+    """
+    Store the response of a finished import, its ``records`` reduced to ids,
+    and drop its chunk records.
+    """
+    with transaction.atomic():
+        upload.result = _stored(result, records or {})
+        upload.status = 'completed'
+        upload.save(update_fields=['result', 'status', 'updated_at'])
+        upload.chunks.all().delete()
+
+
+def fail_upload(upload, error):
+    """Mark an import as failed; a retry resumes after its committed chunks."""
+    upload.status = 'failed'
+    upload.error = str(error)
+    upload.save(update_fields=['status', 'error', 'updated_at'])
@@ -0,0 +1,55 @@
+"""
+SQLite connection tuning.
+
+``configure_sqlite`` runs on every new database connection and applies the
+active ``SQLITE_PROFILE`` from ``SQLITE_PROFILES``. The production profile
+turns on WAL, so readers no longer wait for a bulk upload that is writing. It
+also sets ``synchronous=NORMAL`` (fsync at checkpoints only), a larger page
+cache, memory-mapped reads and a busy timeout.
+
+Transactions keep Django's deferred ``BEGIN``. Bulk imports, where a
+transaction reads before it writes, take the write lock by writing first
+(see ``apps.core.bulk_imports.import_chunks``): a deferred transaction that
+only upgrades to a write later cannot wait for another writer and fails with
+"database is locked" at once, whatever the busy timeout.
+
+Together with ``CONN_MAX_AGE`` all of this runs once per persistent
+connection rather than once per request.
+"""
+
+import re
+
+from django.conf import settings
+
+_NAME = re.compile(r'^[a-z_]+$')
+_VALUE = re.compile(r'^-?\w+$')
+
+
+def sqlite_profile(profile=None):
+    """The PRAGMAs of ``profile`` (the configured one by default)."""
+    profile = profile or getattr(settings, 'SQLITE_PROFILE', 'default')
+    profiles = getattr(settings, 'SQLITE_PROFILES', {})
+    if profile not in profiles:
+        raise ValueError(f'Unknown SQLITE_PROFILE {profile!r}; expected one of {", ".join(profiles)}')
+    pragmas = dict(profiles[profile])
+    for name, value in pragmas.items():
+        # PRAGMA arguments cannot be bound as query parameters
+        if not _NAME.match(name) or not _VALUE.match(str(value)):
+            raise ValueError(f'Invalid SQLite PRAGMA {name} = {value!r}')
+    return pragmas
+
+
+def configure_sqlite(sender, connection, **kwargs):
+    """``connection_created`` receiver applying the SQLite profile."""
+    if connection.vendor != 'sqlite':
+        return
+    pragmas = sqlite_profile()
+    if not pragmas:
+        return
+    with connection.cursor() as cursor:
+        # busy_timeout first, so switching the journal mode can wait for a lock
+        if 'busy_timeout' in pragmas:
+            cursor.execute(f'PRAGMA busy_timeout = {pragmas["busy_timeout"]}')
+        for name, value in pragmas.items():
+            if name != 'busy_timeout':
+                cursor.execute(f'PRAGMA {name} = {value}')
@@ -0,0 +1,135 @@
+"""
+Duplicate detection for bulk uploads.
+
+Rows whose unique keys repeat inside the file or already exist in the
+database are reported as structured row errors before anything is written,
+instead of surfacing one IntegrityError per INSERT.
+"""
+
+import hashlib
+import math
+
+from django.conf import settings
+
+
+def normalize_key(value):
+    """Normalize a cell value for key comparison; returns None for blanks/NaN."""
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return None
+    if isinstance(value, float) and value.is_integer():
+        # pandas reads numeric id columns as floats when a cell is empty
+        value = int(value)
+    value = str(value).strip()
+    return value or None
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over string keys (double hashing on blake2b).
+    Membership tests may return false positives, never false negatives.
+    """
+
+    def __init__(self, capacity, error_rate=0.01):
+        capacity = max(1, capacity)
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        for i in range(self.hash_count):
+            yield (first + i * second) % self.size
+
+    def add(self, key):
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+
+class ExistingKeys:
+    """
+    Finds which candidate keys already exist in ``field`` of ``queryset``.
+
+    Small candidate sets are checked directly with chunked ``IN`` queries.
+    Large ones are checked against every existing key, loaded in one query
+    into a set or, when the table has more than ``max_set_size`` rows, into a
+    Bloom filter whose hits are then confirmed with ``IN`` queries.
+    """
+
+    chunk_size = 900
+
+    def __init__(self, queryset, field, max_set_size=None, direct_lookup_limit=None, error_rate=0.01):
+        self.queryset = queryset.order_by()
+        self.field = field
+        self.max_set_size = max_set_size or getattr(settings, 'BULK_UPLOAD_DEDUP_SET_MAX_KEYS', 1000000)
+        self.direct_lookup_limit = direct_lookup_limit or getattr(settings, 'BULK_UPLOAD_DEDUP_DIRECT_LOOKUP_LIMIT', 5000)
+        self.error_rate = error_rate
+
+    def _existing_values(self):
+        return self.queryset.values_list(self.field, flat=True).iterator(chunk_size=10000)
+
+    def _confirm(self, candidates):
+        candidates = sorted(candidates)
+        found = set()
+        for start in range(0, len(candidates), self.chunk_size):
+            chunk = candidates[start:start + self.chunk_size]
+            found.update(
+                normalize_key(value) for value in
+                self.queryset.filter(**{f'{self.field}__in': chunk}).values_list(self.field, flat=True)
+            )
+        return found
+
+    def find(self, candidates):
+        candidates = {key for key in candidates if key}
+        if len(candidates) <= self.direct_lookup_limit:
+            return self._confirm(candidates)
+
+        total = self.queryset.count()
+        if total <= self.max_set_size:
+            return candidates & {normalize_key(value) for value in self._existing_values()}
+
+        bloom = BloomFilter(total, self.error_rate)
+        for value in self._existing_values():
+            key = normalize_key(value)
+            if key:
+                bloom.add(key)
+        return self._confirm(key for key in candidates if key in bloom)
+
+
+def find_duplicate_rows(columns, existing=None):
+    """
+    Flag rows with a repeated or already existing unique key.
+
+    Args:
+        columns: Mapping of field name -> list of cell values, one per row
+        existing: Optional mapping of field name -> ``ExistingKeys``
+
+    Returns:
+        dict: row position -> {field: [error message]}
+    """
+    existing = existing or {}
+    row_errors = {}
+    for field, values in columns.items():
+        keys = [normalize_key(value) for value in values]
+        first_seen = {}
+        for position, key in enumerate(keys):
+            if key is None:
+                continue
+            if key in first_seen:
+                row_errors.setdefault(position, {}).setdefault(field, []).append(
+                    f"Duplicate {field} '{key}' (first used in row {first_seen[key] + 1})"
+                )
+            else:
+                first_seen[key] = position
+
+        if field in existing:
+            taken = existing[field].find(first_seen)
+            for key in taken:
+                row_errors.setdefault(first_seen[key], {}).setdefault(field, []).append(
+                    f"{field} '{key}' already exists"
+                )
+    return row_errors
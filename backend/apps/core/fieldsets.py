@@ -0,0 +1,188 @@
+"""
+Sparse fieldsets and expansion for API responses.
+
+``?fields=id,name`` limits a response to the named fields and
+``?expand=company`` replaces a related id with a nested representation. Both
+apply to the top-level serializer of safe (read) requests only; nested
+serializers are shaped by the ``fields``/``expand`` arguments they are built
+with.
+
+``SparseQuerysetMixin`` then narrows the view's queryset to what the selected
+fields read: ``.only()`` the columns they use, joins only for the relations
+they traverse, and no prefetches for relations nobody reads. A serializer
+describes fields the queryset cannot infer (``SerializerMethodField`` and the
+like) in ``Meta.field_sources``.
+"""
+
+import copy
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from django.utils.module_loading import import_string
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+FIELDS_PARAM = 'fields'
+EXPAND_PARAM = 'expand'
+
+
+def _names(value):
+    names = [name.strip() for name in value.split(',')] if value else []
+    return [name for name in names if name] or None
+
+
+class SparseFieldsMixin:
+    """
+    ``?fields=`` / ``?expand=`` for model serializers.
+
+    Meta options:
+
+    ``expandable_fields``
+        ``{name: (serializer class or dotted path, kwargs)}``; the nested
+        serializer (read only) used for ``name`` when it is expanded.
+        Expanded fields are included even if ``?fields=`` omits them.
+    ``field_sources``
+        ``{name: [lookup or Prefetch, ...]}``; the model lookups a field with
+        ``source='*'`` reads and the prefetches it relies on. Without an entry
+        such a field keeps the queryset as the view built it.
+    """
+
+    def __init__(self, *args, fields=None, expand=None, **kwargs):
+        self._sparse_fields = fields
+        self._sparse_expand = expand
+        super().__init__(*args, **kwargs)
+
+    def _sparse_request(self):
+        # Only the top-level serializer (or the child of a top-level list)
+        # follows the query string
+        parent = self.parent
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+        request = self.context.get('request')
+        if parent is not None or request is None or request.method not in SAFE_METHODS:
+            return None
+        return request
+
+    def get_fields(self):
+        fields = super().get_fields()
+        selected, expand = self._sparse_fields, self._sparse_expand
+        request = self._sparse_request()
+        if request is not None:
+            selected = _names(request.query_params.get(FIELDS_PARAM)) or selected
+            expand = _names(request.query_params.get(EXPAND_PARAM)) or expand
+
+        expandable = getattr(self.Meta, 'expandable_fields', {})
+        expanded = [name for name in expand or () if name in expandable]
+        for name in expanded:
+            serializer_class, kwargs = expandable[name]
+            if isinstance(serializer_class, str):
+                serializer_class = import_string(serializer_class)
+            fields[name] = serializer_class(**{'read_only': True, **kwargs})
+
+        if selected is not None:
+            keep = set(selected).union(expanded)
+            fields = {name: field for name, field in fields.items() if name in keep}
+        return fields
+
+    def trim_queryset(self, queryset):
+        """
+        ``queryset`` reduced to the columns, joins and prefetches the selected
+        fields read. Fields that read something unknown leave the view's own
+        ``only()``/``select_related()``/``prefetch_related()`` in place.
+        """
+        plan = _Plan()
+        plan.collect(self, queryset.model, '')
+        if plan.complete:
+            pk = queryset.model._meta.pk.name
+            queryset = queryset.only(pk, *plan.columns)
+            if queryset.query.select_related is not True:
+                queryset = queryset.select_related(None)
+            kept = [lookup for lookup in queryset._prefetch_related_lookups if _root(lookup) in plan.relations]
+            queryset = queryset.prefetch_related(None).prefetch_related(*kept)
+        if plan.joins:
+            queryset = queryset.select_related(*plan.joins)
+        return queryset.prefetch_related(*plan.prefetches)
+
+
+def _root(lookup):
+    path = lookup.prefetch_through if isinstance(lookup, Prefetch) else lookup
+    return path.split('__')[0]
+
+
+class _Plan:
+    """Columns, joins and prefetches the fields of a serializer read."""
+
+    def __init__(self):
+        self.columns = set()
+        self.joins = set()
+        self.relations = set()
+        self.prefetches = []
+        self.complete = True
+
+    def collect(self, serializer, model, prefix):
+        sources = getattr(getattr(serializer, 'Meta', None), 'field_sources', {})
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            if name in sources:
+                for source in sources[name]:
+                    if isinstance(source, Prefetch):
+                        self._prefetch(source, prefix)
+                    else:
+                        self.resolve(model, prefix, source.split('__'))
+                continue
+            if field.source == '*':
+                self.complete = False
+                continue
+            related = self.resolve(model, prefix, field.source_attrs)
+            if related is not None and isinstance(field, serializers.Serializer):
+                path = prefix + '__'.join(field.source_attrs)
+                self.joins.add(path)
+                self.collect(field, related, path + '__')
+
+    def resolve(self, model, prefix, attrs):
+        """
+        Record what reading ``attrs`` from ``model`` needs. Returns the related
+        model if the path ends on a forward relation.
+        """
+        for index, attr in enumerate(attrs):
+            try:
+                field = model._meta.get_field(attr)
+            except FieldDoesNotExist:
+                # A property or method: no telling what it reads
+                self.complete = False
+                return None
+            path = prefix + '__'.join(attrs[:index + 1])
+            if field.many_to_many or (field.is_relation and not field.concrete):
+                # Reverse and many-to-many relations come from prefetches
+                self.relations.add(path.split('__')[0])
+                return None
+            self.columns.add(path)
+            if not field.is_relation:
+                return None
+            if index == len(attrs) - 1:
+                return field.related_model
+            self.joins.add(path)
+            model = field.related_model
+        return None
+
+    def _prefetch(self, lookup, prefix):
+        lookup = copy.copy(lookup)
+        if prefix:
+            lookup.add_prefix(prefix[:-2])
+        self.prefetches.append(lookup)
+
+
+class SparseQuerysetMixin:
+    """
+    View mixin trimming the queryset of list and retrieve requests to the
+    fields the (``SparseFieldsMixin``) serializer will output.
+    """
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.request.method in SAFE_METHODS and getattr(self, 'action', None) in (None, 'list', 'retrieve'):
+            serializer = self.get_serializer()
+            if isinstance(serializer, SparseFieldsMixin):
+                queryset = serializer.trim_queryset(queryset)
+        return queryset
@@ -0,0 +1,41 @@
+"""
+Keyed hashes that link records of the same person without storing the
+matched values in comparable plaintext.
+
+``person_key`` hashes a normalized name and date of birth; ``blind_index``
+hashes a normalized email. Both are HMACs keyed on ``IDENTITY_HASH_KEY``, so
+the stored values can be compared with an index lookup but not reversed or
+recomputed by someone who only has the database. After the key changes,
+``manage.py rebuild_identity_keys`` recomputes the stored values.
+"""
+
+import unicodedata
+
+from django.conf import settings
+from django.utils.crypto import salted_hmac
+
+
+def normalize_person_name(name):
+    """Case-fold, strip accents and collapse whitespace in a person's name."""
+    name = unicodedata.normalize('NFKD', str(name))
+    name = ''.join(char for char in name if not unicodedata.combining(char))
+    return ' '.join(name.split()).casefold()
+
+
+def person_key(name, date_of_birth):
+    """Identity key for a name + date of birth, or '' if either is missing."""
+    if not name or not date_of_birth:
+        return ''
+    value = f'{normalize_person_name(name)}|{date_of_birth}'
+    return salted_hmac(
+        'talentverify.person_key', value, secret=settings.IDENTITY_HASH_KEY, algorithm='sha256'
+    ).hexdigest()
+
+
+def blind_index(email):
+    """Searchable keyed hash of an email address, or '' if missing."""
+    if not email:
+        return ''
+    return salted_hmac(
+        'talentverify.email_index', email.strip().casefold(), secret=settings.IDENTITY_HASH_KEY, algorithm='sha256'
+    ).hexdigest()
@@ -0,0 +1,72 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management.base import BaseCommand
+
+from apps.audit.log import audit_log
+from apps.audit.models import AuditEvent
+from apps.companies.bulk_upload.processor import process_company_file
+from apps.companies.models import Company
+
+PREFIX = 'BENCH-I-'
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmarks bulk company imports (rows/sec) across transaction chunk sizes. '
+        'Rows are really committed, then deleted after each run'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=2000, help='Rows in the synthetic file')
+        parser.add_argument('--chunk-sizes', type=int, nargs='+', default=[1, 10, 100, 1000],
+                            help='Rows committed per transaction; 1 is one commit per row')
+        parser.add_argument('--savepoint-batch', type=int, default=None,
+                            help='Rows per savepoint (BULK_UPLOAD_SAVEPOINT_BATCH by default)')
+        parser.add_argument('--invalid-every', type=int, default=0,
+                            help='Make every Nth row invalid, to include error handling')
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        user = User.objects.create(username='bench-import-admin', role='admin')
+        content = self._csv(options['rows'], options['invalid_every'])
+        try:
+            for chunk_size in options['chunk_sizes']:
+                file = SimpleUploadedFile('bench.csv', content)
+                started = time.perf_counter()
+                companies, errors = process_company_file(
+                    file, user, chunk_size=chunk_size, savepoint_batch=options['savepoint_batch']
+                )
+                elapsed = time.perf_counter() - started
+                self._cleanup()
+                if errors and errors[0]['row'] == 0:
+                    self.stderr.write(str(errors[0]['errors']))
+                    return
+                self.stdout.write(
+                    f'chunk {chunk_size:>5}: {options["rows"]} rows in {elapsed:.2f} s '
+                    f'({options["rows"] / elapsed:,.0f} rows/s), '
+                    f'{len(companies)} imported, {len(errors)} errors'
+                )
+        finally:
+            self._cleanup()
+            user.delete()
+        self.stdout.write('Imported rows deleted')
+
+    def _csv(self, rows, invalid_every):
+        lines = ['registration_number,name,registration_date,address,contact_person,'
+                 'department,employee_count,phone,email']
+        for i in range(rows):
+            invalid = invalid_every and i % invalid_every == invalid_every - 1
+            lines.append(
+                f'{PREFIX}{i},Bench Import {i},{"not-a-date" if invalid else "2020-01-01"},'
+                f'1 Main St,Contact {i},"Sales, IT",10,555-{i:04d},bench{i}@example.com'
+            )
+        return ('\n'.join(lines) + '\n').encode()
+
+    def _cleanup(self):
+        companies = Company.objects.filter(registration_number__startswith=PREFIX)
+        ids = [str(pk) for pk in companies.values_list('pk', flat=True)]
+        companies.delete()
+        audit_log.flush()
+        AuditEvent.objects.filter(model='companies.company', object_id__in=ids).delete()
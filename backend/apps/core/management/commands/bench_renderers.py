@@ -0,0 +1,83 @@
+import random
+import time
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils.text import compress_string
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.companies.api.views import EmployeeViewSet
+from apps.companies.models import Company, Employee
+from apps.core.renderers import FastJSONRenderer, MessagePackRenderer
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmarks response renderers (encode time and bytes, raw and gzipped) on the '
+        'employee list payload of synthetic employees (rolled back afterwards)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--employees', type=int, default=10000, help='Synthetic employees to list')
+        parser.add_argument('--companies', type=int, default=50, help='Synthetic companies to create')
+        parser.add_argument('--repeat', type=int, default=5, help='Encodings per renderer (best is reported)')
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self._run(options)
+                raise Rollback
+        except Rollback:
+            self.stdout.write('Synthetic data rolled back')
+
+    def _run(self, options):
+        rng = random.Random(7)
+        admin = get_user_model().objects.create(username='bench-renderers', role='admin')
+        companies = Company.objects.bulk_create([
+            Company(
+                name=f'Bench Company {i}', registration_date=date(2000, 1, 1),
+                registration_number=f'BENCH-R-{i}', address='-', contact_person='-',
+                phone='-', email=f'bench{i}@example.com', created_by=admin,
+            )
+            for i in range(options['companies'])
+        ])
+        Employee.objects.bulk_create([
+            Employee(
+                company=rng.choice(companies), name=f'Person {i}', employee_id=f'BENCH-R-E{i}',
+                email=f'person{i}@example.com', phone='-', position='Engineer',
+                date_of_birth=date(1960, 1, 1) + timedelta(days=rng.randrange(15000)),
+                gender='M', joining_date=date(2015, 1, 1), salary=1000,
+            )
+            for i in range(options['employees'])
+        ], batch_size=1000)
+
+        request = APIRequestFactory().get('/api/companies/employees/')
+        force_authenticate(request, user=admin)
+        data = EmployeeViewSet.as_view({'get': 'list'})(request).data
+        self.stdout.write(f'{len(data)} employees listed')
+
+        for renderer in (JSONRenderer(), FastJSONRenderer(), MessagePackRenderer()):
+            encode = min(self._time(lambda: renderer.render(data), options['repeat']))
+            content = renderer.render(data)
+            compress = min(self._time(lambda: compress_string(content), options['repeat']))
+            compressed = compress_string(content)
+            self.stdout.write(
+                f'{type(renderer).__name__:<20} encode {encode * 1000:7.1f} ms, {len(content):>10,} bytes; '
+                f'gzip +{compress * 1000:6.1f} ms, {len(compressed):>9,} bytes'
+            )
+
+    @staticmethod
+    def _time(function, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            function()
+            timings.append(time.perf_counter() - started)
+        return timings
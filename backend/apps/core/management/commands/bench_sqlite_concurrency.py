@@ -0,0 +1,138 @@
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connections
+from django.db.backends.sqlite3.base import DatabaseWrapper
+from django.test.utils import override_settings
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmarks concurrent readers against bulk writers on a scratch SQLite database, '
+        'once per SQLITE_PROFILES profile'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--profiles', nargs='+', default=['default', 'production'],
+                            help='SQLITE_PROFILES entries to compare')
+        parser.add_argument('--readers', type=int, default=4, help='Reader threads')
+        parser.add_argument('--writers', type=int, default=2, help='Writer threads')
+        parser.add_argument('--seconds', type=float, default=5.0, help='Duration per profile')
+        parser.add_argument('--rows', type=int, default=20000, help='Rows in the scratch table')
+        parser.add_argument('--batch', type=int, default=200, help='Rows inserted per write transaction')
+
+    def handle(self, *args, **options):
+        if connections['default'].vendor != 'sqlite':
+            raise CommandError('The default database is not SQLite')
+        for profile in options['profiles']:
+            with tempfile.TemporaryDirectory() as directory, override_settings(SQLITE_PROFILE=profile):
+                settings_dict = dict(connections['default'].settings_dict, NAME=os.path.join(directory, 'bench.sqlite3'))
+                self._prepare(settings_dict, options['rows'])
+                self._report(profile, self._run(settings_dict, options))
+
+    @staticmethod
+    def _connect(settings_dict):
+        # A private connection per thread; connection_created applies the profile
+        connection = DatabaseWrapper(settings_dict, alias='bench')
+        connection.ensure_connection()
+        return connection
+
+    def _prepare(self, settings_dict, rows):
+        connection = self._connect(settings_dict)
+        with connection.cursor() as cursor:
+            cursor.execute('CREATE TABLE bench (id INTEGER PRIMARY KEY, company INTEGER, value TEXT)')
+            cursor.execute('CREATE INDEX bench_company ON bench (company)')
+            cursor.executemany(
+                'INSERT INTO bench (company, value) VALUES (%s, %s)',
+                [(i % 100, f'value {i}') for i in range(rows)],
+            )
+        connection.close()
+
+    def _run(self, settings_dict, options):
+        stop = threading.Event()
+        lock = threading.Lock()
+        stats = {'read_latency': [], 'write_latency': [], 'read_errors': 0, 'write_errors': 0, 'rows_written': 0}
+
+        def reader():
+            connection = self._connect(settings_dict)
+            latencies, errors = [], 0
+            while not stop.is_set():
+                started = time.perf_counter()
+                try:
+                    with connection.cursor() as cursor:
+                        cursor.execute(
+                            'SELECT COUNT(*), MAX(id) FROM bench WHERE company = %s', [random.randrange(100)]
+                        )
+                        cursor.fetchone()
+                except OperationalError:
+                    errors += 1
+                    continue
+                latencies.append(time.perf_counter() - started)
+            connection.close()
+            with lock:
+                stats['read_latency'] += latencies
+                stats['read_errors'] += errors
+
+        def writer():
+            connection = self._connect(settings_dict)
+            latencies, errors, written = [], 0, 0
+            batch = [(random.randrange(100), 'new value') for _ in range(options['batch'])]
+            while not stop.is_set():
+                started = time.perf_counter()
+                try:
+                    with connection.cursor() as cursor:
+                        cursor.execute('BEGIN')
+                        try:
+                            # Write first, as a bulk import chunk records its progress
+                            # before its lookups, then look up existing keys
+                            cursor.execute('UPDATE bench SET value = value WHERE id = 1')
+                            cursor.execute('SELECT COUNT(*) FROM bench WHERE company = %s', [batch[0][0]])
+                            cursor.fetchone()
+                            cursor.executemany('INSERT INTO bench (company, value) VALUES (%s, %s)', batch)
+                            cursor.execute('COMMIT')
+                        except OperationalError:
+                            cursor.execute('ROLLBACK')
+                            raise
+                except OperationalError:
+                    errors += 1
+                    continue
+                latencies.append(time.perf_counter() - started)
+                written += len(batch)
+            connection.close()
+            with lock:
+                stats['write_latency'] += latencies
+                stats['write_errors'] += errors
+                stats['rows_written'] += written
+
+        threads = (
+            [threading.Thread(target=reader) for _ in range(options['readers'])]
+            + [threading.Thread(target=writer) for _ in range(options['writers'])]
+        )
+        for thread in threads:
+            thread.start()
+        time.sleep(options['seconds'])
+        stop.set()
+        for thread in threads:
+            thread.join()
+        stats['seconds'] = options['seconds']
+        return stats
+
+    def _report(self, profile, stats):
+        def percentiles(values):
+            if not values:
+                return 'n/a'
+            values = sorted(values)
+            p95 = values[min(len(values) - 1, int(len(values) * 0.95))]
+            return f'p50 {statistics.median(values) * 1000:.2f} ms, p95 {p95 * 1000:.2f} ms'
+
+        self.stdout.write(
+            f'{profile}: {len(stats["read_latency"]) / stats["seconds"]:,.0f} reads/s '
+            f'({percentiles(stats["read_latency"])}, {stats["read_errors"]} locked), '
+            f'{stats["rows_written"] / stats["seconds"]:,.0f} rows written/s '
+            f'({percentiles(stats["write_latency"])} per commit, {stats["write_errors"]} locked)'
+        )
@@ -0,0 +1,84 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Runs in a fresh interpreter: what a worker does before serving its first request
+STARTUP_SCRIPT = """
+import json, resource, sys, time
+started = time.perf_counter()
+import django
+django.setup()
+from django.urls import get_resolver
+get_resolver().url_patterns
+elapsed = time.perf_counter() - started
+print(json.dumps({
+    'setup_ms': elapsed * 1000,
+    'max_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    'modules': sorted(sys.modules),
+}))
+"""
+
+
+class Command(BaseCommand):
+    help = ('Benchmarks cold start (django.setup() plus URL resolution) in fresh interpreters and '
+            'checks it against the import-time budget using python -X importtime')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=5, help='Fresh interpreters to time')
+        parser.add_argument('--top', type=int, default=10, help='Slowest imports to list')
+        parser.add_argument('--budget-ms', type=float, default=settings.STARTUP_IMPORT_BUDGET_MS,
+                            help='Maximum total import time')
+        parser.add_argument('--check', action='store_true',
+                            help='Fail if the budget is exceeded or a lazy module is imported at startup')
+
+    def _run(self, *flags):
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=os.environ.get('DJANGO_SETTINGS_MODULE', 'config.settings'))
+        completed = subprocess.run(
+            [sys.executable, *flags, '-c', STARTUP_SCRIPT],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+        )
+        if completed.returncode:
+            raise CommandError(f'Startup failed:\n{completed.stderr}')
+        return json.loads(completed.stdout.strip().splitlines()[-1]), completed.stderr
+
+    def handle(self, *args, **options):
+        runs = [self._run()[0] for _ in range(options['runs'])]
+        setup_ms = statistics.median(run['setup_ms'] for run in runs)
+        rss_mb = statistics.median(run['max_rss_kb'] for run in runs) / 1024
+        self.stdout.write(f'django.setup() + URL resolution: median {setup_ms:.0f} ms, '
+                          f'max RSS {rss_mb:.1f} MB over {len(runs)} runs')
+
+        # "import time: self [us] | cumulative | imported package" per module
+        result, stderr = self._run('-X', 'importtime')
+        imports = []
+        for line in stderr.splitlines():
+            if not line.startswith('import time:') or 'self [us]' in line:
+                continue
+            self_us, cumulative_us, name = line[len('import time:'):].split('|')
+            # Nested imports are indented past the single separator space
+            imports.append((name[1:].rstrip(), int(self_us), int(cumulative_us)))
+        total_ms = sum(self_us for _, self_us, _ in imports) / 1000
+        self.stdout.write(f'Import time: {total_ms:.0f} ms for {len(imports)} modules '
+                          f'(budget {options["budget_ms"]:.0f} ms)')
+        top_level = sorted((i for i in imports if not i[0].startswith(' ')), key=lambda i: -i[2])
+        for name, _, cumulative_us in top_level[:options['top']]:
+            self.stdout.write(f'  {cumulative_us / 1000:8.1f} ms  {name}')
+
+        eager = sorted(
+            name for name in settings.STARTUP_LAZY_MODULES
+            if name in result['modules']
+        )
+        if eager:
+            self.stdout.write(self.style.WARNING(f'Imported at startup but meant to be lazy: {", ".join(eager)}'))
+
+        if options['check']:
+            if eager:
+                raise CommandError(f'Lazy modules imported at startup: {", ".join(eager)}')
+            if total_ms > options['budget_ms']:
+                raise CommandError(f'Import time {total_ms:.0f} ms exceeds the budget of {options["budget_ms"]:.0f} ms')
+            self.stdout.write(self.style.SUCCESS('Startup within budget'))
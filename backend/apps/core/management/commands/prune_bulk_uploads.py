@@ -0,0 +1,24 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.core.models import BulkUpload
+
+
+class Command(BaseCommand):
+    help = 'Deletes completed and failed bulk uploads older than the retention period'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=settings.BULK_UPLOAD_RETENTION_DAYS,
+                            help='Keep uploads finished in the last this many days')
+
+    def handle(self, *args, **options):
+        before = timezone.now() - timedelta(days=options['days'])
+        _, deleted = BulkUpload.objects.filter(
+            status__in=('completed', 'failed'), updated_at__lt=before
+        ).delete()
+        # Chunk records go with their uploads; count the uploads only
+        deleted = deleted.get(BulkUpload._meta.label, 0)
+        self.stdout.write(f'Deleted {deleted} bulk uploads older than {before:%Y-%m-%d %H:%M}')
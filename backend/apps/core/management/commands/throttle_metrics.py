@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from apps.core.throttling import throttle_metrics
+
+
+class Command(BaseCommand):
+    help = 'Shows the allowed and throttled request counts of the token-bucket throttles, per scope'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reset', action='store_true', help='Set the counters back to zero afterwards')
+
+    def handle(self, *args, **options):
+        for scope, counts in throttle_metrics.snapshot().items():
+            levels = ', '.join(
+                f'{outcome.split(":")[1]} {count}' for outcome, count in counts.items() if outcome.startswith('throttled:')
+            )
+            self.stdout.write(
+                f'{scope}: {counts["allowed"]} allowed, {counts["throttled"]} throttled'
+                + (f' ({levels})' if levels else '')
+            )
+        if options['reset']:
+            throttle_metrics.reset()
+            self.stdout.write('Counters reset')
@@ -0,0 +1,19 @@
+"""
+Middleware for the core app.
+"""
+
+from django.conf import settings
+from django.middleware.gzip import GZipMiddleware
+
+
+class ThresholdGZipMiddleware(GZipMiddleware):
+    """
+    ``GZipMiddleware`` that leaves responses smaller than
+    ``RESPONSE_GZIP_MIN_SIZE`` bytes uncompressed; for those, compression
+    costs more CPU time than it saves on the wire.
+    """
+
+    def process_response(self, request, response):
+        if not response.streaming and len(response.content) < settings.RESPONSE_GZIP_MIN_SIZE:
+            return response
+        return super().process_response(request, response)
@@ -0,0 +1,68 @@
+# Generated by Django 5.0.2 on 2026-10-19 06:55
+
+import django.core.serializers.json
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BulkUpload',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(max_length=32)),
+                ('scope', models.CharField(blank=True, max_length=64)),
+                ('sha256', models.CharField(max_length=64)),
+                ('idempotency_key', models.CharField(blank=True, max_length=255)),
+                ('file_name', models.CharField(blank=True, max_length=255)),
+                ('status', models.CharField(choices=[('processing', 'Processing'), ('completed', 'Completed'), ('failed', 'Failed')], default='processing', max_length=10)),
+                ('chunk_size', models.PositiveIntegerField()),
+                ('total_rows', models.PositiveIntegerField(blank=True, null=True)),
+                ('rows_done', models.PositiveIntegerField(default=0)),
+                ('result', models.JSONField(blank=True, encoder=django.core.serializers.json.DjangoJSONEncoder, null=True)),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Bulk Upload',
+                'verbose_name_plural': 'Bulk Uploads',
+            },
+        ),
+        migrations.CreateModel(
+            name='BulkUploadChunk',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('index', models.PositiveIntegerField()),
+                ('rows', models.PositiveIntegerField()),
+                ('output', models.JSONField(default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('upload', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='chunks', to='core.bulkupload')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='bulkupload',
+            index=models.Index(fields=['kind', 'scope', 'sha256'], name='bulk_upload_content_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='bulkupload',
+            constraint=models.UniqueConstraint(condition=models.Q(('status', 'processing')), fields=('kind', 'scope', 'sha256'), name='bulk_upload_one_active'),
+        ),
+        migrations.AddConstraint(
+            model_name='bulkupload',
+            constraint=models.UniqueConstraint(condition=models.Q(('idempotency_key', ''), _negated=True), fields=('created_by', 'kind', 'idempotency_key'), name='bulk_upload_idempotency_key'),
+        ),
+        migrations.AddConstraint(
+            model_name='bulkuploadchunk',
+            constraint=models.UniqueConstraint(fields=('upload', 'index'), name='bulk_upload_chunk_uniq'),
+        ),
+    ]
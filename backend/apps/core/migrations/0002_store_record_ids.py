@@ -0,0 +1,36 @@
+from django.db import migrations
+
+# Output fields that held serialized instances; they now hold ids only
+RECORD_FIELDS = ('companies', 'employees', 'created')
+
+
+def _ids(output):
+    if not isinstance(output, dict):
+        return output, False
+    changed = False
+    for field in RECORD_FIELDS:
+        values = output.get(field)
+        if values and isinstance(values[0], dict):
+            output[field] = [item['id'] for item in values if isinstance(item, dict) and 'id' in item]
+            changed = True
+    return output, changed
+
+
+def store_record_ids(apps, schema_editor):
+    for model, field in (('BulkUpload', 'result'), ('BulkUploadChunk', 'output')):
+        Model = apps.get_model('core', model)
+        for obj in Model.objects.only('pk', field).iterator():
+            value, changed = _ids(getattr(obj, field))
+            if changed:
+                Model.objects.filter(pk=obj.pk).update(**{field: value})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(store_record_ids, migrations.RunPython.noop),
+    ]
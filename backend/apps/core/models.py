@@ -0,0 +1,85 @@
+"""
+Models for the core app.
+"""
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.db.models import Q
+
+
+class BulkUpload(models.Model):
+    """
+    One import of an uploaded file, identified by its content hash and an
+    optional client idempotency key. Rows are imported in chunks of
+    ``chunk_size``; each finished chunk is committed together with its
+    ``BulkUploadChunk``, so an interrupted import resumes at the first
+    unrecorded chunk. A completed import keeps its response in ``result``,
+    with imported instances stored as ids (see ``apps.core.bulk_imports``).
+    """
+    STATUS_CHOICES = [
+        ('processing', 'Processing'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+    ]
+
+    kind = models.CharField(max_length=32)
+    # What the rows are imported into, e.g. the company id for employee files
+    scope = models.CharField(max_length=64, blank=True)
+    sha256 = models.CharField(max_length=64)
+    idempotency_key = models.CharField(max_length=255, blank=True)
+    file_name = models.CharField(max_length=255, blank=True)
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name='+'
+    )
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='processing')
+    chunk_size = models.PositiveIntegerField()
+    total_rows = models.PositiveIntegerField(null=True, blank=True)
+    rows_done = models.PositiveIntegerField(default=0)
+    result = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Bulk Upload'
+        verbose_name_plural = 'Bulk Uploads'
+        indexes = [
+            models.Index(fields=['kind', 'scope', 'sha256'], name='bulk_upload_content_idx'),
+        ]
+        constraints = [
+            # At most one import of the same content runs at a time
+            models.UniqueConstraint(
+                fields=['kind', 'scope', 'sha256'], condition=Q(status='processing'),
+                name='bulk_upload_one_active',
+            ),
+            models.UniqueConstraint(
+                fields=['created_by', 'kind', 'idempotency_key'], condition=~Q(idempotency_key=''),
+                name='bulk_upload_idempotency_key',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} upload {self.sha256[:12]} ({self.status})"
+
+    def progress(self):
+        return {
+            'id': self.id,
+            'status': self.status,
+            'sha256': self.sha256,
+            'rows_done': self.rows_done,
+            'total_rows': self.total_rows,
+        }
+
+
+class BulkUploadChunk(models.Model):
+    """Output of one committed chunk of a ``BulkUpload``, instances as ids."""
+    upload = models.ForeignKey(BulkUpload, on_delete=models.CASCADE, related_name='chunks')
+    index = models.PositiveIntegerField()
+    rows = models.PositiveIntegerField()
+    output = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['upload', 'index'], name='bulk_upload_chunk_uniq'),
+        ]
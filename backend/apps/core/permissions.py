@@ -21,4 +21,16 @@ class IsCompanyOwnerOrTalentVerify(permissions.BasePermission):
         return bool(
             request.user and
             (request.user.is_talentverify or obj.created_by == request.user)
-        ) 
\ No newline at end of file
+        )
+
+class IsAdminOrCompanyUser(permissions.BasePermission):
+    """
+    Custom permission to only allow admins and company users to access the view.
+    Views are expected to scope company users to their own company.
+    """
+    
+    def has_permission(self, request, view):
+        return bool(
+            request.user and request.user.is_authenticated and
+            getattr(request.user, 'role', None) in ('admin', 'company')
+        )
@@ -0,0 +1,51 @@
+"""
+Compact response renderers.
+
+``FastJSONRenderer`` produces the same JSON as DRF's ``JSONRenderer`` with
+orjson, which encodes large lists several times faster than ``json.dumps``.
+``MessagePackRenderer`` serves ``application/msgpack`` to clients that ask for
+it in ``Accept`` (or with ``?format=msgpack``). Values neither encoder
+handles natively (Decimal, lazy strings, datetimes, ...) are converted by
+DRF's own ``JSONEncoder``, so both formats carry the same values as before.
+"""
+
+import msgpack
+import orjson
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+
+_default = JSONEncoder().default
+
+# Datetimes go through DRF's encoder for its ISO 8601 format; int dict keys
+# are written as strings, as json.dumps does.
+ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+
+class FastJSONRenderer(JSONRenderer):
+    """``JSONRenderer`` on orjson. Indented output is left to the base class."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        renderer_context = renderer_context or {}
+        if self.get_indent(accepted_media_type, renderer_context) or not api_settings.UNICODE_JSON:
+            return super().render(data, accepted_media_type, renderer_context)
+        content = orjson.dumps(data, default=_default, option=ORJSON_OPTIONS)
+        # Keep JSON embeddable in JavaScript, like JSONRenderer
+        if b'\xe2\x80\xa8' in content or b'\xe2\x80\xa9' in content:
+            content = content.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return content
+
+
+class MessagePackRenderer(BaseRenderer):
+    """MessagePack encoding of the response data."""
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return msgpack.packb(data, default=_default, use_bin_type=True)
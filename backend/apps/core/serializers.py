@@ -0,0 +1,139 @@
+"""
+Shared serializer helpers for the Talent Verify application.
+"""
+
+from rest_framework import serializers
+from rest_framework.settings import api_settings
+from rest_framework.validators import UniqueValidator
+
+# Serializer context keys holding what a batch preloaded (see prefetch_batch)
+PREFETCHED_RELATED = 'prefetched_related'
+PREFETCHED_UNIQUE = 'prefetched_unique'
+
+
+class PrefetchedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    Primary key field that takes its instance from those a batch preloaded,
+    querying only for keys it was not given.
+    """
+
+    def to_internal_value(self, data):
+        loaded = self.context.get(PREFETCHED_RELATED, {}).get(self.field_name)
+        if loaded is not None and not isinstance(data, bool):
+            try:
+                instance = loaded.get(self.get_queryset().model._meta.pk.to_python(data))
+            except Exception:
+                instance = None
+            if instance is not None:
+                return instance
+        return super().to_internal_value(data)
+
+
+class PrefetchedUniqueValidator(UniqueValidator):
+    """
+    ``UniqueValidator`` answering from the values a batch preloaded, querying
+    only for values it was not given.
+    """
+
+    def __call__(self, value, serializer_field):
+        owners = serializer_field.context.get(PREFETCHED_UNIQUE, {}).get(serializer_field.field_name)
+        if owners is None or value not in owners:
+            return super().__call__(value, serializer_field)
+        instance = getattr(serializer_field.parent, 'instance', None)
+        owner = owners[value]
+        if owner is not None and (instance is None or owner != instance.pk):
+            raise serializers.ValidationError(self.message, code='unique')
+
+
+def _input_values(field, items):
+    values = set()
+    for item in items:
+        if not isinstance(item, dict) or item.get(field.field_name) in (None, ''):
+            continue
+        try:
+            value = field.to_internal_value(item[field.field_name])
+        except serializers.ValidationError:
+            continue
+        if getattr(field, 'trim_whitespace', False):
+            value = value.strip()
+        values.add(value)
+    return values
+
+
+def prefetch_batch(serializer, items):
+    """
+    Serializer context preloading, for every item of a batch validated with
+    ``serializer``, the instances its ``PrefetchedPrimaryKeyRelatedField``
+    fields reference and the owners of the values its
+    ``PrefetchedUniqueValidator`` fields check: one query per field instead
+    of one per item.
+    """
+    related, unique = {}, {}
+    for name, field in serializer.fields.items():
+        if field.read_only:
+            continue
+        if isinstance(field, PrefetchedPrimaryKeyRelatedField):
+            pks = set()
+            for item in items:
+                try:
+                    pks.add(field.get_queryset().model._meta.pk.to_python(item[name]))
+                except Exception:
+                    continue
+            pks.discard(None)
+            related[name] = field.get_queryset().in_bulk(pks) if pks else {}
+        for validator in field.validators:
+            if isinstance(validator, PrefetchedUniqueValidator):
+                values = _input_values(field, items)
+                owners = dict.fromkeys(values)
+                owners.update(
+                    validator.queryset.filter(**{f'{field.source}__in': values}).values_list(field.source, 'pk')
+                )
+                unique[name] = owners
+    return {PREFETCHED_RELATED: related, PREFETCHED_UNIQUE: unique}
+
+
+class PartialListSerializer(serializers.ListSerializer):
+    """
+    List serializer for batch endpoints that report per-item results.
+
+    Validates each item and keeps the values of those that passed in
+    ``valid_items`` (index -> validated data), so a partly invalid batch can
+    still process the rest without validating twice. ``errors`` stays aligned
+    with the input, with ``{}`` for valid items. Related instances and unique
+    values are preloaded for the whole batch (see ``prefetch_batch``).
+    """
+
+    def check_length(self, data):
+        """The ``allow_empty``/``max_length``/``min_length`` checks of ``ListSerializer``."""
+        if not self.allow_empty and len(data) == 0:
+            raise serializers.ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [self.error_messages['empty']]
+            }, code='empty')
+        if self.max_length is not None and len(data) > self.max_length:
+            message = self.error_messages['max_length'].format(max_length=self.max_length)
+            raise serializers.ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [message]
+            }, code='max_length')
+        if self.min_length is not None and len(data) < self.min_length:
+            message = self.error_messages['min_length'].format(min_length=self.min_length)
+            raise serializers.ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [message]
+            }, code='min_length')
+
+    def to_internal_value(self, data):
+        self.valid_items = {}
+        if not isinstance(data, list):
+            return super().to_internal_value(data)
+        self.check_length(data)
+        self.context.update(prefetch_batch(self.child, data))
+        errors = []
+        for index, item in enumerate(data):
+            try:
+                self.valid_items[index] = self.child.run_validation(item)
+            except serializers.ValidationError as exc:
+                errors.append(exc.detail)
+            else:
+                errors.append({})
+        if any(errors):
+            raise serializers.ValidationError(errors)
+        return list(self.valid_items.values())
@@ -0,0 +1,221 @@
+"""
+Token-bucket request throttling.
+
+Each throttle scope (``search``, ``verification``, ``upload``) has its own
+budget in ``TOKEN_BUCKET_THROTTLES``: a bucket per user and one shared by all
+users of a company, each given as ``'requests/period'``. A bucket holds that
+many requests, so short bursts pass, and refills continuously at that rate. A
+request spends one token from every bucket that applies to it and is refused
+if any of them is empty, with ``Retry-After`` set to when it would refill.
+
+Buckets live in a small SQLite database of their own (``THROTTLE_DATABASE``,
+on local disk), so all worker processes draw from the same budgets without an
+outside service or a write to the application database. A request reads and
+spends its buckets in one ``BEGIN IMMEDIATE`` transaction, so concurrent
+requests never spend the same token. Buckets idle long enough to have
+refilled are deleted at most every ``THROTTLE_CLEANUP_INTERVAL`` seconds.
+
+Allowed and throttled requests are counted per scope in the same transaction
+(``throttle_metrics``, shown by ``manage.py throttle_metrics``), and every
+refusal is logged.
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from rest_framework.throttling import BaseThrottle
+
+logger = logging.getLogger(__name__)
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def parse_rate(rate):
+    """``'60/min'`` as ``(capacity, tokens per second)``."""
+    count, period = rate.split('/')
+    count = int(count)
+    return count, count / PERIODS[period[0]]
+
+
+class ThrottleStore:
+    """SQLite file holding the token buckets and request counts."""
+    SCHEMA = (
+        'CREATE TABLE IF NOT EXISTS bucket ('
+        'key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL, expires_at REAL NOT NULL)',
+        'CREATE TABLE IF NOT EXISTS metric ('
+        'scope TEXT NOT NULL, outcome TEXT NOT NULL, count INTEGER NOT NULL, PRIMARY KEY (scope, outcome))',
+    )
+
+    def __init__(self, path, cleanup_interval=600):
+        self.path = str(path)
+        self.cleanup_interval = cleanup_interval
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._last_cleanup = 0.0
+
+    def connection(self):
+        """This thread's connection, opened again in a forked worker."""
+        local = self._local
+        if getattr(local, 'pid', None) != os.getpid() or local.path != self.path:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute('PRAGMA journal_mode = WAL')
+            connection.execute('PRAGMA synchronous = NORMAL')
+            for statement in self.SCHEMA:
+                connection.execute(statement)
+            local.connection, local.pid, local.path = connection, os.getpid(), self.path
+        return local.connection
+
+    @contextmanager
+    def transaction(self):
+        """A transaction holding the write lock from its start."""
+        connection = self.connection()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            yield connection
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+        connection.execute('COMMIT')
+
+    def maybe_cleanup(self, now):
+        """Delete expired buckets, at most once per ``cleanup_interval`` seconds."""
+        tick = time.monotonic()
+        with self._lock:
+            if self._last_cleanup and tick - self._last_cleanup < self.cleanup_interval:
+                return
+            self._last_cleanup = tick
+        self.connection().execute('DELETE FROM bucket WHERE expires_at < ?', [now])
+
+
+throttle_store = ThrottleStore(
+    getattr(settings, 'THROTTLE_DATABASE', os.path.join(settings.BASE_DIR, 'var', 'throttle.sqlite3')),
+    cleanup_interval=getattr(settings, 'THROTTLE_CLEANUP_INTERVAL', 600),
+)
+
+
+class ThrottleMetrics:
+    """Allowed and throttled request counts per scope and bucket level."""
+    OUTCOMES = ('allowed', 'throttled')
+
+    def record(self, connection, scope, *outcomes):
+        """Count one request for each of ``outcomes``, inside ``connection``'s transaction."""
+        connection.executemany(
+            'INSERT INTO metric (scope, outcome, count) VALUES (?, ?, 1) '
+            'ON CONFLICT (scope, outcome) DO UPDATE SET count = count + 1',
+            [(scope, outcome) for outcome in outcomes],
+        )
+
+    def snapshot(self):
+        """``{scope: {outcome: count}}``, summed over all workers."""
+        scopes = getattr(settings, 'TOKEN_BUCKET_THROTTLES', {})
+        counts = dict(
+            ((scope, outcome), count)
+            for scope, outcome, count in throttle_store.connection().execute('SELECT scope, outcome, count FROM metric')
+        )
+        return {
+            scope: {
+                outcome: counts.get((scope, outcome), 0)
+                for outcome in self.OUTCOMES + tuple(f'throttled:{level}' for level in levels)
+            }
+            for scope, levels in scopes.items()
+        }
+
+    def reset(self):
+        throttle_store.connection().execute('DELETE FROM metric')
+
+
+throttle_metrics = ThrottleMetrics()
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Throttle drawing on the ``user`` and ``company`` buckets of ``scope``.
+    Unauthenticated requests use a per-address bucket at the user rate.
+    """
+    scope = None
+    timer = time.time
+
+    def __init__(self):
+        self.buckets = getattr(settings, 'TOKEN_BUCKET_THROTTLES', {}).get(self.scope, {})
+        self._wait = None
+
+    def get_idents(self, request):
+        user = request.user
+        if user is None or not user.is_authenticated:
+            return [('user', f'anon-{self.get_ident(request)}')]
+        idents = [('user', user.pk)]
+        company_id = getattr(user, 'company_id', None)
+        if company_id:
+            idents.append(('company', company_id))
+        return idents
+
+    def allow_request(self, request, view):
+        buckets = {}
+        for level, ident in self.get_idents(request):
+            if level in self.buckets:
+                buckets[f'throttle:{self.scope}:{level}:{ident}'] = (level, *parse_rate(self.buckets[level]))
+        if not buckets:
+            return True
+
+        now = self.timer()
+        with throttle_store.transaction() as connection:
+            stored = {
+                key: (tokens, updated_at)
+                for key, tokens, updated_at in connection.execute(
+                    f'SELECT key, tokens, updated_at FROM bucket WHERE key IN ({", ".join("?" * len(buckets))})',
+                    list(buckets),
+                )
+            }
+            tokens, wait, denied = {}, 0, None
+            for key, (level, capacity, refill) in buckets.items():
+                available, updated_at = stored.get(key, (capacity, now))
+                available = min(capacity, available + max(0, now - updated_at) * refill)
+                if available < 1:
+                    needed = (1 - available) / refill
+                    if needed > wait:
+                        wait, denied = needed, level
+                tokens[key] = available
+
+            if denied is not None:
+                throttle_metrics.record(connection, self.scope, 'throttled', f'throttled:{denied}')
+            else:
+                # An idle bucket has refilled completely once it expires
+                expires_at = now + max(capacity / refill for _, capacity, refill in buckets.values())
+                connection.executemany(
+                    'INSERT INTO bucket (key, tokens, updated_at, expires_at) VALUES (?, ?, ?, ?) '
+                    'ON CONFLICT (key) DO UPDATE SET tokens = excluded.tokens, '
+                    'updated_at = excluded.updated_at, expires_at = excluded.expires_at',
+                    [(key, available - 1, now, expires_at) for key, available in tokens.items()],
+                )
+                throttle_metrics.record(connection, self.scope, 'allowed')
+        throttle_store.maybe_cleanup(now)
+
+        if denied is not None:
+            self._wait = wait
+            logger.info(
+                'Throttled %s request from user %s (%s bucket empty, retry in %.1fs)',
+                self.scope, getattr(request.user, 'pk', None), denied, wait
+            )
+            return False
+        return True
+
+    def wait(self):
+        return self._wait
+
+
+class SearchThrottle(TokenBucketThrottle):
+    scope = 'search'
+
+
+class VerificationThrottle(TokenBucketThrottle):
+    scope = 'verification'
+
+
+class UploadThrottle(TokenBucketThrottle):
+    scope = 'upload'
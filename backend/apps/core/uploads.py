@@ -0,0 +1,221 @@
+"""
+Spooling of bulk upload files.
+
+Large request bodies are streamed straight into a managed spool directory
+instead of Django's temp files, and every uploaded file is SHA-256 hashed as
+its chunks arrive. Spooled files are parsed from their path with a memory map,
+so pandas reads the page cache rather than another copy of the content. The
+hash identifies the upload for ``apps.core.bulk_imports``.
+
+A spooled file is deleted when its request finishes and Django closes the
+request's uploads. Files left behind by a worker that died mid-request are
+removed once older than ``UPLOAD_SPOOL_MAX_AGE``, as new uploads come in.
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.uploadedfile import InMemoryUploadedFile, UploadedFile
+from django.core.files.uploadhandler import FileUploadHandler, StopFutureHandlers
+
+DATA_SUFFIX = '.upload'
+PART_SUFFIX = '.part'
+
+
+class UploadSpool:
+    """Directory of spooled uploads, one uniquely named file per upload."""
+
+    def __init__(self, directory, max_age=3600, cleanup_interval=600):
+        self.directory = str(directory)
+        self.max_age = max_age
+        self.cleanup_interval = cleanup_interval
+        self._lock = threading.Lock()
+        self._last_cleanup = 0.0
+
+    def open_part(self):
+        """A new, empty spool file to stream an upload into."""
+        os.makedirs(self.directory, exist_ok=True)
+        self.maybe_cleanup()
+        return tempfile.NamedTemporaryFile(dir=self.directory, suffix=PART_SUFFIX, delete=False)
+
+    def store(self, part_path):
+        """
+        Mark a part file as complete. Its name stays unique, so requests
+        spooling the same content never share (or delete) one file.
+        """
+        path = part_path[:-len(PART_SUFFIX)] + DATA_SUFFIX
+        os.replace(part_path, path)
+        return path
+
+    def discard(self, path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def cleanup(self):
+        """Remove spooled files older than ``max_age``. Returns the count."""
+        cutoff = time.time() - self.max_age
+        removed = 0
+        try:
+            entries = list(os.scandir(self.directory))
+        except FileNotFoundError:
+            return 0
+        for entry in entries:
+            if not entry.name.endswith((DATA_SUFFIX, PART_SUFFIX)):
+                continue
+            try:
+                if entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+                    removed += 1
+            except FileNotFoundError:
+                pass
+        return removed
+
+    def maybe_cleanup(self):
+        """Run ``cleanup`` at most once per ``cleanup_interval`` seconds."""
+        now = time.monotonic()
+        with self._lock:
+            if self._last_cleanup and now - self._last_cleanup < self.cleanup_interval:
+                return
+            self._last_cleanup = now
+        self.cleanup()
+
+
+upload_spool = UploadSpool(
+    getattr(settings, 'UPLOAD_SPOOL_DIR', os.path.join(settings.BASE_DIR, 'var', 'uploads')),
+    max_age=getattr(settings, 'UPLOAD_SPOOL_MAX_AGE', 3600),
+    cleanup_interval=getattr(settings, 'UPLOAD_SPOOL_CLEANUP_INTERVAL', 600),
+)
+
+
+class SpooledUploadedFile(UploadedFile):
+    """
+    An upload stored in the spool directory. Closing it, which Django does
+    for every upload once the request finishes, deletes the spooled file.
+    """
+
+    def __init__(self, path, name, content_type, size, charset, sha256, content_type_extra=None):
+        super().__init__(open(path, 'rb'), name, content_type, size, charset, content_type_extra)
+        self.path = path
+        self.sha256 = sha256
+
+    def temporary_file_path(self):
+        return self.path
+
+    def close(self):
+        try:
+            return super().close()
+        finally:
+            upload_spool.discard(self.path)
+
+
+class SpoolingUploadHandler(FileUploadHandler):
+    """
+    Hash every file in the request while it streams in. Requests larger than
+    ``UPLOAD_SPOOL_THRESHOLD`` bytes are written to the upload spool, smaller
+    ones are kept in memory.
+    """
+
+    def handle_raw_input(self, input_data, META, content_length, boundary, encoding=None):
+        self.spooled = content_length > getattr(
+            settings, 'UPLOAD_SPOOL_THRESHOLD', settings.FILE_UPLOAD_MAX_MEMORY_SIZE
+        )
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.digest = hashlib.sha256()
+        self.file = upload_spool.open_part() if self.spooled else BytesIO()
+        raise StopFutureHandlers()
+
+    def receive_data_chunk(self, raw_data, start):
+        self.digest.update(raw_data)
+        self.file.write(raw_data)
+
+    def file_complete(self, file_size):
+        sha256 = self.digest.hexdigest()
+        if not self.spooled:
+            self.file.seek(0)
+            upload = InMemoryUploadedFile(
+                file=self.file, field_name=self.field_name, name=self.file_name,
+                content_type=self.content_type, size=file_size, charset=self.charset,
+                content_type_extra=self.content_type_extra,
+            )
+            upload.sha256 = sha256
+            return upload
+        self.file.close()
+        path = upload_spool.store(self.file.name)
+        return SpooledUploadedFile(
+            path, self.file_name, self.content_type, file_size, self.charset, sha256,
+            self.content_type_extra,
+        )
+
+    def upload_interrupted(self):
+        if getattr(self, 'spooled', False) and hasattr(self, 'file'):
+            self.file.close()
+            upload_spool.discard(self.file.name)
+
+
+class SpooledUploadMixin:
+    """
+    ViewSet mixin installing ``SpoolingUploadHandler`` for the actions in
+    ``spooled_upload_actions``. The handlers have to be set before the body is
+    parsed, which authentication (CSRF checks) may already do.
+    """
+    spooled_upload_actions = ('bulk_upload',)
+
+    def initialize_request(self, request, *args, **kwargs):
+        if self.action_map.get(request.method.lower()) in self.spooled_upload_actions:
+            request.upload_handlers = [SpoolingUploadHandler(request)]
+        return super().initialize_request(request, *args, **kwargs)
+
+
+def upload_digest(file):
+    """SHA-256 of an uploaded file, computed on demand if no handler did."""
+    digest = getattr(file, 'sha256', None)
+    if digest is None:
+        hasher = hashlib.sha256()
+        for chunk in file.chunks():
+            hasher.update(chunk)
+        file.seek(0)
+        digest = file.sha256 = hasher.hexdigest()
+    return digest
+
+
+def spooled_path(file):
+    """Path of a spooled upload, or None for in-memory files."""
+    if isinstance(file, SpooledUploadedFile):
+        return file.temporary_file_path()
+    return None
+
+
+def read_csv(file, **kwargs):
+    """``pandas.read_csv`` over a memory map of spooled files, else the file object."""
+    import pandas as pd
+
+    path = spooled_path(file)
+    if path is not None:
+        return pd.read_csv(path, memory_map=True, **kwargs)
+    file.seek(0)
+    return pd.read_csv(file, **kwargs)
+
+
+def read_excel(file, **kwargs):
+    """``pandas.read_excel``; spooled workbooks are opened from disk by path."""
+    import pandas as pd
+
+    path = spooled_path(file)
+    if path is not None:
+        return pd.read_excel(path, **kwargs)
+    file.seek(0)
+    return pd.read_excel(file, **kwargs)
+
+
+def read_table(file):
+    """Read a CSV or Excel upload, chosen by file extension."""
+    return read_csv(file) if file.name.lower().endswith('.csv') else read_excel(file)
@@ -3,6 +3,8 @@ Utility functions for the Talent Verify application.
 """
 
 import json
+import math
+import re
 from datetime import datetime
 
 def parse_json_field(field, default=None):
@@ -27,6 +29,38 @@ def parse_json_field(field, default=None):
     except (json.JSONDecodeError, TypeError):
         return default
 
+def split_names(value):
+    """
+    Split a list, a JSON array string or a comma/semicolon/newline separated
+    string into a list of unique, stripped names (order preserved).
+    
+    Args:
+        value: The value to split
+        
+    Returns:
+        List of names
+    """
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return []
+    
+    if isinstance(value, str):
+        parsed = parse_json_field(value)
+        if isinstance(parsed, list):
+            value = parsed
+        else:
+            # Literal "\n" sequences come from escaped form/CSV input
+            value = re.split(r'(?:\\n|\n|,|;)+', value)
+    elif not isinstance(value, (list, tuple)):
+        value = [value]
+    
+    names, seen = [], set()
+    for name in value:
+        name = str(name).strip()
+        if name and name not in seen:
+            seen.add(name)
+            names.append(name)
+    return names
+
 def format_date(date_str):
     """
     Format a date string to YYYY-MM-DD format.
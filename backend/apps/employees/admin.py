@@ -0,0 +1,31 @@
+"""
+Admin configuration for the employees app.
+"""
+
+from django.contrib import admin
+
+from apps.core.admin import ScalableModelAdmin
+from .models import EmployeeHistory, EmployeeHistoryArchive
+
+
+@admin.register(EmployeeHistory)
+class EmployeeHistoryAdmin(ScalableModelAdmin):
+    list_display = ('employee', 'company', 'department', 'position', 'start_date', 'end_date')
+    list_select_related = ('employee', 'company', 'department__company')
+    search_fields = ('=employee__employee_id', '^employee__name')
+    autocomplete_fields = ('employee', 'company', 'department')
+    readonly_fields = ('created_at', 'updated_at')
+
+
+@admin.register(EmployeeHistoryArchive)
+class EmployeeHistoryArchiveAdmin(ScalableModelAdmin):
+    """Read-only: rows are moved in and out by the archive commands."""
+    list_display = ('employee', 'company', 'department', 'position', 'start_date', 'end_date', 'archived_at')
+    list_select_related = ('employee', 'company', 'department__company')
+    search_fields = ('=employee__employee_id', '^employee__name')
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -2,7 +2,6 @@
 Bulk upload processor for employees.
 """
 
-import pandas as pd
 import json
 import csv
 import io
@@ -10,34 +9,45 @@ from datetime import datetime
 from ..models import Employee
 from ..serializers import EmployeeSerializer
 from apps.companies.models import Company
+from apps.core.dedup import ExistingKeys, find_duplicate_rows
+from apps.core.bulk_imports import import_chunks
+from apps.core.uploads import read_csv, read_excel
 
-def process_employee_file(file, company_id):
+def process_employee_file(file, company_id, upload=None, chunk_size=None, records=None):
     """
     Process employee data from CSV/Excel/text file.
     
     Args:
         file: Uploaded file object
         company_id: ID of the company to associate employees with
+        upload: Optional BulkUpload recording progress; chunks it has already
+            committed are skipped
+        chunk_size: Rows committed per transaction when there is no upload
+        records: Loaders for the employees of resumed chunks (see
+            ``apps.core.bulk_imports.record_loader``)
         
     Returns:
         tuple: (list of created employees, list of errors)
     """
+    # pandas is heavy to import; load it only when a file is processed
+    import pandas as pd
+
     # Determine file type and read accordingly
     file_name = file.name.lower()
     
     try:
         if file_name.endswith('.csv'):
-            df = pd.read_csv(file)
+            df = read_csv(file)
         elif file_name.endswith('.xlsx') or file_name.endswith('.xls'):
-            df = pd.read_excel(file)
+            df = read_excel(file)
         elif file_name.endswith('.txt'):
             # Try to read as tab-separated first
             try:
-                df = pd.read_csv(file, sep='\t')
+                df = read_csv(file, sep='\t')
             except:
                 # If that fails, try comma-separated
                 file.seek(0)  # Reset file pointer
-                df = pd.read_csv(file, sep=',')
+                df = read_csv(file, sep=',')
         else:
             raise ValueError("Unsupported file format. Please upload CSV, Excel, or text file.")
         
@@ -53,10 +63,17 @@ def process_employee_file(file, company_id):
         except Company.DoesNotExist:
             raise ValueError(f"Company with ID {company_id} does not exist")
         
-        employees = []
-        errors = []
+        # Flag repeated or already registered keys before any insert
+        key_columns = [field for field in ('employee_id', 'email') if field in df.columns]
+        duplicates = find_duplicate_rows(
+            {field: df[field].tolist() for field in key_columns},
+            {field: ExistingKeys(Employee.objects.all(), field) for field in key_columns},
+        )
         
-        for index, row in df.iterrows():
+        def import_row(index, row, output):
+            if index in duplicates:
+                output['errors'].append({'row': index + 1, 'errors': duplicates[index]})
+                return
             try:
                 # Convert string lists to actual lists
                 department = row.get('department', '[]')
@@ -105,19 +122,22 @@ def process_employee_file(file, company_id):
                 serializer = EmployeeSerializer(data=employee_data)
                 if serializer.is_valid():
                     serializer.save()
-                    employees.append(serializer.data)
+                    output['employees'].append(serializer.data)
                 else:
-                    errors.append({
+                    output['errors'].append({
                         'row': index + 1,
                         'errors': serializer.errors
                     })
             except Exception as e:
-                errors.append({
+                output['errors'].append({
                     'row': index + 1,
                     'errors': str(e)
                 })
         
-        return employees, errors
+        output = import_chunks(
+            upload, df, import_row, ('employees', 'errors'), chunk_size=chunk_size, records=records
+        )
+        return output['employees'], output['errors']
     
     except Exception as e:
         # Handle any errors during file processing
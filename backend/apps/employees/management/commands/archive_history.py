@@ -0,0 +1,34 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.employees.models import EmployeeHistory
+
+
+class Command(BaseCommand):
+    help = 'Moves employee history rows that closed more than N years ago to the archive table'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--years', type=int, default=settings.HISTORY_ARCHIVE_AFTER_YEARS,
+                            help='Archive rows that ended more than this many years ago')
+        parser.add_argument('--batch-size', type=int, default=settings.HISTORY_ARCHIVE_BATCH_SIZE,
+                            help='Rows moved per transaction')
+        parser.add_argument('--dry-run', action='store_true', help='Only count the rows that would move')
+
+    def handle(self, *args, **options):
+        today = timezone.now().date()
+        try:
+            before = today.replace(year=today.year - options['years'])
+        except ValueError:
+            # 29 February
+            before = today.replace(year=today.year - options['years'], day=28) + timedelta(days=1)
+
+        if options['dry_run']:
+            count = EmployeeHistory.objects.filter(end_date__lt=before).count()
+            self.stdout.write(f'{count} history rows ended before {before} would be archived')
+            return
+
+        moved = EmployeeHistory.archive_closed(before, options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Archived {moved} history rows ended before {before}'))
@@ -0,0 +1,95 @@
+import random
+import time
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.core.management.base import BaseCommand
+from django.test.utils import CaptureQueriesContext
+
+from apps.companies.models import Company, Employee
+from apps.employees.models import EmployeeHistory
+from apps.employees.serializers import VerificationItemSerializer
+from apps.employees.verification import verify_batch
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Benchmarks batch employment verification throughput on synthetic data (rolled back afterwards)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--employees', type=int, default=20000, help='Synthetic employees to create')
+        parser.add_argument('--items', type=int, default=10000, help='Claims per batch')
+        parser.add_argument('--companies', type=int, default=50, help='Synthetic companies to create')
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self._run(options)
+                raise Rollback
+        except Rollback:
+            self.stdout.write('Synthetic data rolled back')
+
+    def _run(self, options):
+        rng = random.Random(7)
+        owner = get_user_model().objects.create(username='bench-verification', role='admin')
+        companies = Company.objects.bulk_create([
+            Company(
+                name=f'Bench Company {i}', registration_date=date(2000, 1, 1),
+                registration_number=f'BENCH-{i}', address='-', contact_person='-',
+                phone='-', email=f'bench{i}@example.com', created_by=owner,
+            )
+            for i in range(options['companies'])
+        ])
+        employees = Employee.objects.bulk_create([
+            Employee(
+                company=rng.choice(companies), name=f'Person {i}', employee_id=f'BENCH-E{i}',
+                email=f'person{i}@example.com', phone='-', position='Engineer',
+                date_of_birth=date(1960, 1, 1) + timedelta(days=rng.randrange(15000)),
+                gender='M', joining_date=date(2015, 1, 1), salary=1000,
+            )
+            for i in range(options['employees'])
+        ], batch_size=1000)
+        EmployeeHistory.objects.bulk_create([
+            EmployeeHistory(
+                employee=e, company_id=e.company_id, position='Engineer',
+                start_date=date(2010, 1, 1) + timedelta(days=rng.randrange(3000)),
+                end_date=None if rng.random() < 0.5 else date(2020, 1, 1),
+            )
+            for e in employees
+        ], batch_size=1000)
+
+        items = []
+        for _ in range(options['items']):
+            e = rng.choice(employees)
+            company = e.company_id if rng.random() < 0.8 else rng.choice(companies).id
+            claim = {'company_id': company, 'start_date': '2018-01-01', 'end_date': '2019-06-30'}
+            if rng.random() < 0.5:
+                claim['employee_id'] = e.employee_id
+            else:
+                claim.update(name=e.name, date_of_birth=e.date_of_birth.isoformat())
+            items.append(claim)
+
+        started = time.perf_counter()
+        serializer = VerificationItemSerializer(data=items, many=True)
+        serializer.is_valid(raise_exception=True)
+        validated = serializer.validated_data
+        validated_at = time.perf_counter()
+        with CaptureQueriesContext(connection) as queries:
+            results = verify_batch(validated)
+        finished = time.perf_counter()
+
+        counts = {}
+        for result in results:
+            counts[result['status']] = counts.get(result['status'], 0) + 1
+        total = finished - started
+        self.stdout.write(
+            f'{len(items)} claims against {len(employees)} employees: '
+            f'validation {(validated_at - started) * 1000:.0f} ms, '
+            f'verification {(finished - validated_at) * 1000:.0f} ms in {len(queries)} queries, '
+            f'{len(items) / total:,.0f} claims/s overall'
+        )
+        self.stdout.write(f'Results: {counts}')
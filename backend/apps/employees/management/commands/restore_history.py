@@ -0,0 +1,26 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from apps.employees.models import EmployeeHistoryArchive
+
+
+class Command(BaseCommand):
+    help = 'Moves archived employee history rows back into the live table'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--since', help='Only restore rows that ended on or after this date (YYYY-MM-DD)')
+        parser.add_argument('--employee', type=int, action='append', dest='employees',
+                            help='Only restore rows of this employee id (may be repeated)')
+        parser.add_argument('--batch-size', type=int, default=settings.HISTORY_ARCHIVE_BATCH_SIZE,
+                            help='Rows moved per transaction')
+
+    def handle(self, *args, **options):
+        since = None
+        if options['since']:
+            since = parse_date(options['since'])
+            if since is None:
+                raise CommandError('--since must be a YYYY-MM-DD date')
+
+        moved = EmployeeHistoryArchive.restore(since, options['employees'], options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Restored {moved} history rows'))
@@ -0,0 +1,61 @@
+# Generated by Django 5.0.2 on 2026-10-19 06:42
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0008_employee_email_index_employee_person_key'),
+        ('employees', '0003_alter_employeehistory_department'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmployeeHistoryArchive',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('position', models.CharField(max_length=100)),
+                ('start_date', models.DateField()),
+                ('end_date', models.DateField()),
+                ('duties', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('_encrypted_employee_id', models.BinaryField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Archived Employee History',
+                'verbose_name_plural': 'Archived Employee Histories',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='employeehistory',
+            index=models.Index(condition=models.Q(('end_date__isnull', True)), fields=['employee'], name='history_open_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='employeehistory',
+            index=models.Index(fields=['end_date'], name='history_end_date_idx'),
+        ),
+        migrations.AddField(
+            model_name='employeehistoryarchive',
+            name='company',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='companies.company'),
+        ),
+        migrations.AddField(
+            model_name='employeehistoryarchive',
+            name='department',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='companies.department'),
+        ),
+        migrations.AddField(
+            model_name='employeehistoryarchive',
+            name='employee',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_history', to='companies.employee'),
+        ),
+        migrations.AddIndex(
+            model_name='employeehistoryarchive',
+            index=models.Index(fields=['end_date'], name='history_archive_end_date_idx'),
+        ),
+    ]
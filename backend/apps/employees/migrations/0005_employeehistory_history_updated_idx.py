@@ -0,0 +1,18 @@
+# Generated by Django 5.0.2 on 2026-10-19 07:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0009_company_company_updated_idx_and_more'),
+        ('employees', '0004_employeehistoryarchive_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='employeehistory',
+            index=models.Index(fields=['updated_at', 'id'], name='history_updated_idx'),
+        ),
+    ]
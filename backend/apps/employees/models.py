@@ -2,13 +2,31 @@
 Models for the employees app.
 """
 
-from django.db import models
+from django.db import connection, models, transaction
+from django.db.models import Q
 from django.conf import settings
+from django.utils import timezone
 from apps.companies.models import Company, Department
 from apps.companies.models import Employee
+from apps.companies.search_cache import employee_search_cache
 from cryptography.fernet import Fernet
+from .signals import history_rows_changed
 import json
 
+
+def delete_rows(model, ids):
+    """
+    Delete rows of ``model`` by id with one plain DELETE: no cascade
+    collection and no signals, for rows moved between the history tables.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {connection.ops.quote_name(model._meta.db_table)} '
+            f'WHERE {connection.ops.quote_name(model._meta.pk.column)} IN ({", ".join(["%s"] * len(ids))})',
+            ids,
+        )
+
+
 class EmployeeHistory(models.Model):
     """
     Model representing an employee's assignment history (position, department, company, dates).
@@ -30,10 +48,31 @@ class EmployeeHistory(models.Model):
         verbose_name = 'Employee History'
         verbose_name_plural = 'Employee Histories'
         ordering = ['-created_at']
+        indexes = [
+            # Open assignments are what the hot paths look up
+            models.Index(fields=['employee'], condition=Q(end_date__isnull=True), name='history_open_idx'),
+            models.Index(fields=['end_date'], name='history_end_date_idx'),
+            # Change feed reads (apps.sync)
+            models.Index(fields=['updated_at', 'id'], name='history_updated_idx'),
+        ]
 
     def __str__(self):
         return f"{self.employee.name} - {self.company.name} ({self.position})"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the loaded assignment so changes can be rolled up on save
+        instance._loaded_assignment = instance.assignment if all(
+            f in instance.__dict__ for f in ('company_id', 'department_id', 'start_date', 'end_date')
+        ) else None
+        return instance
+
+    @property
+    def assignment(self):
+        """The (company_id, department_id, start_date, end_date) this row records."""
+        return (self.company_id, self.department_id, self.start_date, self.end_date)
+
     def save(self, *args, **kwargs):
         # Encrypt sensitive data before saving
         if not self._encrypted_employee_id:
@@ -44,6 +83,44 @@ class EmployeeHistory(models.Model):
         key = settings.ENCRYPTION_KEY.encode()
         return Fernet(key)
 
+    @classmethod
+    def bulk_create_encrypted(cls, histories, batch_size=None):
+        """
+        Insert many history rows with one ``bulk_create``.
+
+        ``save()`` is bypassed, so the employee_id is encrypted here, once
+        per employee and with a single Fernet instance.
+        """
+        f = Fernet(settings.ENCRYPTION_KEY.encode())
+        encrypted = {}
+        for history in histories:
+            if history._encrypted_employee_id or not history.employee.employee_id:
+                continue
+            employee_id = history.employee.employee_id
+            if employee_id not in encrypted:
+                encrypted[employee_id] = f.encrypt(employee_id.encode())
+            history._encrypted_employee_id = encrypted[employee_id]
+        histories = cls.objects.bulk_create(histories, batch_size=batch_size)
+        history_rows_changed.send(sender=cls, added=[h.assignment for h in histories], removed=[])
+        return histories
+
+    @classmethod
+    def close_current(cls, employees, end_date):
+        """
+        Set ``end_date`` on the open history rows of the given employees
+        with one bulk update.
+        """
+        histories = list(cls.objects.filter(employee__in=employees, end_date__isnull=True))
+        removed = [h.assignment for h in histories]
+        now = timezone.now()
+        for history in histories:
+            history.end_date = end_date
+            history.updated_at = now
+        # bulk_update skips auto_now; the change feed reads updated_at
+        cls.objects.bulk_update(histories, ['end_date', 'updated_at'])
+        history_rows_changed.send(sender=cls, added=[h.assignment for h in histories], removed=removed)
+        return histories
+
     def _encrypt_employee_id(self):
         if self.employee and self.employee.employee_id:
             f = self._get_fernet()
@@ -54,4 +131,94 @@ class EmployeeHistory(models.Model):
         if self._encrypted_employee_id:
             f = self._get_fernet()
             return f.decrypt(self._encrypted_employee_id).decode()
-        return None
\ No newline at end of file
+        return None
+
+    @classmethod
+    def archive_closed(cls, before, batch_size=1000):
+        """
+        Move rows that ended before ``before`` to ``EmployeeHistoryArchive``,
+        one transaction per batch. Returns the number of rows moved.
+
+        The rows are not deleted through the ORM: they still count towards
+        the analytics rollups, so the delete signals must not fire.
+        """
+        fields = [f.attname for f in cls._meta.concrete_fields]
+        moved = 0
+        while True:
+            with transaction.atomic():
+                rows = list(
+                    cls.objects.order_by('id').filter(end_date__lt=before).values(*fields)[:batch_size]
+                )
+                if not rows:
+                    return moved
+                EmployeeHistoryArchive.objects.bulk_create(
+                    [EmployeeHistoryArchive(**row) for row in rows], ignore_conflicts=True
+                )
+                delete_rows(cls, [row['id'] for row in rows])
+                # Neither write sends the signals that retire cached searches
+                employee_search_cache.invalidate()
+            moved += len(rows)
+
+
+class EmployeeHistoryArchive(models.Model):
+    """
+    Closed ``EmployeeHistory`` rows older than the archive window, moved out
+    of the live table by ``manage.py archive_history``. Rows keep their
+    original id so they can be moved back with ``restore_history``.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    company = models.ForeignKey(Company, on_delete=models.CASCADE, related_name='+')
+    department = models.ForeignKey('companies.Department', on_delete=models.CASCADE, blank=True, null=True, related_name='+')
+    employee = models.ForeignKey(Employee, on_delete=models.CASCADE, related_name='archived_history')
+    position = models.CharField(max_length=100)
+    start_date = models.DateField()
+    end_date = models.DateField()
+    duties = models.TextField(blank=True)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    _encrypted_employee_id = models.BinaryField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = 'Archived Employee History'
+        verbose_name_plural = 'Archived Employee Histories'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['end_date'], name='history_archive_end_date_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.employee.name} - {self.company.name} ({self.position}, archived)"
+
+    @property
+    def assignment(self):
+        """The (company_id, department_id, start_date, end_date) this row records."""
+        return (self.company_id, self.department_id, self.start_date, self.end_date)
+
+    @classmethod
+    def restore(cls, since=None, employees=None, batch_size=1000):
+        """
+        Move archived rows back into ``EmployeeHistory``: all of them, those
+        that ended on or after ``since``, or those of ``employees``.
+        Returns the number of rows moved.
+        """
+        queryset = cls.objects.order_by('id')
+        if since is not None:
+            queryset = queryset.filter(end_date__gte=since)
+        if employees is not None:
+            queryset = queryset.filter(employee__in=employees)
+        fields = [f.attname for f in EmployeeHistory._meta.concrete_fields]
+        moved = 0
+        while True:
+            with transaction.atomic():
+                rows = list(queryset.values(*fields)[:batch_size])
+                if not rows:
+                    return moved
+                # bulk_create sends no signals; the rows never left the rollups
+                EmployeeHistory.objects.bulk_create(
+                    [EmployeeHistory(**row) for row in rows], ignore_conflicts=True
+                )
+                delete_rows(cls, [row['id'] for row in rows])
+                employee_search_cache.invalidate()
+            moved += len(rows)
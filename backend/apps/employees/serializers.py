@@ -3,7 +3,8 @@ Serializers for the employees app.
 """
 
 from rest_framework import serializers
-from .models import Employee
+from apps.core.serializers import PartialListSerializer
+from .models import Employee, EmployeeHistory
 
 class EmployeeSerializer(serializers.ModelSerializer):
     """
@@ -12,4 +13,60 @@ class EmployeeSerializer(serializers.ModelSerializer):
     class Meta:
         model = Employee
         fields = '__all__'
-        read_only_fields = ('created_at', 'updated_at') 
\ No newline at end of file
+        read_only_fields = ('created_at', 'updated_at')
+
+class VerificationItemSerializer(serializers.Serializer):
+    """
+    One employment claim: who (employee_id, or name and date of birth),
+    where (company_id or company name) and, optionally, when.
+    """
+    employee_id = serializers.CharField(required=False)
+    name = serializers.CharField(required=False)
+    date_of_birth = serializers.DateField(required=False)
+    company_id = serializers.IntegerField(required=False)
+    company = serializers.CharField(required=False)
+    start_date = serializers.DateField(required=False)
+    end_date = serializers.DateField(required=False)
+
+    class Meta:
+        list_serializer_class = PartialListSerializer
+
+    def validate(self, attrs):
+        if not attrs.get('employee_id') and not (attrs.get('name') and attrs.get('date_of_birth')):
+            raise serializers.ValidationError('Provide employee_id, or name and date_of_birth.')
+        if attrs.get('company_id') is None and not attrs.get('company'):
+            raise serializers.ValidationError('Provide company_id or company.')
+        if attrs.get('start_date') and attrs.get('end_date') and attrs['start_date'] > attrs['end_date']:
+            raise serializers.ValidationError('start_date must not be after end_date.')
+        return attrs
+
+
+class CareerHistorySerializer(serializers.ModelSerializer):
+    """
+    One assignment in a person's career timeline.
+    """
+    company_name = serializers.CharField(source='company.name', read_only=True)
+    department_name = serializers.CharField(source='department.name', read_only=True)
+
+    class Meta:
+        model = EmployeeHistory
+        fields = ['company', 'company_name', 'department', 'department_name', 'position', 'start_date', 'end_date']
+
+
+class CareerEmploymentSerializer(serializers.ModelSerializer):
+    """
+    One employer's record of a person, with its assignment history.
+    """
+    company_name = serializers.CharField(source='company.name', read_only=True)
+    history = CareerHistorySerializer(many=True, read_only=True)
+
+    class Meta:
+        model = Employee
+        fields = ['id', 'employee_id', 'name', 'company', 'company_name', 'position', 'joining_date', 'is_active', 'history']
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        if self.context.get('include_archived'):
+            archived = CareerHistorySerializer(instance.archived_history.all(), many=True).data
+            data['history'] = sorted(data['history'] + archived, key=lambda h: h['start_date'], reverse=True)
+        return data
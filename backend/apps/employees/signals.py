@@ -0,0 +1,10 @@
+"""
+Signals for the employees app.
+"""
+
+from django.dispatch import Signal
+
+# Sent after history rows are written in bulk (bulk_create/bulk_update),
+# which bypasses the model save/delete signals. ``added`` and ``removed`` are
+# lists of (company_id, department_id, start_date, end_date) assignments.
+history_rows_changed = Signal()
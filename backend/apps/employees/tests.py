@@ -0,0 +1,227 @@
+"""
+Tests for the employees app.
+"""
+
+from datetime import date
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.companies.models import Company, Department, Employee
+from .models import EmployeeHistory, EmployeeHistoryArchive
+from .verification import UNVERIFIED, VERIFIED, verify_batch
+
+
+def create_company(name, registration_number, user):
+    return Company.objects.create(
+        name=name, registration_date=date(1990, 1, 1), registration_number=registration_number,
+        address='1 Main St', contact_person='Contact', phone='1', email='c@example.com', created_by=user,
+    )
+
+
+class ArchivedHistoryVerificationTests(TestCase):
+    """Verification must see history rows moved out by ``archive_closed``."""
+
+    @classmethod
+    def setUpTestData(cls):
+        admin = get_user_model().objects.create_user('admin', 'admin@example.com', 'pw12345!', role='admin')
+        cls.old_employer = create_company('Old Employer', 'R-A', admin)
+        cls.current_employer = create_company('Current Employer', 'R-B', admin)
+        old_department = Department.objects.create(name='Ops', company=cls.old_employer)
+        current_department = Department.objects.create(name='IT', company=cls.current_employer)
+
+        cls.employee = Employee.objects.create(
+            company=cls.current_employer, department=current_department, name='Old Hand',
+            employee_id='E-OLD', email='old@example.com', phone='123', date_of_birth=date(1970, 1, 1),
+            gender='M', joining_date=date(2000, 1, 1), salary='100.00', position='Clerk',
+        )
+        EmployeeHistory.objects.create(
+            employee=cls.employee, company=cls.old_employer, department=old_department,
+            position='Clerk', start_date=date(2000, 1, 1), end_date=date(2010, 1, 1),
+        )
+
+    def test_archived_assignment_still_verifies(self):
+        claim = {'employee_id': 'E-OLD', 'company_id': self.old_employer.id, 'start_date': date(2005, 1, 1)}
+        self.assertEqual(verify_batch([claim])[0]['status'], VERIFIED)
+
+        EmployeeHistory.archive_closed(date(2020, 1, 1))
+        self.assertFalse(EmployeeHistory.objects.filter(employee=self.employee).exists())
+        self.assertTrue(EmployeeHistoryArchive.objects.filter(employee=self.employee).exists())
+
+        result = verify_batch([claim])[0]
+        self.assertEqual(result['status'], VERIFIED)
+        self.assertEqual(result['end_date'], date(2010, 1, 1))
+
+    def test_archived_history_is_not_replaced_by_joining_date_fallback(self):
+        # Employed at the old employer in 2005, not at the current one
+        claim = {'employee_id': 'E-OLD', 'company_id': self.current_employer.id, 'start_date': date(2005, 1, 1)}
+        self.assertEqual(verify_batch([claim])[0]['status'], UNVERIFIED)
+
+        EmployeeHistory.archive_closed(date(2020, 1, 1))
+
+        result = verify_batch([claim])[0]
+        self.assertEqual(result['status'], UNVERIFIED)
+        self.assertEqual(result['reason'], 'no_employment_in_period')
+
+    def test_restore_moves_archived_rows_back(self):
+        self.assertEqual(EmployeeHistory.archive_closed(date(2020, 1, 1)), 1)
+        self.assertEqual(EmployeeHistoryArchive.restore(employees=[self.employee]), 1)
+
+        self.assertFalse(EmployeeHistoryArchive.objects.exists())
+        row = EmployeeHistory.objects.get(employee=self.employee)
+        self.assertEqual((row.company_id, row.end_date), (self.old_employer.id, date(2010, 1, 1)))
+
+
+class BatchEmployeeTests(TestCase):
+    """The batch create/update/delete endpoint of the companies API."""
+
+    url = '/api/companies/employees/batch/'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = get_user_model().objects.create_user('admin', 'admin@example.com', 'pw12345!', role='admin')
+        cls.acme = create_company('Acme', 'R-A', cls.admin)
+        cls.globex = create_company('Globex', 'R-B', cls.admin)
+        cls.it = Department.objects.create(name='IT', company=cls.acme)
+        cls.ops = Department.objects.create(name='Ops', company=cls.acme)
+        cls.sales = Department.objects.create(name='Sales', company=cls.globex)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def item(self, number, **fields):
+        item = {
+            'company': self.acme.id, 'department': self.it.id, 'name': f'Employee {number}',
+            'employee_id': f'E-{number}', 'email': f'e{number}@example.com', 'phone': '123',
+            'date_of_birth': '1990-01-01', 'gender': 'M', 'joining_date': '2020-01-01',
+            'salary': '100.00', 'position': 'Developer',
+        }
+        item.update(fields)
+        return item
+
+    def create(self, *items):
+        return self.client.post(self.url, list(items), format='json')
+
+    def statuses(self, response):
+        return [result['status'] for result in response.data['results']]
+
+    def test_create_reports_partial_success(self):
+        response = self.create(self.item(1), self.item(2, email='not an email'), self.item(3))
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.statuses(response), ['created', 'error', 'created'])
+        self.assertIn('email', response.data['results'][1]['errors'])
+        self.assertEqual(set(Employee.objects.values_list('employee_id', flat=True)), {'E-1', 'E-3'})
+        # The current job opens a history row for each created employee
+        self.assertEqual(EmployeeHistory.objects.filter(end_date__isnull=True).count(), 2)
+        self.acme.refresh_from_db()
+        self.assertEqual(self.acme.employee_count, 2)
+
+    def test_create_rejects_duplicates_within_the_batch(self):
+        response = self.create(
+            self.item(1), self.item(2, employee_id='E-1'), self.item(3, email='E1@EXAMPLE.COM'), self.item(4)
+        )
+
+        self.assertEqual(self.statuses(response), ['created', 'error', 'error', 'created'])
+        self.assertEqual(
+            response.data['results'][1]['errors'],
+            {'non_field_errors': ['Duplicate employee_id or email within the batch']},
+        )
+        self.assertEqual(Employee.objects.count(), 2)
+
+    def test_create_rejects_existing_keys(self):
+        self.create(self.item(1))
+        response = self.create(self.item(2, employee_id='E-1'))
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('employee_id', response.data['results'][0]['errors'])
+
+    def test_update_rejects_duplicates_within_the_batch(self):
+        self.create(self.item(1), self.item(2), self.item(3))
+        first, second, third = Employee.objects.order_by('employee_id').values_list('id', flat=True)
+
+        response = self.client.patch(self.url, [
+            {'id': first, 'email': 'same@example.com'},
+            {'id': second, 'email': 'SAME@example.com'},
+            {'id': third, 'name': 'Renamed'},
+            {'id': 0, 'name': 'Nobody'},
+        ], format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.statuses(response), ['updated', 'error', 'updated', 'not_found'])
+        self.assertEqual(Employee.objects.get(pk=second).email, 'e2@example.com')
+        self.assertEqual(Employee.objects.get(pk=third).name, 'Renamed')
+
+    def test_update_moves_open_new_history_rows(self):
+        self.create(self.item(1), self.item(2))
+        moved, stayed = Employee.objects.order_by('employee_id')
+
+        response = self.client.patch(self.url, [
+            {'id': moved.id, 'department': self.ops.id, 'position': 'Lead'},
+            {'id': stayed.id, 'name': 'Same Job'},
+        ], format='json')
+
+        self.assertEqual(self.statuses(response), ['updated', 'updated'])
+        today = timezone.now().date()
+        closed = EmployeeHistory.objects.get(employee=moved, end_date__isnull=False)
+        self.assertEqual((closed.department_id, closed.position, closed.end_date), (self.it.id, 'Developer', today))
+        current = EmployeeHistory.objects.get(employee=moved, end_date__isnull=True)
+        self.assertEqual((current.department_id, current.position, current.start_date), (self.ops.id, 'Lead', today))
+        self.assertEqual(EmployeeHistory.objects.filter(employee=stayed).count(), 1)
+
+    def test_update_refreshes_employee_counts_after_a_company_change(self):
+        self.create(self.item(1), self.item(2))
+        employee = Employee.objects.get(employee_id='E-1')
+
+        self.client.patch(self.url, [
+            {'id': employee.id, 'company': self.globex.id, 'department': self.sales.id},
+        ], format='json')
+
+        self.acme.refresh_from_db()
+        self.globex.refresh_from_db()
+        self.assertEqual((self.acme.employee_count, self.globex.employee_count), (1, 1))
+        current = EmployeeHistory.objects.get(employee=employee, end_date__isnull=True)
+        self.assertEqual(current.company_id, self.globex.id)
+
+    def test_refresh_employee_counts_only_touches_changed_companies(self):
+        self.create(self.item(1))
+        Employee.objects.filter(employee_id='E-1').update(company=self.globex)
+        before = dict(Company.objects.values_list('id', 'updated_at'))
+
+        Company.refresh_employee_counts([self.acme.id, self.globex.id])
+
+        self.acme.refresh_from_db()
+        self.globex.refresh_from_db()
+        self.assertEqual((self.acme.employee_count, self.globex.employee_count), (0, 1))
+        self.assertNotEqual(self.acme.updated_at, before[self.acme.id])
+        self.assertNotEqual(self.globex.updated_at, before[self.globex.id])
+
+        # Nothing differs now: the counts are read and nothing is written
+        before = dict(Company.objects.values_list('id', 'updated_at'))
+        with self.assertNumQueries(1):
+            Company.refresh_employee_counts([self.acme.id, self.globex.id])
+        self.assertEqual(dict(Company.objects.values_list('id', 'updated_at')), before)
+
+    def test_integrity_error_rejects_the_whole_batch(self):
+        with mock.patch.object(Company, 'refresh_employee_counts', side_effect=IntegrityError('conflict')):
+            response = self.create(self.item(1), self.item(2))
+
+        self.assertEqual(response.status_code, 409)
+        self.assertFalse(Employee.objects.exists())
+        self.assertFalse(EmployeeHistory.objects.exists())
+
+    def test_delete_reports_missing_ids(self):
+        self.create(self.item(1), self.item(2))
+        first = Employee.objects.get(employee_id='E-1')
+
+        response = self.client.delete(self.url, {'ids': [first.id, 0]}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.statuses(response), ['deleted', 'not_found'])
+        self.acme.refresh_from_db()
+        self.assertEqual(self.acme.employee_count, 1)
@@ -0,0 +1,180 @@
+"""
+Batch employment verification.
+
+A batch of (identity, company, period) claims is resolved with a handful of
+set-based queries: one pass over the companies, the candidate employees and
+their history, each chunked to stay under the database's parameter limit.
+Everything else happens in memory, so the query count depends on the batch
+size divided by the chunk size, never on the number of items.
+"""
+
+from collections import defaultdict
+
+from django.db.models.functions import Lower
+
+from apps.companies.models import Company, Employee
+from apps.core.identity import person_key
+from .models import EmployeeHistory, EmployeeHistoryArchive
+
+VERIFIED = 'verified'
+UNVERIFIED = 'unverified'
+AMBIGUOUS = 'ambiguous'
+
+CHUNK_SIZE = 900
+
+
+def _chunks(values, size=CHUNK_SIZE):
+    values = list(values)
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def normalize_name(name):
+    return ' '.join(str(name).split()).casefold()
+
+
+def _covers(assigned_from, assigned_to, start_date, end_date):
+    """Whether an assignment (``assigned_to`` None if current) spans the claimed period."""
+    if start_date and assigned_from > start_date:
+        return False
+    if end_date and assigned_from > end_date:
+        return False
+    last_day = end_date or start_date
+    if last_day and assigned_to is not None and assigned_to < last_day:
+        return False
+    return True
+
+
+def _resolve_companies(items):
+    """
+    Map each item's company (id or name) to a set of company ids.
+
+    The lowered-name index finds the candidates; they are then matched on
+    ``normalize_name`` of their stored name, the same normalization applied
+    to the claim, rather than on the database's ``LOWER()``, which neither
+    collapses whitespace nor case-folds as Python does.
+    """
+    names = {item['company'] for item in items if item.get('company')}
+    lookups = set()
+    for name in names:
+        lookups.update((name.strip().lower(), ' '.join(name.split()).lower(), normalize_name(name)))
+    ids_by_name = defaultdict(set)
+    for chunk in _chunks(lookups):
+        rows = Company.objects.annotate(lname=Lower('name')).filter(lname__in=chunk).values_list('name', 'id')
+        for name, company_id in rows:
+            ids_by_name[normalize_name(name)].add(company_id)
+    resolved = []
+    for item in items:
+        if item.get('company_id') is not None:
+            resolved.append({item['company_id']})
+        else:
+            resolved.append(ids_by_name.get(normalize_name(item['company']), set()))
+    return resolved
+
+
+def _load_candidates(items):
+    """
+    Load employees matching the items by employee_id or by name + date of
+    birth. The latter are looked up by their ``person_key``, so only the
+    employees with that exact (normalized) name and birth date are read, from
+    the index.
+    """
+    fields = ('id', 'employee_id', 'name', 'date_of_birth', 'company_id', 'joining_date', 'is_active', 'person_key')
+    by_employee_id = {}
+    by_identity = defaultdict(list)
+
+    employee_ids = {item['employee_id'] for item in items if item.get('employee_id')}
+    for chunk in _chunks(employee_ids):
+        for row in Employee.objects.order_by().filter(employee_id__in=chunk).values(*fields):
+            by_employee_id[row['employee_id']] = row
+
+    keys = {person_key(item['name'], item['date_of_birth']) for item in items if not item.get('employee_id')}
+    keys.discard('')
+    for chunk in _chunks(keys):
+        for row in Employee.objects.order_by().filter(person_key__in=chunk).values(*fields):
+            by_identity[row['person_key']].append(row)
+
+    return by_employee_id, by_identity
+
+
+def _load_assignments(employees):
+    """
+    Map employee pk -> list of (company_id, start_date, end_date, position),
+    from the live history and its archive of long closed rows.
+    """
+    assignments = defaultdict(list)
+    for model in (EmployeeHistory, EmployeeHistoryArchive):
+        for chunk in _chunks(employees):
+            rows = model.objects.order_by().filter(employee_id__in=chunk).values_list(
+                'employee_id', 'company_id', 'start_date', 'end_date', 'position'
+            )
+            for employee_pk, company_id, start_date, end_date, position in rows:
+                assignments[employee_pk].append((company_id, start_date, end_date, position))
+    # Employees without any history still count as employed since joining
+    for employee in employees.values():
+        if not assignments[employee['id']] and employee['is_active']:
+            assignments[employee['id']].append(
+                (employee['company_id'], employee['joining_date'], None, None)
+            )
+    return assignments
+
+
+def verify_batch(items):
+    """
+    Verify a batch of employment claims.
+
+    Each item is a dict with either ``employee_id`` or ``name`` and
+    ``date_of_birth``, a ``company_id`` or ``company`` name, and optional
+    ``start_date``/``end_date`` for the claimed period. Returns one result
+    dict per item, in order.
+    """
+    companies = _resolve_companies(items)
+    by_employee_id, by_identity = _load_candidates(items)
+
+    employees = dict((row['id'], row) for row in by_employee_id.values())
+    for rows in by_identity.values():
+        employees.update((row['id'], row) for row in rows)
+    assignments = _load_assignments(employees)
+
+    results = []
+    for index, (item, company_ids) in enumerate(zip(items, companies)):
+        if item.get('employee_id'):
+            candidate = by_employee_id.get(item['employee_id'])
+            candidates = [candidate] if candidate else []
+        else:
+            candidates = by_identity.get(person_key(item['name'], item['date_of_birth']), [])
+
+        if not candidates:
+            results.append({'index': index, 'status': UNVERIFIED, 'reason': 'no_matching_employee'})
+            continue
+        if not company_ids:
+            results.append({'index': index, 'status': UNVERIFIED, 'reason': 'unknown_company'})
+            continue
+
+        matches = []
+        for candidate in candidates:
+            for company_id, start_date, end_date, position in assignments[candidate['id']]:
+                if company_id in company_ids and _covers(
+                    start_date, end_date, item.get('start_date'), item.get('end_date')
+                ):
+                    matches.append((candidate, company_id, start_date, end_date, position))
+                    break
+
+        if not matches:
+            results.append({'index': index, 'status': UNVERIFIED, 'reason': 'no_employment_in_period'})
+        elif len(matches) > 1:
+            results.append({
+                'index': index, 'status': AMBIGUOUS,
+                'candidates': [match[0]['employee_id'] for match in matches],
+            })
+        else:
+            candidate, company_id, start_date, end_date, position = matches[0]
+            results.append({
+                'index': index, 'status': VERIFIED,
+                'employee_id': candidate['employee_id'],
+                'company_id': company_id,
+                'position': position,
+                'start_date': start_date,
+                'end_date': end_date,
+            })
+    return results
@@ -2,17 +2,26 @@
 Views for the employees app.
 """
 
+from django.conf import settings
 from rest_framework import viewsets, status
+from rest_framework.views import APIView
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.parsers import MultiPartParser, JSONParser
 from rest_framework.permissions import IsAuthenticated
-from django.db.models import Q
-from .models import Employee
-from .serializers import EmployeeSerializer
+from django.db.models import Prefetch, Q
+from django.utils.dateparse import parse_date
+from apps.core.identity import blind_index, person_key
+from apps.core.permissions import IsAdminOrCompanyUser
+from apps.core.bulk_imports import begin_upload, complete_upload, fail_upload, record_loader
+from apps.core.uploads import SpooledUploadMixin
+from apps.core.throttling import SearchThrottle, UploadThrottle, VerificationThrottle
+from .models import Employee, EmployeeHistory, EmployeeHistoryArchive
+from .serializers import EmployeeSerializer, VerificationItemSerializer, CareerEmploymentSerializer
 from .bulk_upload.processor import process_employee_file
+from .verification import verify_batch
 
-class EmployeeViewSet(viewsets.ModelViewSet):
+class EmployeeViewSet(SpooledUploadMixin, viewsets.ModelViewSet):
     """
     ViewSet for viewing and editing employee data.
     """
@@ -32,12 +41,12 @@ class EmployeeViewSet(viewsets.ModelViewSet):
         if user.is_admin:
             return Employee.objects.all()
         elif user.is_company_user:
-            return Employee.objects.filter(company=user.company)
+            return Employee.objects.filter(company_id=user.company_id)
         else:
             # Regular users can only search, handled in search action
             return Employee.objects.none()
     
-    @action(detail=False, methods=['post', 'patch'])
+    @action(detail=False, methods=['post', 'patch'], throttle_classes=[UploadThrottle])
     def bulk_upload(self, request):
         """
         Handle bulk upload of employee data.
@@ -55,22 +64,41 @@ class EmployeeViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        company_id = request.user.company.id if request.user.is_company_user else request.data.get('company')
+        company_id = request.user.company_id if request.user.is_company_user else request.data.get('company')
         if not company_id:
             return Response(
                 {"error": "Company ID is required"},
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        employees, errors = process_employee_file(file, company_id)
-        
-        return Response({
+        allow_duplicate = str(request.data.get('allow_duplicate', '')).lower() in ('1', 'true', 'yes')
+        load_employees = record_loader(
+            self.get_queryset(), lambda employees: self.get_serializer(employees, many=True).data
+        )
+        upload, response = begin_upload(
+            request, 'employees', file, scope=str(company_id), allow_duplicate=allow_duplicate,
+            records={'created': load_employees},
+        )
+        if response is not None:
+            return response
+
+        employees, errors = process_employee_file(
+            file, company_id, upload, records={'employees': load_employees}
+        )
+        result = {
             "message": f"Processed {len(employees)} employees",
             "created": employees,
             "errors": errors
-        })
+        }
+        # Row 0 errors mean the file itself could not be read
+        if any(error['row'] == 0 for error in errors):
+            fail_upload(upload, errors[0]['errors'])
+        else:
+            complete_upload(upload, result, {'created': load_employees})
+        
+        return Response({**result, "upload": upload.progress()})
     
-    @action(detail=False, methods=['get'])
+    @action(detail=False, methods=['get'], throttle_classes=[SearchThrottle])
     def search(self, request):
         """
         Search employees based on various criteria.
@@ -107,7 +135,7 @@ class EmployeeViewSet(viewsets.ModelViewSet):
         # Apply role-based filtering
         user = request.user
         if user.is_company_user:
-            queryset = queryset.filter(company=user.company)
+            queryset = queryset.filter(company_id=user.company_id)
         elif not user.is_admin:
             # Regular users can only see basic public info
             queryset = queryset.filter(
@@ -116,4 +144,91 @@ class EmployeeViewSet(viewsets.ModelViewSet):
         
         # Serialize and return results
         serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data) 
\ No newline at end of file
+        return Response(serializer.data)
+
+    @action(detail=False, methods=['get'], throttle_classes=[VerificationThrottle], permission_classes=[IsAdminOrCompanyUser])
+    def career(self, request):
+        """
+        Full career of one person across employers, identified by
+        ``employee_id`` (any of their records), ``email`` or ``name`` plus
+        ``date_of_birth``. Employee rows are linked to the records found
+        through ``person_key`` (same name and birth date) or ``email_index``
+        (same email), one step out. Company users only see the careers of
+        people their company has a record of.
+        ``?include_archived=true`` adds the archived (long closed) history.
+        """
+        params = request.query_params
+        if params.get('employee_id'):
+            found = Employee.objects.filter(employee_id=params['employee_id'])
+        elif params.get('email'):
+            found = Employee.objects.filter(email_index=blind_index(params['email']))
+        elif params.get('name') and params.get('date_of_birth'):
+            date_of_birth = parse_date(params['date_of_birth'])
+            if date_of_birth is None:
+                return Response({'error': 'date_of_birth must be YYYY-MM-DD'}, status=status.HTTP_400_BAD_REQUEST)
+            found = Employee.objects.filter(person_key=person_key(params['name'], date_of_birth))
+        else:
+            return Response(
+                {'error': 'Provide employee_id, email, or name and date_of_birth'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        identities = list(found.order_by().values_list('person_key', 'email_index'))
+        person_keys = {key for key, _ in identities if key}
+        email_indexes = {index for _, index in identities if index}
+
+        include_archived = params.get('include_archived', '').lower() in ('1', 'true', 'yes')
+        prefetches = [Prefetch('history', queryset=EmployeeHistory.objects.select_related('company', 'department').order_by('-start_date'))]
+        if include_archived:
+            prefetches.append(Prefetch(
+                'archived_history',
+                queryset=EmployeeHistoryArchive.objects.select_related('company', 'department').order_by('-start_date')
+            ))
+        employments = list(
+            Employee.objects.filter(Q(person_key__in=person_keys) | Q(email_index__in=email_indexes))
+            .select_related('company')
+            .prefetch_related(*prefetches)
+            .order_by('-joining_date')
+        ) if identities else []
+
+        user = request.user
+        if not user.is_admin and not any(employment.company_id == user.company_id for employment in employments):
+            return Response({'error': 'No employee record of your company matches'}, status=status.HTTP_404_NOT_FOUND)
+        serializer = CareerEmploymentSerializer(employments, many=True, context={'include_archived': include_archived})
+        return Response(serializer.data)
+
+
+class BatchVerificationView(APIView):
+    """
+    Verify many employment claims in one request.
+
+    Accepts ``{"items": [...]}`` (or a bare list) of claims and returns one
+    verified/unverified/ambiguous result per item, in order. Open to admins
+    and company users (employers checking candidates), not to employees.
+    """
+    permission_classes = [IsAdminOrCompanyUser]
+    throttle_classes = [VerificationThrottle]
+
+    def post(self, request):
+        items = request.data.get('items') if isinstance(request.data, dict) else request.data
+        if not isinstance(items, list) or not items:
+            return Response({'error': 'Expected a non-empty list of items'}, status=status.HTTP_400_BAD_REQUEST)
+        limit = settings.VERIFICATION_BATCH_MAX_SIZE
+        if len(items) > limit:
+            return Response({'error': f'Batch of {len(items)} exceeds the limit of {limit} items'}, status=status.HTTP_400_BAD_REQUEST)
+
+        serializer = VerificationItemSerializer(data=items, many=True)
+        results = [None] * len(items)
+        if not serializer.is_valid():
+            for index, errors in enumerate(serializer.errors):
+                if errors:
+                    results[index] = {'index': index, 'status': 'invalid', 'errors': errors}
+        valid = sorted(serializer.valid_items)
+        for index, result in zip(valid, verify_batch([serializer.valid_items[i] for i in valid])):
+            result['index'] = index
+            results[index] = result
+
+        counts = {}
+        for result in results:
+            counts[result['status']] = counts.get(result['status'], 0) + 1
+        return Response({'summary': counts, 'results': results})
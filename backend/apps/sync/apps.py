@@ -0,0 +1,14 @@
+"""
+App configuration for the sync app.
+"""
+
+from django.apps import AppConfig
+
+
+class SyncConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.sync'
+    label = 'sync'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,127 @@
+"""
+Incremental change feed.
+
+A resource's rows are read in ``(updated_at, id)`` order from the
+``*_updated_idx`` indexes and its deletes in ``(deleted_at, id)`` order from
+the tombstones, each after the position stored in an opaque cursor. A sync
+therefore reads only what changed since the previous one.
+
+Only changes older than ``SYNC_FEED_SETTLE_SECONDS`` are returned:
+``updated_at`` is set before the write commits, so a row from a transaction
+still in progress could otherwise appear behind a cursor that has already
+moved past it. Tombstones are kept for ``SYNC_TOMBSTONE_RETENTION_DAYS``;
+cursors older than that can no longer see every delete and are refused.
+"""
+
+import base64
+import binascii
+import json
+from collections import namedtuple
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from apps.companies.models import Company, Employee
+from apps.employees.models import EmployeeHistory
+from .models import Tombstone
+from .serializers import CompanyChangeSerializer, EmployeeChangeSerializer, EmployeeHistoryChangeSerializer
+
+# resource: (model, serializer, prefetches)
+FEEDS = {
+    'companies': (Company, CompanyChangeSerializer, ('department',)),
+    'employees': (Employee, EmployeeChangeSerializer, ()),
+    'histories': (EmployeeHistory, EmployeeHistoryChangeSerializer, ()),
+}
+
+# Past every id: a position at the settle horizon once a stream is caught up
+MAX_ID = 2 ** 63 - 1
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+class CursorExpired(InvalidCursor):
+    pass
+
+
+class Cursor(namedtuple('Cursor', 'resource updated_at updated_id deleted_at deleted_id')):
+    """Positions in the change and tombstone streams of one resource."""
+
+    def encode(self):
+        position = [
+            self.resource,
+            self.updated_at.isoformat() if self.updated_at else None, self.updated_id,
+            self.deleted_at.isoformat(), self.deleted_id,
+        ]
+        return base64.urlsafe_b64encode(json.dumps(position, separators=(',', ':')).encode()).decode().rstrip('=')
+
+    @classmethod
+    def decode(cls, token):
+        try:
+            resource, updated_at, updated_id, deleted_at, deleted_id = json.loads(
+                base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+            )
+            cursor = cls(
+                resource, parse_datetime(updated_at) if updated_at else None, int(updated_id),
+                parse_datetime(deleted_at), int(deleted_id),
+            )
+        except (binascii.Error, TypeError, ValueError):
+            raise InvalidCursor('Malformed cursor')
+        if cursor.deleted_at is None:
+            raise InvalidCursor('Malformed cursor')
+        return cursor
+
+
+def _after(queryset, field, at, pk):
+    if at is None:
+        return queryset
+    # (field, id) > (at, pk), written so the range scan on the index serves
+    # both the filter and the ordering
+    return queryset.filter(Q(**{f'{field}__gte': at}) & (Q(**{f'{field}__gt': at}) | Q(id__gt=pk)))
+
+
+def _page(queryset, limit):
+    rows = list(queryset[:limit + 1])
+    return rows[:limit], len(rows) > limit
+
+
+def read_changes(resource, token=None, limit=None):
+    """
+    The next page of changes of ``resource`` after the cursor ``token`` (the
+    beginning if None): ``{'changed': [...], 'deleted': [...], 'cursor':
+    next token, 'has_more': bool}``. ``changed`` holds model instances and
+    ``deleted`` tombstones.
+    """
+    model, _, prefetches = FEEDS[resource]
+    limit = limit or settings.SYNC_FEED_PAGE_SIZE
+    now = timezone.now()
+    horizon = now - timedelta(seconds=settings.SYNC_FEED_SETTLE_SECONDS)
+
+    if token:
+        cursor = Cursor.decode(token)
+        if cursor.resource != resource:
+            raise InvalidCursor(f'Cursor belongs to the {cursor.resource} feed')
+        if cursor.deleted_at < now - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS):
+            raise CursorExpired('Cursor expired; start again without a cursor')
+    else:
+        # A first sync copies every row, so earlier deletes do not matter
+        cursor = Cursor(resource, None, 0, horizon, MAX_ID)
+
+    changes = model.objects.filter(updated_at__lte=horizon).order_by('updated_at', 'id').prefetch_related(*prefetches)
+    changed, more_changed = _page(_after(changes, 'updated_at', cursor.updated_at, cursor.updated_id), limit)
+    deletes = Tombstone.objects.filter(model=model._meta.label_lower, deleted_at__lte=horizon).order_by('deleted_at', 'id')
+    deleted, more_deleted = _page(_after(deletes, 'deleted_at', cursor.deleted_at, cursor.deleted_id), limit)
+
+    # A caught-up stream continues from the horizon
+    updated_at, updated_id = (changed[-1].updated_at, changed[-1].id) if more_changed else (horizon, MAX_ID)
+    deleted_at, deleted_id = (deleted[-1].deleted_at, deleted[-1].id) if more_deleted else (horizon, MAX_ID)
+    return {
+        'changed': changed,
+        'deleted': deleted,
+        'cursor': Cursor(resource, updated_at, updated_id, deleted_at, deleted_id).encode(),
+        'has_more': more_changed or more_deleted,
+    }
@@ -0,0 +1,20 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.sync.models import Tombstone
+
+
+class Command(BaseCommand):
+    help = 'Deletes change feed tombstones older than the retention period'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=settings.SYNC_TOMBSTONE_RETENTION_DAYS,
+                            help='Keep tombstones of the last this many days')
+
+    def handle(self, *args, **options):
+        before = timezone.now() - timedelta(days=options['days'])
+        deleted, _ = Tombstone.objects.filter(deleted_at__lt=before).delete()
+        self.stdout.write(f'Deleted {deleted} tombstones older than {before:%Y-%m-%d %H:%M}')
@@ -0,0 +1,29 @@
+# Generated by Django 5.0.2 on 2026-10-19 07:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model', models.CharField(max_length=100)),
+                ('object_id', models.BigIntegerField()),
+                ('deleted_at', models.DateTimeField()),
+            ],
+            options={
+                'verbose_name': 'Tombstone',
+                'verbose_name_plural': 'Tombstones',
+                'ordering': ['deleted_at', 'id'],
+                'indexes': [models.Index(fields=['model', 'deleted_at', 'id'], name='tombstone_feed_idx')],
+            },
+        ),
+    ]
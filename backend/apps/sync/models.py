@@ -0,0 +1,27 @@
+"""
+Models for the sync app.
+"""
+
+from django.db import models
+
+
+class Tombstone(models.Model):
+    """
+    Record of a deleted row, kept so the change feed can report the delete.
+    Written by the ``post_delete`` handlers in ``signals.py``.
+    """
+    model = models.CharField(max_length=100)  # app_label.model_name
+    object_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField()
+
+    class Meta:
+        verbose_name = 'Tombstone'
+        verbose_name_plural = 'Tombstones'
+        ordering = ['deleted_at', 'id']
+        indexes = [
+            # The change feed reads one model's deletes after a cursor
+            models.Index(fields=['model', 'deleted_at', 'id'], name='tombstone_feed_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.model}#{self.object_id} deleted at {self.deleted_at:%Y-%m-%d %H:%M:%S}"
@@ -0,0 +1,53 @@
+"""
+Serializers for the sync app.
+"""
+
+from rest_framework import serializers
+
+from apps.companies.api.serializers import DepartmentNamesField
+from apps.companies.models import Company, Employee
+from apps.employees.models import EmployeeHistory
+from .models import Tombstone
+
+
+class CompanyChangeSerializer(serializers.ModelSerializer):
+    """A changed company, with its department names."""
+    departments = DepartmentNamesField(read_only=True)
+
+    class Meta:
+        model = Company
+        fields = [
+            'id', 'name', 'registration_date', 'registration_number', 'address', 'contact_person',
+            'phone', 'email', 'employee_count', 'departments', 'created_by', 'created_at', 'updated_at'
+        ]
+
+
+class EmployeeChangeSerializer(serializers.ModelSerializer):
+    """A changed employee (plain columns only, not the encrypted copies)."""
+
+    class Meta:
+        model = Employee
+        fields = [
+            'id', 'company', 'department', 'name', 'employee_id', 'email', 'phone', 'position',
+            'date_of_birth', 'gender', 'joining_date', 'salary', 'is_active', 'created_at', 'updated_at'
+        ]
+
+
+class EmployeeHistoryChangeSerializer(serializers.ModelSerializer):
+    """A changed employee history row."""
+
+    class Meta:
+        model = EmployeeHistory
+        fields = [
+            'id', 'employee', 'company', 'department', 'position', 'start_date', 'end_date', 'duties',
+            'created_at', 'updated_at'
+        ]
+
+
+class TombstoneSerializer(serializers.ModelSerializer):
+    """A deleted row: its id and when it was deleted."""
+    id = serializers.IntegerField(source='object_id')
+
+    class Meta:
+        model = Tombstone
+        fields = ['id', 'deleted_at']
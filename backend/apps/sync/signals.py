@@ -0,0 +1,21 @@
+"""
+Signal handlers recording tombstones for the change feed.
+
+Queryset deletes send ``post_delete`` for every row as long as a receiver is
+connected, so cascades and batch deletes are covered too.
+"""
+
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from apps.companies.models import Company, Employee
+from apps.employees.models import EmployeeHistory
+from .models import Tombstone
+
+
+@receiver(post_delete, sender=Company)
+@receiver(post_delete, sender=Employee)
+@receiver(post_delete, sender=EmployeeHistory)
+def record_tombstone(sender, instance, **kwargs):
+    Tombstone.objects.create(model=sender._meta.label_lower, object_id=instance.pk, deleted_at=timezone.now())
@@ -0,0 +1,12 @@
+"""
+URL patterns for the sync app.
+"""
+
+from django.urls import path
+from .views import ChangeFeedView
+
+app_name = 'sync'
+
+urlpatterns = [
+    path('changes/<str:resource>/', ChangeFeedView.as_view(), name='changes'),
+]
@@ -0,0 +1,49 @@
+"""
+Views for the sync app.
+"""
+
+from django.conf import settings
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from apps.companies.api.permissions import IsAdminRole
+from .feed import FEEDS, CursorExpired, InvalidCursor, read_changes
+from .serializers import TombstoneSerializer
+
+
+class ChangeFeedView(APIView):
+    """
+    Rows of ``companies``, ``employees`` or ``histories`` created, updated or
+    deleted since ``?cursor=`` (everything when omitted), oldest first, at
+    most ``?limit=`` of each. Pass the returned ``cursor`` to the next call;
+    ``has_more`` says whether to call again right away.
+    """
+    permission_classes = [IsAdminRole]
+
+    def get(self, request, resource):
+        if resource not in FEEDS:
+            return Response(
+                {'error': f'Unknown resource; expected one of {", ".join(FEEDS)}'}, status=status.HTTP_404_NOT_FOUND
+            )
+        limit = request.query_params.get('limit', '')
+        if limit and (not limit.isdigit() or not 0 < int(limit) <= settings.SYNC_FEED_MAX_PAGE_SIZE):
+            return Response(
+                {'error': f'limit must be between 1 and {settings.SYNC_FEED_MAX_PAGE_SIZE}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            page = read_changes(resource, request.query_params.get('cursor'), int(limit) if limit else None)
+        except CursorExpired as e:
+            return Response({'error': str(e)}, status=status.HTTP_410_GONE)
+        except InvalidCursor as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        serializer_class = FEEDS[resource][1]
+        return Response({
+            'changed': serializer_class(page['changed'], many=True).data,
+            'deleted': TombstoneSerializer(page['deleted'], many=True).data,
+            'cursor': page['cursor'],
+            'has_more': page['has_more'],
+        })
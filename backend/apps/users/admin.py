@@ -4,15 +4,23 @@ Admin configuration for the users app.
 
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
+from apps.core.admin import EstimatedCountPaginator, chunked_update
+from .authentication import revocation_cache
 from .models import User
 
 class CustomUserAdmin(UserAdmin):
     """Admin configuration for the custom User model."""
     
     list_display = ('username', 'email', 'role', 'company', 'is_active', 'date_joined')
-    list_filter = ('role', 'is_active', 'company')
+    list_select_related = ('company',)
+    # Only companies that have users, not the whole company table
+    list_filter = ('role', 'is_active', ('company', admin.RelatedOnlyFieldListFilter))
     search_fields = ('username', 'email', 'company__name')
     ordering = ('-date_joined',)
+    autocomplete_fields = ('company',)
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
+    actions = ['deactivate_users']
     
     fieldsets = (
         (None, {'fields': ('username', 'password')}),
@@ -29,4 +37,14 @@ class CustomUserAdmin(UserAdmin):
         }),
     )
 
+    @admin.action(description='Deactivate selected users')
+    def deactivate_users(self, request, queryset):
+        def revoke(pks):
+            # update() sends no post_save, so revoke this process's cached status here
+            for pk in pks:
+                revocation_cache.revoke(pk)
+
+        updated = chunked_update(queryset.filter(is_active=True), on_chunk=revoke, is_active=False)
+        self.message_user(request, f'Deactivated {updated} users.')
+
 admin.site.register(User, CustomUserAdmin) 
\ No newline at end of file
@@ -0,0 +1,14 @@
+"""
+App configuration for the users app.
+"""
+
+from django.apps import AppConfig
+
+
+class UsersConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.users'
+    label = 'users'
+
+    def ready(self):
+        from . import signals  # noqa: F401
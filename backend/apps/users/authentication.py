@@ -0,0 +1,194 @@
+"""
+Stateless JWT authentication for Talent Verify.
+
+Access tokens issued by the login view carry the user's role and company_id,
+so authenticated requests can be served without loading the ``User`` row.
+Deactivated or deleted users, and tokens whose role or company no longer match
+the account, are caught through a small, bounded TTL cache of each user's
+current claims that is refreshed at most once per TTL per user.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+# Token claims that authorize requests; a token must match the account on all
+CLAIM_FIELDS = ('role', 'company_id', 'is_staff', 'is_superuser')
+
+# Cached claims of an inactive or deleted user
+REVOKED = ()
+
+
+def account_claims(user):
+    """The ``CLAIM_FIELDS`` values of ``user``, or ``REVOKED`` if inactive."""
+    if not user.is_active:
+        return REVOKED
+    return tuple(getattr(user, name) for name in CLAIM_FIELDS)
+
+
+class ClaimsUser(TokenUser):
+    """
+    Lightweight authenticated user backed by the claims of a validated token.
+
+    Exposes the same role helpers as ``apps.users.models.User`` so views and
+    permission classes can use either interchangeably.
+    """
+
+    def __str__(self):
+        return self.username
+
+    @cached_property
+    def role(self):
+        return self.token.get('role', 'employee')
+
+    @cached_property
+    def company_id(self):
+        return self.token.get('company_id')
+
+    @cached_property
+    def company(self):
+        """Load the company lazily; only views that need the full row pay for it."""
+        if self.company_id is None:
+            return None
+        from apps.companies.models import Company
+        return Company.objects.filter(pk=self.company_id).first()
+
+    @property
+    def is_admin(self):
+        """Check if user is an admin"""
+        return self.role == 'admin'
+
+    @property
+    def is_company_user(self):
+        """Check if user is a company user"""
+        return self.role == 'company'
+
+    @property
+    def is_employee(self):
+        """Check if user is an employee"""
+        return self.role == 'employee'
+
+    def get_instance(self):
+        """Return the backing ``User`` model instance (one query)."""
+        return get_user_model().objects.select_related('company').get(pk=self.id)
+
+
+class RevocationCache:
+    """
+    Bounded, thread-safe LRU cache of ``user_id -> claims`` with a TTL.
+
+    The claims are the user's current ``CLAIM_FIELDS`` values, or ``REVOKED``
+    for an inactive or deleted user. Entries are refreshed from the database
+    once they expire, so a user deactivated, demoted or moved to another
+    company in another process is rejected within ``ttl`` seconds. Local
+    changes are applied immediately through the ``User`` signals.
+    """
+
+    def __init__(self, maxsize=10000, ttl=60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            claims, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return claims
+
+    def set(self, user_id, claims):
+        with self._lock:
+            self._entries[user_id] = (claims, time.monotonic() + self.ttl)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def revoke(self, user_id):
+        self.set(user_id, REVOKED)
+
+    def discard(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def claims(self, user_id):
+        """Return the cached claims of the user, hitting the database on a miss."""
+        claims = self.get(user_id)
+        if claims is None:
+            claims = get_user_model().objects.filter(pk=user_id, is_active=True).values_list(*CLAIM_FIELDS).first()
+            claims = REVOKED if claims is None else tuple(claims)
+            self.set(user_id, claims)
+        return claims
+
+    def is_active(self, user_id):
+        return self.claims(user_id) != REVOKED
+
+
+revocation_cache = RevocationCache(
+    maxsize=getattr(settings, 'AUTH_REVOCATION_CACHE_SIZE', 10000),
+    ttl=getattr(settings, 'AUTH_REVOCATION_CACHE_TTL', 60),
+)
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    Authenticate from token claims instead of loading the user row.
+
+    Tokens issued before role/company claims were added fall back to the
+    regular database lookup so existing sessions keep working.
+    """
+
+    def get_user(self, validated_token):
+        if 'role' not in validated_token:
+            return super().get_user(validated_token)
+
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        claims = revocation_cache.claims(user_id)
+        if claims == REVOKED:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        # A role or company change invalidates tokens issued before it
+        if claims != tuple(validated_token.get(name) for name in CLAIM_FIELDS):
+            raise AuthenticationFailed(_("Token claims are out of date"), code="token_claims_stale")
+
+        return api_settings.TOKEN_USER_CLASS(validated_token)
+
+
+class ClaimsRefreshToken(RefreshToken):
+    """
+    Refresh token whose access tokens carry the user's current claims rather
+    than those copied from login, so a refresh after a role or company change
+    yields a token that is accepted again.
+    """
+
+    @property
+    def access_token(self):
+        access = super().access_token
+        claims = revocation_cache.claims(self[api_settings.USER_ID_CLAIM])
+        if claims == REVOKED:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        for name, value in zip(CLAIM_FIELDS, claims):
+            access[name] = value
+        return access
@@ -0,0 +1,82 @@
+import time
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.companies.models import Company
+from apps.users.serializers import UserSerializer
+from apps.users.views import UserList
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Benchmarks the user listing endpoint on synthetic users (rolled back afterwards)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 5000],
+                            help='Numbers of synthetic users to list')
+        parser.add_argument('--companies', type=int, default=50, help='Synthetic companies to create')
+        parser.add_argument('--page-size', type=int, default=100, help='Page size requested')
+
+    def handle(self, *args, **options):
+        for size in options['sizes']:
+            try:
+                with transaction.atomic():
+                    self._run(size, options)
+                    raise Rollback
+            except Rollback:
+                pass
+        self.stdout.write('Synthetic data rolled back')
+
+    def _run(self, size, options):
+        User = get_user_model()
+        admin = User.objects.create(username='bench-users-admin', role='admin')
+        companies = Company.objects.bulk_create([
+            Company(
+                name=f'Bench Company {i}', registration_date=date(2000, 1, 1),
+                registration_number=f'BENCH-U-{i}', address='-', contact_person='-',
+                phone='-', email=f'bench{i}@example.com', created_by=admin,
+            )
+            for i in range(options['companies'])
+        ])
+        User.objects.bulk_create([
+            User(username=f'bench-user-{i}', email=f'user{i}@example.com', role='company',
+                 company=companies[i % len(companies)])
+            for i in range(size)
+        ], batch_size=1000)
+
+        factory = APIRequestFactory()
+        view = UserList.as_view()
+        pages = 0
+        url = f'/api/users/all/?page_size={options["page_size"]}'
+        started = time.perf_counter()
+        with CaptureQueriesContext(connection) as queries:
+            while url:
+                request = factory.get(url)
+                force_authenticate(request, user=admin)
+                response = view(request)
+                response.render()
+                pages += 1
+                url = response.data['next']
+                if pages == 1:
+                    first_page_queries = len(queries)
+        elapsed = time.perf_counter() - started
+
+        # The previous full representation, for comparison (one company query per user)
+        full_started = time.perf_counter()
+        with CaptureQueriesContext(connection) as full_queries:
+            UserSerializer(User.objects.all()[:options['page_size']], many=True).data
+        full_elapsed = time.perf_counter() - full_started
+
+        self.stdout.write(
+            f'{size + 1} users: first page {first_page_queries} queries, '
+            f'{pages} pages in {len(queries)} queries, {elapsed * 1000:.0f} ms total; '
+            f'full serializer: {len(full_queries)} queries for one page, {full_elapsed * 1000:.0f} ms'
+        )
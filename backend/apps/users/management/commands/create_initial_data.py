@@ -36,7 +36,6 @@ class Command(BaseCommand):
                     'registration_number': 'TV123456',
                     'address': '123 Tech Street, Innovation City',
                     'contact_person': 'John Doe',
-                    'department': ['HR', 'IT', 'Finance'],
                     'employee_count': 50,
                     'phone': '+1234567890',
                     'email': 'contact@talentverify.com',
@@ -44,6 +43,7 @@ class Command(BaseCommand):
                 }
             )
             if company_created:
+                company.add_departments(['HR', 'IT', 'Finance'])
                 self.stdout.write(self.style.SUCCESS(f'Company created: {company.name}'))
             else:
                 self.stdout.write(self.style.SUCCESS(f'Company already exists: {company.name}'))
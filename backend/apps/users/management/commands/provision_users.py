@@ -0,0 +1,52 @@
+import csv
+import json
+import os
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.users.provisioning import provision_users
+from apps.users.serializers import UserProvisionSerializer
+
+
+class Command(BaseCommand):
+    help = ('Creates users in bulk from a CSV or JSON file (columns: username, email, password, role, '
+            'company_id or company_registration_number, is_staff, is_superuser)')
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV file with a header row, or a JSON array of objects')
+        parser.add_argument('--workers', type=int, help='Password hashing processes (default: USER_PROVISION_HASH_WORKERS, or all cores)')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        try:
+            with open(path, newline='', encoding='utf-8') as f:
+                if path.lower().endswith('.json'):
+                    items = json.load(f)
+                else:
+                    # Empty cells mean "not given", not an empty value
+                    items = [{k: v for k, v in row.items() if v not in ('', None)} for row in csv.DictReader(f)]
+        except (OSError, ValueError) as e:
+            raise CommandError(f'Could not read {path}: {e}')
+        if not isinstance(items, list) or not items:
+            raise CommandError('The file contains no users')
+
+        started = time.perf_counter()
+        serializer = UserProvisionSerializer(data=items, many=True)
+        if not serializer.is_valid():
+            for index, errors in enumerate(serializer.errors):
+                if errors:
+                    self.stderr.write(f'Row {index + 1}: {errors}')
+        valid = sorted(serializer.valid_items)
+        workers = options['workers'] or settings.USER_PROVISION_HASH_WORKERS or os.cpu_count()
+        results = provision_users([serializer.valid_items[index] for index in valid], workers)
+        elapsed = time.perf_counter() - started
+
+        for index, result in zip(valid, results):
+            if result['status'] != 'created':
+                self.stderr.write(f'Row {index + 1}: {result["errors"]}')
+        created = sum(1 for result in results if result['status'] == 'created')
+        self.stdout.write(self.style.SUCCESS(
+            f'Created {created} of {len(items)} users in {elapsed:.1f} s'
+        ))
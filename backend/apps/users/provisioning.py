@@ -0,0 +1,117 @@
+"""
+Bulk user provisioning.
+
+Password hashing (PBKDF2 by default) dominates the cost of creating users.
+The ``provision_users`` management command therefore computes the hashes of a
+batch in a process pool across all cores; the API endpoint hashes in its own
+process, so a web worker never forks a pool. The users are then inserted with
+one ``bulk_create``, linked to their companies, in a single transaction.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+
+from apps.companies.models import Company
+
+
+def _init_worker(settings_module):
+    # Forked workers inherit configured settings; spawned ones set them up here.
+    if not settings.configured:
+        if settings_module:
+            os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+        import django
+        django.setup()
+
+
+def hash_passwords(passwords, workers=1):
+    """
+    Hash ``passwords`` with the default hasher, in a pool of ``workers``
+    processes for batches of at least ``USER_PROVISION_PARALLEL_MIN``.
+    """
+    passwords = list(passwords)
+    workers = min(workers or 1, len(passwords))
+    if workers <= 1 or len(passwords) < settings.USER_PROVISION_PARALLEL_MIN:
+        return [make_password(password) for password in passwords]
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(os.environ.get('DJANGO_SETTINGS_MODULE'),),
+    ) as pool:
+        return list(pool.map(make_password, passwords, chunksize=max(1, len(passwords) // (workers * 4))))
+
+
+def _resolve_companies(items):
+    """Map each item to a Company (or None), loading all of them in two queries."""
+    ids = {item['company_id'] for item in items if item.get('company_id') is not None}
+    numbers = {item['company_registration_number'] for item in items if item.get('company_registration_number')}
+    by_id = Company.objects.only('id').in_bulk(ids) if ids else {}
+    by_number = (
+        Company.objects.only('id', 'registration_number').in_bulk(numbers, field_name='registration_number')
+        if numbers else {}
+    )
+    resolved = []
+    for item in items:
+        if item.get('company_id') is not None:
+            resolved.append(by_id.get(item['company_id'], False))
+        elif item.get('company_registration_number'):
+            resolved.append(by_number.get(item['company_registration_number'], False))
+        else:
+            resolved.append(None)
+    return resolved
+
+
+def provision_users(items, workers=1):
+    """
+    Create many users at once.
+
+    Each item is a validated dict with ``username``, ``email``, ``password``,
+    ``role``, optional ``is_staff``/``is_superuser`` and an optional company
+    given by ``company_id`` or ``company_registration_number``. Passwords are
+    hashed in a pool of ``workers`` processes (see ``hash_passwords``).
+    Returns one result dict per item, in order.
+    """
+    User = get_user_model()
+    results = [None] * len(items)
+    companies = _resolve_companies(items)
+    taken = set(
+        User.objects.filter(username__in={item['username'] for item in items})
+        .values_list('username', flat=True)
+    )
+
+    accepted = []
+    for index, (item, company) in enumerate(zip(items, companies)):
+        if company is False:
+            results[index] = {'index': index, 'status': 'error', 'errors': {'company': ['Unknown company']}}
+        elif item['username'] in taken:
+            results[index] = {'index': index, 'status': 'error', 'errors': {'username': ['Username already exists']}}
+        else:
+            taken.add(item['username'])
+            accepted.append(index)
+
+    hashes = hash_passwords([items[index]['password'] for index in accepted], workers)
+    users = [
+        User(
+            username=items[index]['username'],
+            email=items[index].get('email', ''),
+            role=items[index]['role'],
+            company=companies[index],
+            is_staff=items[index].get('is_staff', False),
+            is_superuser=items[index].get('is_superuser', False),
+            password=password,
+        )
+        for index, password in zip(accepted, hashes)
+    ]
+    with transaction.atomic():
+        users = User.objects.bulk_create(users, batch_size=1000)
+
+    for index, user in zip(accepted, users):
+        results[index] = {
+            'index': index, 'status': 'created', 'id': user.pk,
+            'username': user.username, 'company_id': user.company_id,
+        }
+    return results
@@ -5,16 +5,34 @@ Serializers for the users app.
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
 from django.contrib.auth.password_validation import validate_password
+from django.core.exceptions import ValidationError as DjangoValidationError
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
 from apps.companies.models import Company
+from apps.core.serializers import PartialListSerializer
+from apps.core.fieldsets import SparseFieldsMixin
+from .authentication import ClaimsRefreshToken
 
 User = get_user_model()
 
-class CompanySerializer(serializers.ModelSerializer):
+class CompanySerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Company
         fields = '__all__'
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSummarySerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    """
+    Compact representation for user listings: the company is reduced to its
+    id and name, read from a ``select_related('company')`` join.
+    """
+    company_name = serializers.CharField(source='company.name', read_only=True, default=None)
+
+    class Meta:
+        model = User
+        fields = ['id', 'username', 'email', 'role', 'company_id', 'company_name', 'is_active', 'date_joined']
+        read_only_fields = fields
+        expandable_fields = {'company': (CompanySerializer, {'fields': ['id', 'name', 'registration_number']})}
+
+class UserSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     company = CompanySerializer(read_only=True)
     company_id = serializers.PrimaryKeyRelatedField(
         queryset=Company.objects.all(),
@@ -40,6 +58,7 @@ class UserSerializer(serializers.ModelSerializer):
             'password'
         ]
         read_only_fields = ['id', 'date_joined', 'last_login']
+        extra_kwargs = {'password': {'write_only': True}}
 
     def validate_role(self, value):
         if value not in ['admin', 'company', 'employee']:
@@ -112,4 +131,59 @@ class UserCreateSerializer(serializers.ModelSerializer):
         user = User.objects.create(**validated_data)
         user.set_password(password)
         user.save()
-        return user 
\ No newline at end of file
+        return user
+
+
+class UserProvisionSerializer(serializers.Serializer):
+    """
+    One user in a bulk provisioning request. The company is given by id or
+    by registration number; both are resolved in bulk by the view.
+    """
+    username = serializers.CharField(max_length=150)
+    email = serializers.EmailField(required=False, allow_blank=True)
+    password = serializers.CharField(write_only=True)
+    role = serializers.ChoiceField(choices=[choice for choice, _ in User.ROLE_CHOICES])
+    company_id = serializers.IntegerField(required=False)
+    company_registration_number = serializers.CharField(required=False)
+    is_staff = serializers.BooleanField(required=False, default=False)
+    is_superuser = serializers.BooleanField(required=False, default=False)
+
+    class Meta:
+        list_serializer_class = PartialListSerializer
+
+    def validate_username(self, value):
+        User.username_validator(value)
+        return value
+
+    def validate(self, attrs):
+        if attrs['role'] == 'company' and attrs.get('company_id') is None and not attrs.get('company_registration_number'):
+            raise serializers.ValidationError({'company_id': 'Company is required for company users.'})
+        try:
+            validate_password(attrs['password'], User(username=attrs['username'], email=attrs.get('email', '')))
+        except DjangoValidationError as e:
+            raise serializers.ValidationError({'password': list(e.messages)})
+        return attrs
+
+
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """
+    Issue token pairs that carry the claims needed to authorize requests
+    without a database lookup (see ``apps.users.authentication``).
+    """
+
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        token['username'] = user.username
+        token['role'] = user.role
+        token['company_id'] = user.company_id
+        token['is_staff'] = user.is_staff
+        token['is_superuser'] = user.is_superuser
+        return token
+
+
+class ClaimsTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Refresh access tokens with the user's current claims.
+    """
+    token_class = ClaimsRefreshToken
@@ -0,0 +1,20 @@
+"""
+Signal handlers for the users app.
+"""
+
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .authentication import account_claims, revocation_cache
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def update_revocation_cache(sender, instance, **kwargs):
+    """Apply account status and claim changes to the local revocation cache immediately."""
+    revocation_cache.set(instance.pk, account_claims(instance))
+
+
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def revoke_deleted_user(sender, instance, **kwargs):
+    revocation_cache.revoke(instance.pk)
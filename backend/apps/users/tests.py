@@ -0,0 +1,104 @@
+"""
+Tests for the users app.
+"""
+
+from datetime import date
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from apps.companies.models import Company
+from .authentication import revocation_cache
+
+User = get_user_model()
+
+
+class ClaimsAuthenticationTests(TestCase):
+    """Token-claim authentication against account changes and revocation."""
+
+    password = 'pw12345!'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user('admin', 'admin@example.com', cls.password, role='admin')
+        cls.company = cls._company('Acme', 'R-A')
+        cls.other_company = cls._company('Globex', 'R-B')
+        cls.user = User.objects.create_user(
+            'staff', 'staff@example.com', cls.password, role='company', company=cls.company
+        )
+
+    @classmethod
+    def _company(cls, name, registration_number):
+        return Company.objects.create(
+            name=name, registration_date=date(2000, 1, 1), registration_number=registration_number,
+            address='1 Main St', contact_person='Contact', phone='1', email='c@example.com', created_by=cls.admin,
+        )
+
+    def setUp(self):
+        revocation_cache.clear()
+        self.client = APIClient()
+        response = self.client.post(
+            '/api/users/login/', {'username': 'staff', 'password': self.password}, format='json'
+        )
+        self.access, self.refresh = response.data['access'], response.data['refresh']
+
+    def profile(self, access=None):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {access or self.access}')
+        return self.client.get('/api/users/me/')
+
+    def refreshed(self):
+        self.client.credentials()
+        return self.client.post('/api/users/token/refresh/', {'refresh': self.refresh}, format='json')
+
+    def test_role_and_company_change_take_effect_after_refresh(self):
+        self.assertEqual(self.profile().status_code, 200)
+
+        self.user.role = 'employee'
+        self.user.company = self.other_company
+        self.user.save()
+
+        # Tokens issued before the change no longer authorize anything
+        response = self.profile()
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.data['code'], 'token_claims_stale')
+
+        response = self.refreshed()
+        self.assertEqual(response.status_code, 200)
+        response = self.profile(response.data['access'])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['role'], 'employee')
+        self.assertEqual(response.data['company']['id'], self.other_company.id)
+
+    def test_deactivated_user_is_rejected(self):
+        self.user.is_active = False
+        self.user.save()
+
+        response = self.profile()
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.data['code'], 'user_inactive')
+        self.assertEqual(self.refreshed().status_code, 401)
+
+    def test_revoked_token_is_refused_across_the_ttl(self):
+        now = revocation_cache.ttl * 10
+        with mock.patch('apps.users.authentication.time.monotonic', return_value=now):
+            self.assertEqual(self.profile().status_code, 200)
+            # What the admin deactivation action does: a bulk update, then a revoke
+            User.objects.filter(pk=self.user.pk).update(is_active=False)
+            revocation_cache.revoke(self.user.pk)
+            self.assertEqual(self.profile().status_code, 401)
+        # Past the TTL the entry is reloaded from the database: still refused
+        with mock.patch('apps.users.authentication.time.monotonic', return_value=now + revocation_cache.ttl + 1):
+            self.assertEqual(self.profile().status_code, 401)
+            self.assertEqual(self.refreshed().status_code, 401)
+
+    def test_other_process_deactivation_applies_once_the_ttl_expires(self):
+        now = revocation_cache.ttl * 10
+        with mock.patch('apps.users.authentication.time.monotonic', return_value=now):
+            self.assertEqual(self.profile().status_code, 200)
+            User.objects.filter(pk=self.user.pk).update(is_active=False)
+            # Served from the cached claims until they expire
+            self.assertEqual(self.profile().status_code, 200)
+        with mock.patch('apps.users.authentication.time.monotonic', return_value=now + revocation_cache.ttl + 1):
+            self.assertEqual(self.profile().status_code, 401)
@@ -3,9 +3,8 @@ URL patterns for the users app.
 """
 
 from django.urls import path
-from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from ..users import views
-from .views import UserList, UserDetailView, UserRegisterView, UserProfileView
+from .views import UserList, UserDetailView, UserRegisterView, UserProfileView, LoginView, ClaimsTokenRefreshView
 from backend.settings import LOGGING
 import logging
 
@@ -18,8 +17,9 @@ try:
         urlpatterns = [
             path('all/',UserList.as_view() ),
             path('register/', views.UserRegisterView.as_view(), name='register'),
-            path('login/', TokenObtainPairView.as_view(), name='login'),
-            path('token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+            path('provision/', views.UserProvisionView.as_view(), name='provision'),
+            path('login/', LoginView.as_view(), name='login'),
+            path('token/refresh/', ClaimsTokenRefreshView.as_view(), name='token_refresh'),
             path('me/', views.UserProfileView.as_view(), name='profile'),
             path('<int:pk>/', UserDetailView.as_view(), name='user-detail'),
         ] 
@@ -3,13 +3,37 @@ Views for the users app.
 """
 
 from rest_framework import generics, permissions, status
+from rest_framework.pagination import CursorPagination
 from rest_framework.response import Response
+from rest_framework.views import APIView
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from .serializers import UserSerializer, UserCreateSerializer
+from django.db import IntegrityError
+from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
+from apps.companies.api.permissions import IsAdminRole
+from apps.core.permissions import IsAdminOrCompanyUser
+from apps.core.fieldsets import SparseQuerysetMixin
+from .provisioning import provision_users
+from .serializers import (
+    UserSerializer, UserSummarySerializer, UserCreateSerializer, UserProvisionSerializer,
+    ClaimsTokenObtainPairSerializer, ClaimsTokenRefreshSerializer
+)
 
 
 User = get_user_model()
 
+class LoginView(TokenObtainPairView):
+    """
+    Obtain a token pair carrying role and company claims.
+    """
+    serializer_class = ClaimsTokenObtainPairSerializer
+
+class ClaimsTokenRefreshView(TokenRefreshView):
+    """
+    Refresh an access token with the user's current role and company claims.
+    """
+    serializer_class = ClaimsTokenRefreshSerializer
+
 class UserRegisterView(generics.CreateAPIView):
     """
     View for user registration.
@@ -26,13 +50,80 @@ class UserProfileView(generics.RetrieveUpdateAPIView):
     permission_classes = [permissions.IsAuthenticated]
     
     def get_object(self):
-        return self.request.user 
+        user = self.request.user
+        # Stateless token users carry claims only; the profile needs the row.
+        if hasattr(user, 'get_instance'):
+            return user.get_instance()
+        return user
 
-class UserList(generics.ListAPIView):
-    queryset = User.objects.all()
-    serializer_class = UserSerializer
+class UserListPagination(CursorPagination):
+    """Keyset pagination on the primary key, newest users first."""
+    ordering = '-id'
+    page_size = 100
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
 
-class UserDetailView(generics.RetrieveUpdateDestroyAPIView):
-    queryset = User.objects.all()
+class UserList(SparseQuerysetMixin, generics.ListAPIView):
+    """
+    Compact, paginated user listing. Admins see every user, company users
+    only the users of their company.
+    """
+    serializer_class = UserSummarySerializer
+    permission_classes = [IsAdminOrCompanyUser]
+    pagination_class = UserListPagination
+
+    def get_queryset(self):
+        queryset = User.objects.select_related('company').only(
+            'id', 'username', 'email', 'role', 'is_active', 'date_joined', 'company__id', 'company__name'
+        )
+        user = self.request.user
+        if user.role != 'admin':
+            if not user.company_id:
+                return queryset.none()
+            queryset = queryset.filter(company_id=user.company_id)
+        return queryset
+
+class UserDetailView(SparseQuerysetMixin, generics.RetrieveUpdateDestroyAPIView):
+    queryset = User.objects.select_related('company')
     serializer_class = UserSerializer
-    permission_classes = [permissions.IsAuthenticated]
\ No newline at end of file
+    permission_classes = [permissions.IsAuthenticated]
+
+class UserProvisionView(APIView):
+    """
+    Create many users in one request (admins only).
+
+    Accepts ``{"users": [...]}`` or a bare list. Passwords are hashed in this
+    process (``manage.py provision_users`` hashes large files in parallel)
+    and the users inserted with one ``bulk_create``; the response carries one
+    result per submitted user.
+    """
+    permission_classes = [IsAdminRole]
+
+    def post(self, request):
+        items = request.data.get('users') if isinstance(request.data, dict) else request.data
+        if not isinstance(items, list) or not items:
+            return Response({'error': 'Expected a non-empty list of users'}, status=status.HTTP_400_BAD_REQUEST)
+        limit = settings.USER_PROVISION_MAX_SIZE
+        if len(items) > limit:
+            return Response({'error': f'Batch of {len(items)} exceeds the limit of {limit} users'}, status=status.HTTP_400_BAD_REQUEST)
+
+        serializer = UserProvisionSerializer(data=items, many=True)
+        results = [None] * len(items)
+        if not serializer.is_valid():
+            for index, errors in enumerate(serializer.errors):
+                if errors:
+                    results[index] = {'index': index, 'status': 'error', 'errors': errors}
+        valid = sorted(serializer.valid_items)
+        try:
+            provisioned = provision_users([serializer.valid_items[index] for index in valid])
+        except IntegrityError as e:
+            return Response({'error': f'Provisioning conflicted with a concurrent write: {e}'}, status=status.HTTP_409_CONFLICT)
+        for index, result in zip(valid, provisioned):
+            result['index'] = index
+            results[index] = result
+
+        created = sum(1 for result in results if result['status'] == 'created')
+        return Response({
+            'message': f'Successfully created {created} of {len(results)} users',
+            'results': results,
+        }, status=status.HTTP_201_CREATED if created else status.HTTP_400_BAD_REQUEST)
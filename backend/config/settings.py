@@ -15,6 +15,11 @@ SECRET_KEY = 'django-insecure-your-secret-key-here'
 # Encryption key for sensitive data (base64-encoded 32-byte key)
 ENCRYPTION_KEY = 'mcNUxz_9z7aNOg8MrN3rSAmufvZ_GKfp1doWsIhLddc='
 
+# Key for the person identity hashes and email blind index (apps.core.identity),
+# kept apart from SECRET_KEY so either can be rotated alone. After changing it,
+# run `manage.py rebuild_identity_keys`.
+IDENTITY_HASH_KEY = 'identity-insecure-4f7c2b9e81d34a6f9c0e5d2a7b8f1c36'
+
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = True
 
@@ -38,15 +43,20 @@ INSTALLED_APPS = [
     'apps.companies',
     'apps.employees',
     'apps.core',
+    'apps.analytics',
+    'apps.audit',
+    'apps.sync',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'apps.core.middleware.ThresholdGZipMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'apps.audit.middleware.AuditActorMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -86,6 +96,9 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Persistent connections: the SQLite PRAGMAs below run once per connection
+        'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', 600)),
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
@@ -128,13 +141,19 @@ AUTH_USER_MODEL = 'users.User'
 # REST Framework settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'apps.users.authentication.ClaimsJWTAuthentication',
         'rest_framework.authentication.SessionAuthentication',
         'rest_framework.authentication.BasicAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    # orjson-backed JSON by default, MessagePack on request (Accept or ?format=)
+    'DEFAULT_RENDERER_CLASSES': [
+        'apps.core.renderers.FastJSONRenderer',
+        'apps.core.renderers.MessagePackRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
 }
 
 # JWT settings
@@ -159,5 +178,151 @@ SIMPLE_JWT = {
 
     'AUTH_TOKEN_CLASSES': ('rest_framework_simplejwt.tokens.AccessToken',),
     'TOKEN_TYPE_CLAIM': 'token_type',
-    'TOKEN_USER_CLASS': 'rest_framework_simplejwt.models.TokenUser',
-} 
\ No newline at end of file
+    'TOKEN_USER_CLASS': 'apps.users.authentication.ClaimsUser',
+}
+
+# Stateless auth: how long (seconds) and for how many users account status is
+# cached before it is re-checked against the database.
+AUTH_REVOCATION_CACHE_TTL = 60
+AUTH_REVOCATION_CACHE_SIZE = 10000
+
+# Maximum number of employees accepted by one batch create/update/delete call.
+EMPLOYEE_BATCH_MAX_SIZE = 1000
+
+# Department/company autocomplete: seconds before the in-process prefix index
+# is rebuilt, and the table size above which lookups go to the database.
+AUTOCOMPLETE_CACHE_TTL = 300
+AUTOCOMPLETE_INDEX_MAX_ENTRIES = 200000
+
+# Maximum number of claims accepted by one batch verification request.
+VERIFICATION_BATCH_MAX_SIZE = 20000
+
+# Bulk upload duplicate detection: up to DIRECT_LOOKUP_LIMIT distinct keys are
+# checked with IN queries; above that all existing keys are loaded into a set,
+# or into a Bloom filter once the table has more than SET_MAX_KEYS rows.
+BULK_UPLOAD_DEDUP_DIRECT_LOOKUP_LIMIT = 5000
+BULK_UPLOAD_DEDUP_SET_MAX_KEYS = 1000000
+
+# Fuzzy company matching: minimum score for an upload row to be held back as a
+# possible duplicate, seconds before the per-process index is rebuilt, size of
+# that index before falling back to database candidates, and blocks larger
+# than this are skipped when possible.
+COMPANY_MATCH_THRESHOLD = 0.8
+COMPANY_MATCH_CACHE_TTL = 300
+COMPANY_MATCH_INDEX_MAX_ENTRIES = 200000
+COMPANY_MATCH_MAX_BLOCK_SIZE = 1000
+
+# Audit log: events are buffered in-process and written in batches of up to
+# AUDIT_LOG_BATCH_SIZE by a background thread every AUDIT_LOG_FLUSH_INTERVAL
+# seconds. Set AUDIT_LOG_ASYNC = False to write them on commit instead.
+AUDIT_LOG_ASYNC = True
+AUDIT_LOG_BATCH_SIZE = 500
+AUDIT_LOG_FLUSH_INTERVAL = 2.0
+AUDIT_LOG_MAX_BUFFER = 50000
+
+# History archival: closed EmployeeHistory rows that ended more than this many
+# years ago are moved to EmployeeHistoryArchive by `manage.py archive_history`.
+HISTORY_ARCHIVE_AFTER_YEARS = 5
+HISTORY_ARCHIVE_BATCH_SIZE = 1000
+
+# Rows updated per transaction by the admin bulk actions.
+ADMIN_ACTION_CHUNK_SIZE = 1000
+
+# Bulk user provisioning: maximum users per API request (hashed in the web
+# worker), and for `manage.py provision_users` password hashing in a process
+# pool of USER_PROVISION_HASH_WORKERS processes (None = all cores) for batches
+# of at least USER_PROVISION_PARALLEL_MIN users.
+USER_PROVISION_MAX_SIZE = 100
+USER_PROVISION_HASH_WORKERS = None
+USER_PROVISION_PARALLEL_MIN = 8
+
+# Startup budget checked by `manage.py bench_startup --check`: total import
+# time of django.setup() plus URL resolution, and modules that must only be
+# imported on first use (by the bulk upload code).
+STARTUP_IMPORT_BUDGET_MS = 600
+STARTUP_LAZY_MODULES = ('pandas', 'numpy', 'openpyxl')
+
+# Bulk upload spooling: request bodies above UPLOAD_SPOOL_THRESHOLD bytes are
+# streamed into UPLOAD_SPOOL_DIR and parsed from a memory map; every upload is
+# SHA-256 hashed while it arrives. A spooled file is deleted when its request
+# finishes; files left by a crashed worker are removed once older than
+# UPLOAD_SPOOL_MAX_AGE seconds, checked at most every CLEANUP_INTERVAL.
+UPLOAD_SPOOL_DIR = os.path.join(BASE_DIR, 'var', 'uploads')
+UPLOAD_SPOOL_THRESHOLD = 2621440
+UPLOAD_SPOOL_MAX_AGE = 3600
+UPLOAD_SPOOL_CLEANUP_INTERVAL = 600
+
+# Bulk imports: rows committed per transaction, rows per savepoint within it
+# (a batch with a failing row is redone one savepoint per row), seconds
+# without progress after which an unfinished import may be taken over, and
+# days a finished import is kept for replays (`manage.py prune_bulk_uploads`).
+BULK_UPLOAD_CHUNK_SIZE = 1000
+BULK_UPLOAD_SAVEPOINT_BATCH = 50
+BULK_UPLOAD_STALE_AFTER = 300
+BULK_UPLOAD_RETENTION_DAYS = 30
+
+# SQLite tuning applied to every new connection (apps.core.db). The profile
+# is picked per deployment with the SQLITE_PROFILE environment variable; the
+# 'default' profile leaves SQLite as it is. Entries are PRAGMAs (negative
+# cache_size is in KiB, mmap_size in bytes, busy_timeout in ms).
+SQLITE_PROFILES = {
+    'default': {},
+    'development': {
+        'journal_mode': 'WAL',
+        'busy_timeout': 5000,
+    },
+    'production': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -65536,
+        'mmap_size': 268435456,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 10000,
+    },
+}
+SQLITE_PROFILE = os.environ.get('SQLITE_PROFILE', 'default')
+
+# Responses of at least this many bytes are gzip-compressed for clients that
+# accept it (apps.core.middleware.ThresholdGZipMiddleware).
+RESPONSE_GZIP_MIN_SIZE = 1024
+
+# Caches. 'shared' is file based on local disk, so that every worker process
+# on the host sees the same entries; it holds the employee search generation.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'shared': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.path.join(BASE_DIR, 'var', 'cache'),
+        'OPTIONS': {'MAX_ENTRIES': 1000},
+    },
+}
+
+# Token-bucket throttles (apps.core.throttling): per scope, a bucket per user
+# and one shared by the users of a company, as 'requests/period'. A bucket
+# holds that many requests and refills at that rate. Buckets and throttle
+# metrics are kept in the SQLite file THROTTLE_DATABASE; buckets idle long
+# enough to be full again are deleted at most every CLEANUP_INTERVAL seconds.
+THROTTLE_DATABASE = os.path.join(BASE_DIR, 'var', 'throttle.sqlite3')
+THROTTLE_CLEANUP_INTERVAL = 600
+TOKEN_BUCKET_THROTTLES = {
+    'search': {'user': '60/min', 'company': '300/min'},
+    'verification': {'user': '30/min', 'company': '120/min'},
+    'upload': {'user': '10/hour', 'company': '30/hour'},
+}
+
+# Employee search result cache (apps.companies.search_cache): searches kept
+# per process, result sets larger than MAX_IDS are not cached, and the
+# generation that retires entries on writes lives in the GENERATION_CACHE.
+EMPLOYEE_SEARCH_CACHE_SIZE = 1000
+EMPLOYEE_SEARCH_CACHE_MAX_IDS = 10000
+EMPLOYEE_SEARCH_GENERATION_CACHE = 'shared'
+
+# Change feed (apps.sync): rows per page and its upper limit, seconds a change
+# must be old before it is served (longer than any write transaction), and
+# days delete tombstones are kept; older cursors must sync from scratch.
+SYNC_FEED_PAGE_SIZE = 500
+SYNC_FEED_MAX_PAGE_SIZE = 5000
+SYNC_FEED_SETTLE_SECONDS = 30
+SYNC_TOMBSTONE_RETENTION_DAYS = 90
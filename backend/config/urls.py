@@ -6,12 +6,17 @@ from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
+from apps.employees.views import BatchVerificationView
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/users/', include('apps.users.urls')),
     path('api/companies/', include('apps.companies.api.urls')),
     path('api/employees/', include('apps.employees.urls')),
+    path('api/analytics/', include('apps.analytics.urls')),
+    path('api/audit/', include('apps.audit.urls')),
+    path('api/sync/', include('apps.sync.urls')),
+    path('api/verify/batch/', BatchVerificationView.as_view(), name='verify-batch'),
 ]
 
 if settings.DEBUG:
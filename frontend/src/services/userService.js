@@ -3,8 +3,15 @@ import { api } from './authService';
 export const userService = {
   getUsers: async () => {
     try {
-      const response = await api.get('/users/all');
-      return response.data;
+      // The listing is cursor-paginated; follow the pages to get every user
+      let users = [];
+      let url = '/users/all/?page_size=1000';
+      while (url) {
+        const response = await api.get(url);
+        users = users.concat(response.data.results);
+        url = response.data.next;
+      }
+      return users;
     } catch (error) {
       throw new Error(error.response?.data?.message || 'Failed to fetch users');
     }